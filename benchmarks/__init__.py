@@ -0,0 +1,15 @@
+"""
+Benchmark Suite
+
+End-to-end benchmarks that start the simulators in-process on ephemeral ports
+and measure the client, broker and prompt paths against them. Results are
+written as JSON so runs can be compared against a stored baseline.
+
+Example:
+    python -m benchmarks --tags 500 --output bench.json
+    python -m benchmarks --baseline bench.json --max-regression 0.2
+"""
+
+from .suite import run_suite, compare, start_simulator
+
+__all__ = ["run_suite", "compare", "start_simulator"]
@@ -0,0 +1,92 @@
+import argparse
+import json
+import sys
+
+from logsetup import configure_logging
+from simulator import SIMULATORS
+from .suite import run_suite, compare
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run end-to-end benchmarks against in-process simulators"
+    )
+    parser.add_argument(
+        "--simulators",
+        nargs="+",
+        default=list(SIMULATORS.keys()),
+        choices=list(SIMULATORS.keys()),
+        help="Which simulators to benchmark",
+    )
+    parser.add_argument(
+        "--tags", type=int, default=100, help="Approximate tags per simulator"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per latency measurement"
+    )
+    parser.add_argument(
+        "--read-duration",
+        type=float,
+        default=2.0,
+        help="Seconds to spend measuring read throughput",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Simulator seed")
+    parser.add_argument(
+        "--loopback",
+        action="store_true",
+        help="Reach the simulators in-process, without sockets or encoding",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds added to every OPC UA service call (with --loopback)",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the JSON report here (default: stdout)"
+    )
+    parser.add_argument(
+        "--baseline", default=None, help="JSON report to compare against"
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Fail when a metric is this fraction worse than the baseline",
+    )
+    args = parser.parse_args()
+    configure_logging()
+
+    # Load the baseline first so --output may safely overwrite it
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = run_suite(
+        args.simulators,
+        tags=args.tags,
+        repeat=args.repeat,
+        read_duration=args.read_duration,
+        seed=args.seed,
+        loopback=args.loopback,
+        latency=args.latency,
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
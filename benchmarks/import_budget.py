@@ -0,0 +1,114 @@
+"""
+Import-time budget check.
+
+Runs each import statement in a fresh interpreter, takes the fastest of a few
+runs, and fails when it exceeds its budget or drags in a heavy dependency it
+should not need (FastAPI, pydantic, the opcua stack, ...).
+
+Example:
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --scale 2 --json imports.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("fastapi", "pydantic", "starlette", "uvicorn", "opcua")
+
+# (statement, budget in ms, top-level modules that must not be imported)
+IMPORT_BUDGETS = [
+    ("import mcp_server", 20, HEAVY_MODULES),
+    ("from mcp_server import OPCUATag, TagSample", 20, HEAVY_MODULES),
+    ("from mcp_server import generate_prompt_from_tags", 20, HEAVY_MODULES),
+    ("import mcp_server.metrics, mcp_server.profiling", 30, HEAVY_MODULES),
+    ("import opcua_client", 10, ("opcua",)),
+    ("from opcua_client import MCPClient", 400, ("fastapi", "pydantic")),
+    ("from mcp_server.server import app", 1500, ()),
+]
+
+_PROBE = """
+import json, sys, time
+before = set(sys.modules)
+started = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - started
+loaded = sorted({{name.split(".")[0] for name in set(sys.modules) - before}})
+print(json.dumps({{"ms": elapsed * 1000, "loaded": loaded}}))
+"""
+
+
+def measure(statement: str, runs: int = 5) -> dict:
+    """Fastest of ``runs`` fresh-interpreter imports of ``statement``."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root, PYTHONDONTWRITEBYTECODE="1")
+    best = None
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement)],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=root,
+            env=env,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    return best
+
+
+def check_budgets(scale: float = 1.0, runs: int = 5) -> list[dict]:
+    results = []
+    for statement, budget_ms, forbidden in IMPORT_BUDGETS:
+        measured = measure(statement, runs)
+        leaked = [name for name in forbidden if name in measured["loaded"]]
+        budget = budget_ms * scale
+        results.append(
+            {
+                "statement": statement,
+                "ms": measured["ms"],
+                "budget_ms": budget,
+                "modules_loaded": len(measured["loaded"]),
+                "forbidden_loaded": leaked,
+                "ok": measured["ms"] <= budget and not leaked,
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time budgets")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget (e.g. 2 on slow CI machines)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs per statement")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    results = check_budgets(args.scale, args.runs)
+    for r in results:
+        status = "ok  " if r["ok"] else "FAIL"
+        extra = (
+            f" loads {', '.join(r['forbidden_loaded'])}"
+            if r["forbidden_loaded"]
+            else ""
+        )
+        print(
+            f"{status} {r['ms']:8.1f} ms / {r['budget_ms']:7.1f} ms  {r['statement']}{extra}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
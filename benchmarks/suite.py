@@ -0,0 +1,245 @@
+import logging
+import math
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+from opcua_client import MCPClient
+from opcua_client.client import node_cache
+from opcua_client.loopback import serve_loopback, stop_loopback
+from mcp_server.catalog import CatalogStore
+from mcp_server.prompt_tools import generate_prompt_from_tags
+from simulator import SIMULATORS
+
+logger = logging.getLogger("Benchmarks")
+
+# Metrics where a larger number is better; everything else is a latency/cost
+HIGHER_IS_BETTER = {"values_per_sec"}
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "max": ordered[-1],
+        "runs": len(ordered),
+    }
+
+
+def start_simulator(
+    name: str,
+    tags: int,
+    seed: int = 0,
+    tick_interval: float = 2.0,
+    listen: bool = True,
+):
+    """
+    Start simulator ``name`` in-process on an ephemeral port with about ``tags``
+    variables (without a port when ``listen`` is false).
+    """
+    cls = SIMULATORS[name]
+    # Per-line/room INFO logs would dominate the benchmark output
+    cls.logger.setLevel(logging.WARNING)
+    sim = cls(
+        endpoint="opc.tcp://127.0.0.1:0/benchmark/",
+        seed=seed,
+        asset_count=max(1, math.ceil(tags / cls.tags_per_asset)),
+    )
+    sim.tick_interval = tick_interval
+    sim.start(listen=listen)
+    return sim
+
+
+def bench_browse(url: str, repeat: int) -> tuple[dict, list[dict]]:
+    client = MCPClient([url])
+    client.connect_all()
+    try:
+        latencies = []
+        for _ in range(repeat):
+            node_cache(url).clear()  # measure cold crawls
+            before = sum(client.service_calls[url].values())
+            started = time.perf_counter()
+            tags = client.browse_variables(url)
+            latencies.append(time.perf_counter() - started)
+            round_trips = sum(client.service_calls[url].values()) - before
+
+        # Once node metadata is cached only the Browse requests remain
+        before = sum(client.service_calls[url].values())
+        client.browse_variables(url)
+        cached_round_trips = sum(client.service_calls[url].values()) - before
+    finally:
+        client.disconnect_all()
+
+    return {
+        "latency_s": _summary(latencies),
+        "nodes": len(tags),
+        "round_trips": round_trips,
+        "round_trips_per_node": round_trips / len(tags) if tags else None,
+        "cached_round_trips": cached_round_trips,
+    }, tags
+
+
+def bench_crawl(url: str, repeat: int) -> dict:
+    """Batched full crawl, then an incremental refresh of the unchanged server."""
+    client = MCPClient([url])
+    client.connect_all()
+    calls = client.service_calls[url]
+    try:
+        crawls, refreshes = [], []
+        for _ in range(repeat):
+            node_cache(url).clear()
+            before = sum(calls.values())
+            started = time.perf_counter()
+            snapshot = client.crawl_variables(url)
+            crawls.append(time.perf_counter() - started)
+            round_trips = sum(calls.values()) - before
+
+            before = sum(calls.values())
+            started = time.perf_counter()
+            client.refresh_variables(url, snapshot)
+            refreshes.append(time.perf_counter() - started)
+            refresh_round_trips = sum(calls.values()) - before
+    finally:
+        client.disconnect_all()
+
+    return {
+        "latency_s": _summary(crawls),
+        "round_trips": round_trips,
+        "refresh_latency_s": _summary(refreshes),
+        "refresh_round_trips": refresh_round_trips,
+    }
+
+
+def bench_reads(url: str, node_ids: list[str], duration: float) -> dict:
+    client = MCPClient([url])
+    client.connect_all()
+    try:
+        reads = 0
+        started = time.perf_counter()
+        deadline = started + duration
+        while time.perf_counter() < deadline:
+            for node_id in node_ids:
+                client.read_value(url, node_id)
+            reads += len(node_ids)
+        elapsed = time.perf_counter() - started
+    finally:
+        client.disconnect_all()
+    return {"values": reads, "elapsed_s": elapsed, "values_per_sec": reads / elapsed}
+
+
+def bench_get_tags(url: str, repeat: int) -> tuple[dict, list]:
+    """Cold (connect + crawl) and cached catalog lookups."""
+    cold, cached = [], []
+    for _ in range(repeat):
+        store = CatalogStore()
+        try:
+            started = time.perf_counter()
+            tags = store.get_tags(url)
+            cold.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            store.get_tags(url)
+            cached.append(time.perf_counter() - started)
+        finally:
+            store.close()
+    return {
+        "latency_s": _summary(cold),
+        "cached_latency_s": _summary(cached),
+        "tags": len(tags),
+    }, tags
+
+
+def bench_prompt(tags: list, repeat: int) -> dict:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        prompt = generate_prompt_from_tags(tags)
+        latencies.append(time.perf_counter() - started)
+    return {"latency_s": _summary(latencies), "chars": len(prompt)}
+
+
+def run_suite(
+    simulators: list[str],
+    tags: int = 100,
+    repeat: int = 3,
+    read_duration: float = 2.0,
+    seed: int = 0,
+    loopback: bool = False,
+    latency: float = 0.0,
+) -> dict:
+    """
+    Run every benchmark against in-process simulators and return a JSON-able
+    report. With ``loopback`` the simulators are reached without sockets and
+    every service call takes ``latency`` seconds.
+    """
+    results = {}
+    for name in simulators:
+        sim = start_simulator(name, tags, seed=seed, listen=not loopback)
+        if loopback:
+            url = serve_loopback(sim.server, f"benchmark-{name}", latency=latency)
+        else:
+            url = sim.endpoint_url
+        try:
+            logger.info("Benchmarking %s simulator at %s", name, url)
+            browse, raw_tags = bench_browse(url, repeat)
+            get_tags, sim_tags = bench_get_tags(url, repeat)
+            node_ids = [tag.node_id for tag in sim_tags] or [
+                tag["node_id"] for tag in raw_tags
+            ]
+            results[name] = {
+                "simulated_tags": len(sim.variable_nodes()),
+                "browse_variables": browse,
+                "crawl_variables": bench_crawl(url, repeat),
+                "read_value": bench_reads(url, node_ids, read_duration),
+                "get_tags_from_server": get_tags,
+                "generate_prompt_from_tags": bench_prompt(sim_tags, repeat * 10),
+            }
+        finally:
+            if loopback:
+                stop_loopback(url)
+            sim.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tags": tags,
+            "repeat": repeat,
+            "seed": seed,
+            "transport": "loopback" if loopback else "tcp",
+            "latency_s": latency if loopback else None,
+        },
+        "results": results,
+    }
+
+
+def _metrics(report: dict):
+    """Yield ``(path, value)`` for every gated metric in a report."""
+    for sim, benches in report.get("results", {}).items():
+        for bench, data in benches.items():
+            if not isinstance(data, dict):
+                continue
+            if "latency_s" in data:
+                yield f"{sim}.{bench}.latency_s.median", data["latency_s"]["median"]
+            for key in ("round_trips_per_node", "values_per_sec"):
+                if data.get(key) is not None:
+                    yield f"{sim}.{bench}.{key}", data[key]
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return a message for every metric more than ``max_regression`` worse than baseline."""
+    previous = dict(_metrics(baseline))
+    regressions = []
+    for path, value in _metrics(report):
+        old = previous.get(path)
+        if not old:
+            continue
+        if path.rsplit(".", 1)[-1] in HIGHER_IS_BETTER:
+            change = (old - value) / old
+        else:
+            change = (value - old) / old
+        if change > max_regression:
+            regressions.append(f"{path}: {old:.6g} → {value:.6g} ({change:+.0%} worse)")
+    return regressions
@@ -0,0 +1,129 @@
+"""
+Shared logging setup for the simulators, the OPC UA client and the MCP server.
+
+Library modules only create named loggers; entry points call
+``configure_logging()`` once. The root logger gets a ``QueueHandler`` that
+only enqueues records, and a ``QueueListener`` thread formats and writes them
+to stderr, so logging never blocks a simulator tick or a request on I/O.
+Records are enqueued unformatted: messages use ``%``-style arguments and are
+only rendered by the listener. ``MCP_LOG_FORMAT=json`` writes one JSON object
+per record, including fields passed with ``extra=``.
+
+The root stays at WARNING so chatty third-party loggers (the ``opcua`` stack
+logs every service call at INFO) stay quiet, while our own loggers, which set
+INFO themselves, still propagate their records to the handler.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+LOG_FORMAT = "[%(asctime)s] %(levelname)s - %(message)s"
+# "text" or "json"
+LOG_STYLE = os.environ.get("MCP_LOG_FORMAT", "text").lower()
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_configured = False
+_listener = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record can travel as is
+        # and be formatted there instead of on the caller's thread
+        return record
+
+
+class Throttle:
+    """``ready()`` is true at most once per ``interval`` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = time.monotonic() + interval
+
+    def ready(self) -> bool:
+        now = time.monotonic()
+        if now < self._next:
+            return False
+        self._next = now + self.interval
+        return True
+
+
+def _stop_listener():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()  # drains the queue
+
+
+def _restart_after_fork():
+    """
+    The listener thread does not survive ``fork()``: give a forked child (e.g.
+    the catalog owner) its own queue and listener, or its records would pile
+    up in a queue nobody drains.
+    """
+    import multiprocessing.util
+
+    global _listener, _lock
+    _lock = threading.Lock()
+    if _listener is None:
+        return
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, *_listener.handlers)
+    _listener.start()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _DeferredQueueHandler):
+            handler.queue = records
+    # multiprocessing children leave through os._exit(), skipping atexit
+    multiprocessing.util.Finalize(None, _stop_listener, exitpriority=0)
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def configure_logging(level: int = logging.WARNING):
+    """Route the root logger through the shared queue and listener (idempotent)."""
+    global _configured, _listener
+    with _lock:
+        if _configured:
+            return
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            JsonFormatter() if LOG_STYLE == "json" else logging.Formatter(LOG_FORMAT)
+        )
+        records = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(records, handler)
+        _listener.start()
+        atexit.register(_stop_listener)
+        root = logging.getLogger()
+        root.addHandler(_DeferredQueueHandler(records))
+        root.setLevel(level)
+        _configured = True
@@ -1,5 +1,6 @@
 import argparse
 import time
+from logsetup import configure_logging
 from simulator import run as run_simulators
 from opcua_client import MCPClient
 
@@ -60,6 +61,7 @@ def main():
     )
 
     args = parser.parse_args()
+    configure_logging()
 
     if args.mode == "sim":
         run_simulators(mode=args.simulator)
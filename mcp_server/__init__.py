@@ -1,5 +1,4 @@
-(
-    """
+("""
 MCP Server Package
 
 This package provides the Model Control Plane (MCP) server API helpers and
@@ -10,18 +9,27 @@ used across the package.
 Example:
 	from mcp_server import app, get_tags_from_server, OPCUATag
 
-"""
-)
+""")
 
-from .server import app
-from .broker import get_tags_from_server, generate_model_prompt
-from .prompt_tools import generate_prompt_from_tags
-from .models import OPCUATag, TagSample
+import importlib
+
+# Exports are resolved on first access so that e.g. ``from mcp_server import
+# OPCUATag`` does not pay for FastAPI, pydantic and the OPC UA stack.
+_LAZY_EXPORTS = {
+    "app": ".server",
+    "get_tags_from_server": ".broker",
+    "generate_model_prompt": ".broker",
+    "search_tags": ".broker",
+    "generate_prompt_from_tags": ".prompt_tools",
+    "OPCUATag": ".models",
+    "TagSample": ".models",
+}
 
 __all__ = [
     "app",
     "get_tags_from_server",
     "generate_model_prompt",
+    "search_tags",
     "generate_prompt_from_tags",
     "OPCUATag",
     "TagSample",
@@ -29,3 +37,16 @@ __all__ = [
 
 __version__ = "0.1.0"
 __author__ = "Ben Duran"
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,8 +1,52 @@
+import argparse
+import os
+
 import uvicorn
 
+from logsetup import configure_logging
+
 
 def main():
-    uvicorn.run("mcp_server.server:app", host="0.0.0.0", port=8000, reload=True)
+    parser = argparse.ArgumentParser(description="Run the MCP server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Serve with multiple worker processes and a shared catalog owner",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes in production mode (default: CPU count, max 8)",
+    )
+    args = parser.parse_args()
+    configure_logging()
+
+    if not (args.production or args.workers):
+        # Development: single process with auto-reload
+        uvicorn.run(
+            "mcp_server.server:app", host=args.host, port=args.port, reload=True
+        )
+        return
+
+    from mcp_server.catalog import start_catalog_owner
+
+    workers = args.workers or min(os.cpu_count() or 1, 8)
+    # One owner process holds the OPC UA sessions, catalogs and value cache;
+    # workers inherit its address through the environment.
+    owner = start_catalog_owner()
+    try:
+        uvicorn.run(
+            "mcp_server.server:app",
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            proxy_headers=True,
+        )
+    finally:
+        owner.shutdown()
 
 
 if __name__ == "__main__":
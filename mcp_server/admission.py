@@ -0,0 +1,120 @@
+"""
+Per-OPC-UA-server admission control.
+
+Every server gets a bulkhead: at most ``MCP_SERVER_CONCURRENCY`` operations
+run against it at once, up to ``MCP_SERVER_QUEUE`` more wait in line for at
+most ``MCP_QUEUE_TIMEOUT`` seconds, and anything beyond that is shed with
+``Overloaded``. A slow or hot server therefore ties up a bounded number of
+threads and cannot starve requests for the other servers.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from mcp_server.metrics import ADMISSION_REJECTED, ADMISSION_SLOTS
+from mcp_server.profiling import phase
+
+SERVER_CONCURRENCY = int(os.environ.get("MCP_SERVER_CONCURRENCY", "4"))
+SERVER_QUEUE = int(os.environ.get("MCP_SERVER_QUEUE", "8"))
+QUEUE_TIMEOUT = float(os.environ.get("MCP_QUEUE_TIMEOUT", "10"))
+
+
+class Overloaded(Exception):
+    """A request was shed by a server's bulkhead; retry after ``retry_after`` seconds."""
+
+    def __init__(self, server_url: str, retry_after: int, reason: str):
+        # Pass everything to Exception so it survives pickling to other processes
+        super().__init__(server_url, retry_after, reason)
+        self.server_url = server_url
+        self.retry_after = retry_after
+        self.reason = reason
+
+    def __str__(self):
+        return (
+            f"{self.server_url} is overloaded ({self.reason}), "
+            f"retry after {self.retry_after}s"
+        )
+
+
+class Bulkhead:
+    def __init__(
+        self,
+        server_url: str,
+        limit: int = SERVER_CONCURRENCY,
+        queue_size: int = SERVER_QUEUE,
+        queue_timeout: float = QUEUE_TIMEOUT,
+    ):
+        self.server_url = server_url
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._hold_seconds = 1.0  # moving average of time a slot is held
+        self._condition = threading.Condition()
+
+    def _shed(self, reason: str):
+        ADMISSION_REJECTED.inc(server=self.server_url, reason=reason)
+        # Roughly when the queue ahead of a new request will have drained
+        backlog = (self.waiting + 1) / self.limit
+        raise Overloaded(
+            self.server_url, max(1, round(self._hold_seconds * backlog)), reason
+        )
+
+    def _set_gauges(self):
+        ADMISSION_SLOTS.set(self.active, server=self.server_url, state="active")
+        ADMISSION_SLOTS.set(self.waiting, server=self.server_url, state="waiting")
+
+    def acquire(self):
+        with self._condition:
+            # Newcomers never overtake requests that are already queued
+            if self.active < self.limit and not self.waiting:
+                self.active += 1
+                self._set_gauges()
+                return
+            if self.waiting >= self.queue_size:
+                self._shed("queue_full")
+
+            self.waiting += 1
+            self._set_gauges()
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._shed("queue_timeout")
+                    self._condition.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+                self._set_gauges()
+
+    def release(self, held_seconds: float):
+        with self._condition:
+            self.active -= 1
+            self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held_seconds
+            self._set_gauges()
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self):
+        with phase("queue"):
+            self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+
+_bulkheads = {}  # server url → Bulkhead
+_lock = threading.Lock()
+
+
+def bulkhead(server_url: str) -> Bulkhead:
+    with _lock:
+        if server_url not in _bulkheads:
+            _bulkheads[server_url] = Bulkhead(server_url)
+        return _bulkheads[server_url]
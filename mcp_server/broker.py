@@ -1,63 +1,150 @@
 # mcp_server/broker.py
 
-from opcua_client import MCPClient
+import hashlib
+import logging
+
+from mcp_server.catalog import SYSTEM_NODE_NAMES, get_catalog
 from mcp_server.models import OPCUATag
+from mcp_server.profiling import phase
 from mcp_server.prompt_tools import generate_prompt_from_tags
+from mcp_server.singleflight import SingleFlight
 
+logger = logging.getLogger("mcp_server.broker")
 
-SYSTEM_NODE_NAMES = {"Server", "Types", "Views", "EventTypes", "BaseEventType"}
+# Identical concurrent requests (same server and options) share one crawl
+_tag_requests = SingleFlight("get_tags")
+_prompt_requests = SingleFlight("generate_prompt")
 
 
 def get_tags_from_server(
     server_url: str, skip_system_tags: bool = True
 ) -> list[OPCUATag]:
-    client = MCPClient([server_url])
-    client.connect_all()
-
-    all_tags = []
-    raw_tags = client.browse_variables(server_url)
-
-    # Identify simulated roots dynamically by browsing the Objects folder
-    if skip_system_tags:
-        simulated_roots = []
-        root = client.clients[server_url].get_root_node()
-        objects_node = root.get_child(["0:Objects"])
-        for child in objects_node.get_children():
-            name = child.get_display_name().Text
-            if name not in SYSTEM_NODE_NAMES:
-                simulated_roots.append(name)
-
-        # Filter based on those discovered root names
-        for tag in raw_tags:
-            if any(
-                tag["browse_path"].startswith(f"Objects/{root_name}")
-                for root_name in simulated_roots
-            ):
-                all_tags.append(
-                    OPCUATag(
-                        server_url=server_url,
-                        node_id=tag["node_id"],
-                        browse_path=tag["browse_path"],
-                        display_name=tag["display_name"],
-                        data_type=tag["data_type"],
-                    )
-                )
-    else:
-        for tag in raw_tags:
-            all_tags.append(
-                OPCUATag(
-                    server_url=server_url,
-                    node_id=tag["node_id"],
-                    browse_path=tag["browse_path"],
-                    display_name=tag["display_name"],
-                    data_type=tag["data_type"],
-                )
-            )
-
-    client.disconnect_all()
-    return all_tags
-
-
-def generate_model_prompt(server_url: str, skip_system_tags: bool = True) -> str:
-    tags = get_tags_from_server(server_url, skip_system_tags=skip_system_tags)
-    return generate_prompt_from_tags(tags)
+    return _tag_requests.do(
+        (server_url, skip_system_tags),
+        lambda: get_catalog().get_tags(server_url, skip_system_tags=skip_system_tags),
+    )
+
+
+# Bump when generate_prompt_from_tags output changes for the same tags, so
+# clients holding an old prompt fingerprint get the new text
+PROMPT_FORMAT = "1"
+
+
+def response_fingerprint(
+    kind: str, server_urls: list[str], skip_system_tags: bool = True
+) -> str:
+    """
+    Fingerprint of a ``tags`` or ``prompt`` response over ``server_urls``.
+
+    Built from the catalog fingerprints, so it is known without building or
+    serializing the response. Used as ETag and as the MCP ``if_fingerprint``.
+    """
+    store = get_catalog()
+    digest = hashlib.blake2b(kind.encode(), digest_size=16)
+    if kind == "prompt":
+        digest.update(PROMPT_FORMAT.encode())
+    for url in server_urls:
+        digest.update(b"\0" + url.encode() + b"\0")
+        digest.update(store.fingerprint(url, skip_system_tags).encode())
+    return digest.hexdigest()
+
+
+def read_tag_value(server_url: str, node_id: str):
+    return get_catalog().read_value(server_url, node_id)
+
+
+def read_tag_values(server_url: str, node_ids: list[str]) -> list[tuple]:
+    return get_catalog().read_values(server_url, node_ids)
+
+
+def read_tag_snapshot(tags: list[OPCUATag]) -> list:
+    """
+    Current value of every tag, in order, with one chunked bulk read per
+    server. Tags of a server that cannot be read get ``None``.
+    """
+    by_server = {}  # url → [(index, node_id)]
+    for index, tag in enumerate(tags):
+        by_server.setdefault(tag.server_url, []).append((index, tag.node_id))
+
+    values = [None] * len(tags)
+    store = get_catalog()
+    for url, indexed in by_server.items():
+        try:
+            results = store.read_values(url, [node_id for _, node_id in indexed])
+        except Exception as e:
+            logger.warning("Snapshot read of %s failed: %s", url, e)
+            continue
+        for (index, _), (value, _) in zip(indexed, results):
+            values[index] = value
+    return values
+
+
+def write_tag_values(writes: list[dict]) -> list[dict]:
+    """
+    Write ``{"server_url", "node_id", "value"}`` items, one batched write per
+    server, and return each item's ``status`` in request order. A server that
+    cannot be written to fails all of its items with that error.
+    """
+    by_server = {}  # url → [(request index, (node_id, value))]
+    for index, write in enumerate(writes):
+        by_server.setdefault(write["server_url"], []).append(
+            (index, (write["node_id"], write["value"]))
+        )
+
+    results = [None] * len(writes)
+    store = get_catalog()
+    for url, indexed in by_server.items():
+        try:
+            statuses = store.write_values(url, [item for _, item in indexed])
+        except Exception as e:
+            statuses = [f"Error: {e}"] * len(indexed)
+        for (index, (node_id, _)), status in zip(indexed, statuses):
+            results[index] = {
+                "server_url": url,
+                "node_id": node_id,
+                "status": status,
+                "ok": status == "Good",
+            }
+    return results
+
+
+def generate_model_prompt(
+    server_url: str, skip_system_tags: bool = True, enriched: bool = False
+) -> str:
+    """
+    Modeling prompt for a server's tags. ``enriched`` adds current values and
+    per-name value summaries from one snapshot read of all tags.
+    """
+
+    def generate():
+        tags = get_tags_from_server(server_url, skip_system_tags=skip_system_tags)
+        values = read_tag_snapshot(tags) if enriched else None
+        with phase("prompt"):
+            return generate_prompt_from_tags(tags, values)
+
+    return _prompt_requests.do((server_url, skip_system_tags, enriched), generate)
+
+
+def search_tags(
+    query: str,
+    servers: list[str] | None = None,
+    k: int = 10,
+    data_type: str | None = None,
+    skip_system_tags: bool = True,
+    default_servers: list[str] = (),
+) -> dict:
+    """
+    Ranked fuzzy search over tag catalogs.
+
+    Without ``servers``, searches every server crawled so far, or
+    ``default_servers`` when nothing has been crawled yet.
+    """
+    store = get_catalog()
+    servers = list(servers or store.crawled_servers() or default_servers)
+    return store.search(
+        query,
+        servers,
+        k=k,
+        data_type=data_type,
+        skip_system_tags=skip_system_tags,
+    )
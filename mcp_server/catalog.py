@@ -0,0 +1,403 @@
+"""
+Tag catalog and last-value cache shared by every request.
+
+``CatalogStore`` keeps one persistent OPC UA session per server, the crawled
+variable catalog of each server and recently read values. In a single process
+the broker uses a local store. In production mode one owner process runs the
+store behind a ``multiprocessing`` manager and every worker talks to it, so
+the PLCs see one session and one crawl no matter how many workers serve HTTP.
+"""
+
+import hashlib
+import heapq
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from multiprocessing.managers import BaseManager
+
+from opcua import ua
+
+from logsetup import configure_logging
+
+from opcua_client import MCPClient
+from opcua_client.breaker import circuit_breaker
+from opcua_client.client import BrowseSnapshot, node_cache
+from mcp_server.admission import bulkhead
+from mcp_server.metrics import (
+    CRAWL_SECONDS,
+    CRAWL_TAGS,
+    REGISTRY,
+    instrument_opcua_client,
+    record_cache,
+)
+from mcp_server.models import OPCUATag
+from mcp_server.profiling import phase
+from mcp_server.search import TagIndex
+from mcp_server.singleflight import SingleFlight
+
+logger = logging.getLogger("mcp_server.catalog")
+
+SYSTEM_NODE_NAMES = {"Server", "Types", "Views", "EventTypes", "BaseEventType"}
+OBJECTS_FOLDER_ID = "i=85"
+
+# Seconds a crawled catalog is served before the server is checked for changes
+CATALOG_TTL = float(os.environ.get("MCP_CATALOG_TTL", "60"))
+# Seconds a read value may be reused for other requests (0 = always read)
+VALUE_MAX_AGE = float(os.environ.get("MCP_VALUE_MAX_AGE", "1.0"))
+
+# Set by the production launcher for worker processes
+ADDRESS_ENV = "MCP_CATALOG_ADDRESS"
+AUTHKEY_ENV = "MCP_CATALOG_AUTHKEY"
+
+
+@dataclass
+class Catalog:
+    raw_tags: list[dict]
+    simulated_roots: list[str]
+    crawled_at: float
+    snapshot: BrowseSnapshot
+
+
+def filter_tags(
+    server_url: str, catalog: Catalog, skip_system_tags: bool = True
+) -> list[OPCUATag]:
+    all_tags = []
+    for tag in catalog.raw_tags:
+        # Keep only tags under the discovered (non-system) root objects
+        if skip_system_tags and not any(
+            tag["browse_path"].startswith(f"Objects/{root_name}")
+            for root_name in catalog.simulated_roots
+        ):
+            continue
+        all_tags.append(
+            OPCUATag(
+                server_url=server_url,
+                node_id=tag["node_id"],
+                browse_path=tag["browse_path"],
+                display_name=tag["display_name"],
+                data_type=tag["data_type"],
+            )
+        )
+    return all_tags
+
+
+class CatalogStore:
+    def __init__(
+        self, catalog_ttl: float = CATALOG_TTL, value_max_age: float = VALUE_MAX_AGE
+    ):
+        self.catalog_ttl = catalog_ttl
+        self.value_max_age = value_max_age
+        self._lock = threading.Lock()
+        self._connect_locks = {}  # url → Lock
+        self._clients = {}  # url → connected MCPClient
+        self._catalogs = {}  # url → Catalog
+        self._values = {}  # (url, node_id) → (value, read_at)
+        self._indexes = {}  # (url, skip_system_tags) → (Catalog, TagIndex)
+        self._fingerprints = {}  # (url, skip_system_tags) → (Catalog, str)
+        # Workers reach the owner concurrently; one crawl per server at a time
+        self._crawls = SingleFlight("crawl")
+
+    # ---------- Sessions ----------
+    def _client(self, server_url: str) -> MCPClient:
+        with self._lock:
+            connect_lock = self._connect_locks.setdefault(server_url, threading.Lock())
+        with connect_lock:
+            client = self._clients.get(server_url)
+            if client is None:
+                client = MCPClient([server_url])
+                with phase("connect"):
+                    client.connect_all()
+                if server_url not in client.clients:
+                    # connect_all() skips servers whose breaker refused the
+                    # call, e.g. while another caller's half-open probe runs
+                    circuit_breaker(server_url).check()
+                    raise ConnectionError(f"Could not connect to {server_url}")
+                self._clients[server_url] = client
+            return client
+
+    def connect(self, server_url: str):
+        """Open the server's session now instead of on first use."""
+        self._client(server_url)
+
+    def _drop_client(self, server_url: str):
+        client = self._clients.pop(server_url, None)
+        if client is not None:
+            client.disconnect_all()
+
+    def _with_session(self, server_url: str, operation):
+        """
+        Run ``operation(client)`` within the server's bulkhead, reconnecting
+        once if the session has died. Raises ``Overloaded`` when shed and
+        ``CircuitOpen`` at once for a server that is known to be down.
+        """
+        if server_url not in self._clients:
+            circuit_breaker(server_url).check()
+        with bulkhead(server_url).slot():
+            client = self._client(server_url)
+            try:
+                return operation(client)
+            except (ConnectionError, OSError, TimeoutError) as e:
+                logger.warning("Session to %s failed (%s), reconnecting", server_url, e)
+                self._drop_client(server_url)
+                return operation(self._client(server_url))
+
+    # ---------- Catalogs ----------
+    def _crawl(
+        self, client: MCPClient, server_url: str, previous: Catalog | None = None
+    ) -> Catalog:
+        started = time.perf_counter()
+        with phase("browse"):
+            if previous is None:
+                snapshot = client.crawl_variables(server_url)
+                mode = "full"
+            else:
+                # Only Objects whose references changed are browsed again
+                snapshot = previous.snapshot
+                client.refresh_variables(server_url, snapshot)
+                mode = "incremental"
+            raw_tags = snapshot.variables()
+        CRAWL_SECONDS.observe(
+            time.perf_counter() - started, server=server_url, mode=mode
+        )
+
+        # Simulated roots are the non-system children of the Objects folder
+        simulated_roots = []
+        for node_id in snapshot.children.get(OBJECTS_FOLDER_ID, ()):
+            name = snapshot.nodes.get(node_id, (None,))[0]
+            if name and name not in SYSTEM_NODE_NAMES:
+                simulated_roots.append(name)
+        return Catalog(raw_tags, simulated_roots, time.monotonic(), snapshot)
+
+    def catalog(self, server_url: str) -> Catalog:
+        catalog = self._catalogs.get(server_url)
+        fresh = (
+            catalog is not None
+            and time.monotonic() - catalog.crawled_at < self.catalog_ttl
+        )
+        record_cache("catalog", fresh)
+        if fresh:
+            return catalog
+
+        def crawl():
+            catalog = self._with_session(
+                server_url,
+                lambda client: self._crawl(
+                    client, server_url, self._catalogs.get(server_url)
+                ),
+            )
+            self._catalogs[server_url] = catalog
+            return catalog
+
+        return self._crawls.do(server_url, crawl)
+
+    def get_tags(
+        self, server_url: str, skip_system_tags: bool = True
+    ) -> list[OPCUATag]:
+        catalog = self.catalog(server_url)
+        with phase("filter"):
+            tags = filter_tags(server_url, catalog, skip_system_tags)
+        CRAWL_TAGS.set(len(tags), server=server_url)
+        return tags
+
+    def invalidate(self, server_url: str | None = None):
+        """Forget crawled catalogs and node metadata; the next lookup recrawls."""
+        urls = list(self._catalogs) if server_url is None else [server_url]
+        for url in urls:
+            self._catalogs.pop(url, None)
+            node_cache(url).clear()
+
+    def fingerprint(self, server_url: str, skip_system_tags: bool = True) -> str:
+        """Stable hash of what ``get_tags()`` returns; changes only with the catalog."""
+        catalog = self.catalog(server_url)
+        key = (server_url, skip_system_tags)
+        cached = self._fingerprints.get(key)
+        if cached is None or cached[0] is not catalog:
+            digest = hashlib.blake2b(digest_size=16)
+            for tag in filter_tags(server_url, catalog, skip_system_tags):
+                fields = (tag.node_id, tag.browse_path, tag.display_name, tag.data_type)
+                digest.update("\x1f".join(fields).encode())
+                digest.update(b"\x1e")
+            cached = self._fingerprints[key] = (catalog, digest.hexdigest())
+        return cached[1]
+
+    def crawled_servers(self) -> list[str]:
+        return list(self._catalogs)
+
+    # ---------- Search ----------
+    def _index(self, server_url: str, skip_system_tags: bool) -> TagIndex:
+        """Search index of the server's current catalog, rebuilt when it changes."""
+        catalog = self.catalog(server_url)
+        key = (server_url, skip_system_tags)
+        cached = self._indexes.get(key)
+        if cached is None or cached[0] is not catalog:
+            with phase("index"):
+                tags = filter_tags(server_url, catalog, skip_system_tags)
+                cached = self._indexes[key] = (catalog, TagIndex(tags))
+        return cached[1]
+
+    def search(
+        self,
+        query: str,
+        servers: list[str],
+        k: int = 10,
+        data_type: str | None = None,
+        skip_system_tags: bool = True,
+    ) -> dict:
+        """Top-``k`` tags matching ``query`` across ``servers``, with data-type facets."""
+        matches = []
+        facets = Counter()
+        errors = []
+        for url in servers:
+            try:
+                index = self._index(url, skip_system_tags)
+            except Exception as e:
+                errors.append({"server_url": url, "error": str(e)})
+                continue
+            with phase("search"):
+                found, counts = index.search(query, k, data_type)
+            matches.extend(found)
+            facets.update(counts)
+
+        # Each index ranks by matched terms first; keep that order across
+        # servers (their idf weights differ, so scores alone do not compare)
+        top = heapq.nlargest(k, matches, key=lambda match: match[:2])
+        return {
+            "query": query,
+            "results": [
+                dict(asdict(tag), score=round(score, 3)) for _, score, tag in top
+            ],
+            "facets": {"data_type": dict(facets.most_common())},
+            "errors": errors,
+        }
+
+    # ---------- Values ----------
+    def read_value(self, server_url: str, node_id: str):
+        key = (server_url, node_id)
+        cached = self._values.get(key)
+        fresh = cached is not None and time.monotonic() - cached[1] < self.value_max_age
+        record_cache("value", fresh)
+        if fresh:
+            return cached[0]
+
+        def read(client):
+            try:
+                return client.clients[server_url].get_node(node_id).get_value()
+            except ua.UaStatusCodeError as e:
+                # Bad node id or access: a per-node problem, the session is fine
+                logger.error("Failed to read value from %s: %s", node_id, e)
+                return None
+
+        with phase("read"):
+            value = self._with_session(server_url, read)
+        self._values[key] = (value, time.monotonic())
+        return value
+
+    def read_values(self, server_url: str, node_ids: list[str]) -> list[tuple]:
+        """``(value, source timestamp)`` per node, in bulk; always reads the server."""
+        with phase("read"):
+            results = self._with_session(
+                server_url, lambda client: client.read_values(server_url, node_ids)
+            )
+        read_at = time.monotonic()
+        for node_id, (value, _) in zip(node_ids, results):
+            self._values[(server_url, node_id)] = (value, read_at)
+        return results
+
+    def write_values(self, server_url: str, items: list[tuple]) -> list[str]:
+        """Write ``(node_id, value)`` pairs; a status name per item."""
+        with phase("write"):
+            statuses = self._with_session(
+                server_url, lambda client: client.write_values(server_url, items)
+            )
+        for node_id, _ in items:
+            self._values.pop((server_url, node_id), None)
+        return statuses
+
+    # ---------- Lifecycle ----------
+    def metrics(self) -> str:
+        """Metrics of the process that owns the store (for remote workers)."""
+        return REGISTRY.render()
+
+    def close(self):
+        with self._lock:
+            urls = list(self._clients)
+        for url in urls:
+            self._drop_client(url)
+
+
+# ---------- Owner process ----------
+_local_store = None
+_remote_store = None
+_store_lock = threading.Lock()
+
+
+def _owned_store() -> CatalogStore:
+    global _local_store
+    with _store_lock:
+        if _local_store is None:
+            # The owner process never imports server.py, so hook metrics here
+            instrument_opcua_client()
+            _local_store = CatalogStore()
+        return _local_store
+
+
+class CatalogManager(BaseManager):
+    pass
+
+
+CatalogManager.register("catalog", callable=_owned_store)
+
+
+def start_catalog_owner(host: str = "127.0.0.1", port: int = 0) -> CatalogManager:
+    """
+    Start the catalog owner process and export its address to the environment.
+
+    Worker processes started afterwards inherit ``MCP_CATALOG_ADDRESS`` and
+    ``MCP_CATALOG_AUTHKEY`` and share the owner's store via ``get_catalog()``.
+    """
+    authkey = os.urandom(16)
+    manager = CatalogManager(address=(host, port), authkey=authkey)
+    # Forked owners get a fresh log listener (see logsetup); spawned ones
+    # configure logging here
+    manager.start(initializer=configure_logging)
+    address_host, address_port = manager.address
+    os.environ[ADDRESS_ENV] = f"{address_host}:{address_port}"
+    os.environ[AUTHKEY_ENV] = authkey.hex()
+    logger.info("Catalog owner listening on %s:%s", address_host, address_port)
+    return manager
+
+
+def _connect_remote(address: str):
+    host, _, port = address.rpartition(":")
+    manager = CatalogManager(
+        address=(host, int(port)), authkey=bytes.fromhex(os.environ[AUTHKEY_ENV])
+    )
+    manager.connect()
+    return manager.catalog()
+
+
+def close_catalog():
+    """Close the sessions of the store owned by this process, if any."""
+    with _store_lock:
+        store = _local_store
+    if store is not None:
+        store.close()
+
+
+def is_remote() -> bool:
+    return bool(os.environ.get(ADDRESS_ENV))
+
+
+def get_catalog():
+    """The shared store: the owner process's when running multi-worker, else local."""
+    global _remote_store
+    address = os.environ.get(ADDRESS_ENV)
+    if not address:
+        return _owned_store()
+    with _store_lock:
+        if _remote_store is None:
+            _remote_store = _connect_remote(address)
+        return _remote_store
@@ -0,0 +1,160 @@
+"""
+Content negotiation and compression for large API responses.
+
+Responses are JSON unless the ``Accept`` header asks for MessagePack
+(``application/msgpack``) or, for tabular responses such as tag lists, an
+Arrow IPC stream (``application/vnd.apache.arrow.stream``). Bodies of at least
+``MCP_COMPRESS_MIN_BYTES`` are compressed with zstd or gzip when the client
+accepts it. MessagePack, Arrow and zstd need the optional ``msgpack``,
+``pyarrow`` and ``zstandard`` packages; formats whose package is missing are
+simply not offered.
+"""
+
+import gzip
+import importlib
+import json
+import os
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/vnd.apache.arrow.file": ARROW,
+}
+
+# Smaller bodies are not worth the CPU (roughly one TCP segment)
+COMPRESS_MIN_BYTES = int(os.environ.get("MCP_COMPRESS_MIN_BYTES", "1400"))
+
+_modules = {}
+
+
+def _optional(name: str):
+    """Import an optional dependency once; None when it is not installed."""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
+
+
+class NotAcceptable(Exception):
+    def __init__(self, offered: list[str]):
+        super().__init__(offered)
+        self.offered = offered
+
+    def __str__(self):
+        return f"Acceptable media types: {', '.join(self.offered)}"
+
+
+def _parse_header(header: str) -> list[tuple[str, float]]:
+    """``Accept``-style header → ``[(value, q)]``, best first, header order on ties."""
+    items = []
+    for part in header.split(","):
+        value, *params = [piece.strip() for piece in part.split(";")]
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        items.append((value.lower(), q))
+    return sorted(items, key=lambda item: -item[1])
+
+
+def offered_media_types(tabular: bool) -> list[str]:
+    offered = [JSON]
+    if _optional("msgpack"):
+        offered.append(MSGPACK)
+    if tabular and _optional("pyarrow"):
+        offered.append(ARROW)
+    return offered
+
+
+def negotiate(accept: str | None, tabular: bool = False) -> str:
+    """
+    Media type to respond with. Types that are not offered (e.g. an Arrow
+    request for a non-tabular response) fall back to JSON; raises
+    ``NotAcceptable`` only if the header rules JSON out with ``q=0``.
+    """
+    if not accept:
+        return JSON
+    offered = offered_media_types(tabular)
+    ranges = [
+        (_ALIASES.get(media_type, media_type), q)
+        for media_type, q in _parse_header(accept)
+    ]
+    # JSON is refused only if the most specific range covering it has q=0
+    json_q = 1.0
+    for covering in (JSON, "application/*", "*/*"):
+        qs = [q for media_type, q in ranges if media_type == covering]
+        if qs:
+            json_q = qs[0]
+            break
+    for media_type, q in ranges:
+        if q <= 0:
+            continue
+        if media_type in ("*/*", "application/*", JSON):
+            if json_q > 0:
+                return JSON
+            if len(offered) > 1:
+                return offered[1]  # a wildcard still covers the other formats
+        elif media_type in offered:
+            return media_type
+    if json_q <= 0:
+        raise NotAcceptable(offered)
+    return JSON
+
+
+def _arrow_stream(rows: list[dict]) -> bytes:
+    pyarrow = _optional("pyarrow")
+    # Union of keys, so e.g. per-server error rows become nullable columns
+    columns = dict.fromkeys(key for row in rows for key in row)
+    table = pyarrow.table(
+        {column: [row.get(column) for row in rows] for column in columns}
+    )
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode(content, media_type: str, rows=None) -> bytes:
+    """
+    Encode JSON-compatible ``content``. Arrow encodes ``rows(content)``, the
+    list of records that make up the response.
+    """
+    if media_type == MSGPACK:
+        return _optional("msgpack").packb(content, use_bin_type=True)
+    if media_type == ARROW:
+        return _arrow_stream(rows(content))
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """Best content coding the client accepts: zstd, then gzip, else None."""
+    if not accept_encoding:
+        return None
+    accepted = {value: q for value, q in _parse_header(accept_encoding)}
+    wildcard = accepted.get("*", 0)
+    for coding in ("zstd", "gzip"):
+        if coding == "zstd" and not _optional("zstandard"):
+            continue
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "zstd":
+        return _optional("zstandard").ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=5)
@@ -0,0 +1,295 @@
+"""
+Columnar export of tag catalogs and sampled values.
+
+Writes ``OPCUATag`` catalogs (``kind="tags"``) or ``TagSample`` values
+(``kind="values"``) of one or more servers as Parquet or as an Arrow IPC
+stream. Values are read in bulk, ``ROW_GROUP_SIZE`` tags per Read request, and
+every chunk is written as its own row group (record batch) as soon as it
+arrives, so memory stays bounded by one chunk however long the export runs.
+Needs the optional ``pyarrow`` package.
+
+Served as ``GET /export`` and available from the command line:
+    python -m mcp_server.export --server-url opc.tcp://localhost:4840 \\
+        --kind values --samples 60 --interval 1 -o oil.parquet
+"""
+
+import argparse
+import io
+import sys
+import time
+from datetime import datetime, timezone
+
+from mcp_server.broker import get_tags_from_server, read_tag_values
+from mcp_server.models import TagSample
+
+KINDS = ("tags", "values")
+FORMATS = ("parquet", "arrow")
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# Tags per bulk Read and rows per row group
+ROW_GROUP_SIZE = 1000
+
+
+class ExportUnavailable(RuntimeError):
+    pass
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ExportUnavailable(
+            "Export needs the optional pyarrow package (pip install pyarrow)"
+        ) from None
+    return pyarrow
+
+
+def _schema(pa, kind: str):
+    tag_fields = [
+        ("server_url", pa.string()),
+        ("node_id", pa.string()),
+        ("browse_path", pa.string()),
+        ("display_name", pa.string()),
+        ("data_type", pa.string()),
+    ]
+    if kind == "tags":
+        return pa.schema(tag_fields)
+    return pa.schema(
+        tag_fields
+        + [
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            # Numbers and booleans; everything else goes to value_text
+            ("value", pa.float64()),
+            ("value_text", pa.string()),
+        ]
+    )
+
+
+def _table(pa, schema, kind: str, rows: list):
+    tags = rows if kind == "tags" else [sample.tag for sample in rows]
+    columns = {
+        "server_url": [tag.server_url for tag in tags],
+        "node_id": [tag.node_id for tag in tags],
+        "browse_path": [tag.browse_path for tag in tags],
+        "display_name": [tag.display_name for tag in tags],
+        "data_type": [tag.data_type for tag in tags],
+    }
+    if kind == "values":
+        # bool is an int, so booleans land in value as 0.0/1.0
+        numeric = [isinstance(sample.value, (int, float)) for sample in rows]
+        columns["timestamp"] = [
+            datetime.fromisoformat(sample.timestamp) for sample in rows
+        ]
+        columns["value"] = [
+            float(sample.value) if is_number else None
+            for sample, is_number in zip(rows, numeric)
+        ]
+        columns["value_text"] = [
+            None if is_number or sample.value is None else str(sample.value)
+            for sample, is_number in zip(rows, numeric)
+        ]
+    return pa.table(columns, schema=schema)
+
+
+def _catalogs(servers: list[str], skip_system_tags: bool) -> list:
+    return [
+        (url, get_tags_from_server(url, skip_system_tags=skip_system_tags))
+        for url in servers
+    ]
+
+
+def _tag_batches(catalogs: list):
+    for _, tags in catalogs:
+        for start in range(0, len(tags), ROW_GROUP_SIZE):
+            yield tags[start : start + ROW_GROUP_SIZE]
+
+
+def _sample_batches(catalogs: list, samples: int, interval: float):
+    """``TagSample`` chunks: every tag of every server, ``samples`` times."""
+    for round_number in range(samples):
+        started = time.monotonic()
+        for url, tags in catalogs:
+            for start in range(0, len(tags), ROW_GROUP_SIZE):
+                chunk = tags[start : start + ROW_GROUP_SIZE]
+                results = read_tag_values(url, [tag.node_id for tag in chunk])
+                read_at = datetime.now(timezone.utc)
+                yield [
+                    TagSample(
+                        tag=tag,
+                        timestamp=(
+                            timestamp.replace(tzinfo=timezone.utc)
+                            if timestamp
+                            else read_at
+                        ).isoformat(),
+                        value=value,
+                    )
+                    for tag, (value, timestamp) in zip(chunk, results)
+                ]
+        if round_number < samples - 1:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def _write(sink, kind: str, format: str, batches):
+    """Write ``batches`` to ``sink``; yields the row count after each row group."""
+    pa = _pyarrow()
+    schema = _schema(pa, kind)
+    if format == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    with writer:
+        for rows in batches:
+            if rows:
+                writer.write_table(_table(pa, schema, kind, rows))
+                yield len(rows)
+
+
+def _batches(kind: str, catalogs: list, samples: int, interval: float):
+    if kind == "tags":
+        return _tag_batches(catalogs)
+    return _sample_batches(catalogs, samples, interval)
+
+
+def _check(kind: str, format: str):
+    if kind not in KINDS:
+        raise ValueError(f"Unknown export kind '{kind}', expected one of {KINDS}")
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format '{format}', expected one of {FORMATS}")
+    _pyarrow()
+
+
+def export(
+    destination,
+    servers: list[str],
+    kind: str = "tags",
+    format: str = "parquet",
+    samples: int = 1,
+    interval: float = 1.0,
+    skip_system_tags: bool = True,
+) -> int:
+    """Write an export to ``destination`` (path or binary file); returns the rows written."""
+    _check(kind, format)
+    catalogs = _catalogs(servers, skip_system_tags)
+    return sum(
+        _write(destination, kind, format, _batches(kind, catalogs, samples, interval))
+    )
+
+
+class _Spool(io.RawIOBase):
+    """Write-only sink whose bytes are handed out as they are produced."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_export(
+    servers: list[str],
+    kind: str = "tags",
+    format: str = "parquet",
+    samples: int = 1,
+    interval: float = 1.0,
+    skip_system_tags: bool = True,
+):
+    """
+    Bytes of an export, one piece per row group.
+
+    Arguments, pyarrow and the catalogs are checked before this returns, so
+    callers can still report those errors; the values are read while the
+    returned iterator is consumed.
+    """
+    _check(kind, format)
+    catalogs = _catalogs(servers, skip_system_tags)
+
+    def pieces():
+        spool = _Spool()
+        for _ in _write(
+            spool, kind, format, _batches(kind, catalogs, samples, interval)
+        ):
+            yield spool.drain()
+        yield spool.drain()  # footer
+
+    return pieces()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export tag catalogs or sampled values to Parquet/Arrow"
+    )
+    parser.add_argument(
+        "--server-url",
+        action="append",
+        required=True,
+        help="OPC UA server to export (repeat for several)",
+    )
+    parser.add_argument("--kind", choices=KINDS, default="tags")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="Output format (default: from the file extension, else parquet)",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=1, help="Value snapshots to take (--kind values)"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between snapshots"
+    )
+    parser.add_argument(
+        "--include-system-tags", action="store_true", help="Keep Server/Types/... tags"
+    )
+    parser.add_argument("-o", "--output", required=True, help="File to write")
+    args = parser.parse_args()
+
+    format = args.format or (
+        "arrow" if args.output.endswith((".arrow", ".arrows")) else "parquet"
+    )
+    from logsetup import configure_logging
+    from mcp_server.catalog import close_catalog
+
+    configure_logging()
+    started = time.perf_counter()
+    try:
+        rows = export(
+            args.output,
+            args.server_url,
+            kind=args.kind,
+            format=format,
+            samples=args.samples,
+            interval=args.interval,
+            skip_system_tags=not args.include_system_tags,
+        )
+    except (ExportUnavailable, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        close_catalog()
+    print(
+        f"Wrote {rows} {args.kind} rows to {args.output} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
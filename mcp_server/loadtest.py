@@ -0,0 +1,279 @@
+"""
+Concurrent load generator for the MCP server.
+
+Drives the JSON-RPC endpoint (``POST /``) and the REST routes from N virtual
+agents running a weighted mix of operations, then reports throughput and
+p50/p95/p99 latency per operation.
+
+Example:
+    python -m mcp_server.loadtest --agents 1,8,32 --duration 20 \\
+        --mix tools/list=2,get_tags=1,generate_prompt=1,read_value=6
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+DEFAULT_MIX = "tools/list=2,get_tags=1,generate_prompt=1,read_value=6"
+
+_request_ids = itertools.count(1)
+
+
+class LoadTarget:
+    """HTTP calls for every operation the load generator knows about."""
+
+    def __init__(self, base_url: str, server_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.server_url = server_url
+        self.timeout = timeout
+        self.node_ids = []
+
+    def _request(self, path: str, body: dict | None = None):
+        data = None
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        request = urllib.request.Request(
+            self.base_url + path, data=data, headers=headers
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def _rpc(self, method: str, params: dict | None = None):
+        payload = {"jsonrpc": "2.0", "id": next(_request_ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = self._request("/", payload)
+        if "error" in response:
+            raise RuntimeError(response["error"].get("message", "JSON-RPC error"))
+        return response["result"]
+
+    def _call_tool(self, name: str, arguments: dict):
+        return self._rpc("tools/call", {"name": name, "arguments": arguments})
+
+    def _query(self, path: str, **params):
+        return self._request(f"{path}?{urllib.parse.urlencode(params)}")
+
+    # ---------- Operations ----------
+    def tools_list(self):
+        return self._rpc("tools/list")
+
+    def get_tags(self):
+        return self._call_tool("get_tags", {"server_url": self.server_url})
+
+    def generate_prompt(self):
+        return self._call_tool("generate_prompt", {"server_url": self.server_url})
+
+    def rest_tags(self):
+        return self._query("/tags", server_url=self.server_url)
+
+    def rest_prompt(self):
+        return self._query("/prompt", server_url=self.server_url)
+
+    def read_value(self):
+        node_id = random.choice(self.node_ids)
+        return self._query("/value", server_url=self.server_url, node_id=node_id)
+
+    def discover_node_ids(self, limit: int = 100):
+        tags = self.rest_tags()
+        self.node_ids = [tag["node_id"] for tag in tags if "node_id" in tag][:limit]
+        return self.node_ids
+
+
+OPERATIONS = {
+    "tools/list": LoadTarget.tools_list,
+    "get_tags": LoadTarget.get_tags,
+    "generate_prompt": LoadTarget.generate_prompt,
+    "rest_tags": LoadTarget.rest_tags,
+    "rest_prompt": LoadTarget.rest_prompt,
+    "read_value": LoadTarget.read_value,
+}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """``"tools/list=2,read_value=6"`` → ``{"tools/list": 2.0, "read_value": 6.0}``"""
+    mix = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation '{name}'. Must be one of: {list(OPERATIONS)}"
+            )
+        mix[name] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Operation mix must have at least one positive weight")
+    return mix
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_load(
+    target: LoadTarget, mix: dict[str, float], agents: int, duration: float
+) -> dict:
+    """Run ``agents`` concurrent virtual agents for ``duration`` seconds."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    start = threading.Event()
+    deadline = 0.0
+
+    def agent(seed: int):
+        rng = random.Random(seed)
+        start.wait()
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            began = time.perf_counter()
+            try:
+                OPERATIONS[name](target)
+                failed = False
+            except (urllib.error.URLError, OSError, RuntimeError, ValueError):
+                failed = True
+            elapsed = time.perf_counter() - began
+            with lock:
+                if failed:
+                    errors[name] += 1
+                else:
+                    latencies[name].append(elapsed)
+
+    threads = [
+        threading.Thread(target=agent, args=(i,), daemon=True) for i in range(agents)
+    ]
+    for thread in threads:
+        thread.start()
+    began = time.perf_counter()
+    deadline = began + duration
+    start.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    operations = {}
+    for name in names:
+        ordered = sorted(latencies[name])
+        operations[name] = {
+            "requests": len(ordered),
+            "errors": errors[name],
+            "throughput_rps": len(ordered) / elapsed,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+        }
+    completed = sum(op["requests"] for op in operations.values())
+    return {
+        "agents": agents,
+        "elapsed_s": elapsed,
+        "throughput_rps": completed / elapsed,
+        "errors": sum(errors.values()),
+        "operations": operations,
+    }
+
+
+def print_report(step: dict, out=sys.stdout):
+    print(
+        f"\n{step['agents']} agents | {step['throughput_rps']:.1f} req/s | "
+        f"{step['errors']} errors | {step['elapsed_s']:.1f}s",
+        file=out,
+    )
+    print(
+        f"  {'operation':<16}{'req':>8}{'err':>6}{'req/s':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+        file=out,
+    )
+    for name, op in step["operations"].items():
+        print(
+            f"  {name:<16}{op['requests']:>8}{op['errors']:>6}{op['throughput_rps']:>9.1f}"
+            f"{op['p50_ms']:>10.1f}{op['p95_ms']:>10.1f}{op['p99_ms']:>10.1f}",
+            file=out,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive the MCP server with concurrent virtual agents"
+    )
+    parser.add_argument(
+        "--base-url", default="http://localhost:8000", help="MCP server base URL"
+    )
+    parser.add_argument(
+        "--server-url",
+        default="opc.tcp://localhost:4840",
+        help="OPC UA server the tools should target",
+    )
+    parser.add_argument(
+        "--agents",
+        default="8",
+        help="Concurrent agents; a comma list (e.g. 1,8,32) runs one step per value",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per step")
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Weighted operation mix (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Per-request timeout in seconds"
+    )
+    parser.add_argument(
+        "--json", dest="json_path", default=None, help="Also write results as JSON"
+    )
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+        agent_steps = [int(n) for n in args.agents.split(",") if n.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+
+    target = LoadTarget(args.base_url, args.server_url, args.timeout)
+    if "read_value" in mix:
+        try:
+            target.discover_node_ids()
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"Could not fetch tags for read_value: {e}", file=sys.stderr)
+        if not target.node_ids:
+            print("No node IDs available, dropping read_value", file=sys.stderr)
+            mix.pop("read_value")
+            if not mix:
+                sys.exit(1)
+
+    steps = []
+    for agents in agent_steps:
+        step = run_load(target, mix, agents, args.duration)
+        print_report(step)
+        steps.append(step)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(
+                {
+                    "base_url": args.base_url,
+                    "server_url": args.server_url,
+                    "mix": mix,
+                    "steps": steps,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Minimal Prometheus-style metrics for the MCP server.
+
+Metrics are kept in process and rendered in the Prometheus text exposition
+format by ``GET /metrics``. Only counters, gauges and histograms are
+supported, which is all the server needs.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, value in series:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: tuple = (), buckets=DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), total, count))
+                for key, (counts, total, count) in self._series.items()
+            )
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames, key, f'le="{_format_number(float(bound))}"'
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_number(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: tuple = (), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def merge_expositions(*texts: str) -> str:
+    """Merge text expositions from several processes, one header per family."""
+    families = {}  # name → [help line, type line, samples]
+    current = None
+    for text in texts:
+        for line in text.splitlines():
+            if line.startswith("# HELP ") or line.startswith("# TYPE "):
+                name = line.split()[2]
+                current = families.setdefault(name, [None, None, []])
+                slot = 0 if line.startswith("# HELP ") else 1
+                current[slot] = current[slot] or line
+            elif line and current is not None:
+                current[2].append(line)
+    lines = []
+    for help_line, type_line, samples in families.values():
+        lines.extend(line for line in (help_line, type_line) if line)
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---------- Server metrics ----------
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "mcp_http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "mcp_http_requests_in_flight", "HTTP requests currently being served."
+)
+TOOL_CALL_SECONDS = REGISTRY.histogram(
+    "mcp_tool_call_duration_seconds",
+    "MCP tool call latency by tool.",
+    ("tool", "status"),
+)
+CRAWL_SECONDS = REGISTRY.histogram(
+    "mcp_crawl_duration_seconds",
+    "Time to crawl (full) or refresh (incremental) the variable tree of a server.",
+    ("server", "mode"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+CRAWL_TAGS = REGISTRY.gauge(
+    "mcp_crawl_tags", "Tags returned by the last crawl of a server.", ("server",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "mcp_cache_requests_total",
+    "Cache lookups by cache and result (hit/miss).",
+    ("cache", "result"),
+)
+COALESCED_REQUESTS = REGISTRY.counter(
+    "mcp_coalesced_requests_total",
+    "Requests that joined an identical in-flight call instead of running their own.",
+    ("operation",),
+)
+ADMISSION_SLOTS = REGISTRY.gauge(
+    "mcp_admission_slots",
+    "Operations per OPC UA server that are running (active) or queued (waiting).",
+    ("server", "state"),
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "mcp_admission_rejected_total",
+    "Requests shed by a server's bulkhead, by reason (queue_full/queue_timeout).",
+    ("server", "reason"),
+)
+
+# ---------- OPC UA client metrics ----------
+OPCUA_REQUEST_SECONDS = REGISTRY.histogram(
+    "opcua_request_duration_seconds",
+    "OPC UA service round-trip latency by server and service.",
+    ("server", "service", "status"),
+)
+OPCUA_CONNECTIONS = REGISTRY.counter(
+    "opcua_connections_total",
+    "OPC UA connection attempts by server and result (success/failure/circuit_open).",
+    ("server", "result"),
+)
+OPCUA_SESSIONS = REGISTRY.gauge(
+    "opcua_sessions_open", "OPC UA sessions currently open.", ("server",)
+)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _on_service_call(server_url: str, service: str, seconds: float, error):
+    OPCUA_REQUEST_SECONDS.observe(
+        seconds,
+        server=server_url,
+        service=service,
+        status="error" if error else "ok",
+    )
+
+
+def _on_connection(server_url: str, event: str):
+    if event == "connected":
+        OPCUA_CONNECTIONS.inc(server=server_url, result="success")
+        OPCUA_SESSIONS.inc(server=server_url)
+    elif event == "failed":
+        OPCUA_CONNECTIONS.inc(server=server_url, result="failure")
+    elif event == "circuit_open":
+        OPCUA_CONNECTIONS.inc(server=server_url, result="circuit_open")
+    elif event == "disconnected":
+        OPCUA_SESSIONS.dec(server=server_url)
+
+
+def instrument_opcua_client():
+    """Feed MCPClient service calls and connections into the registry."""
+    from opcua_client.client import add_connection_observer, add_service_observer
+
+    add_service_observer(_on_service_call)
+    add_connection_observer(_on_connection)
@@ -0,0 +1,226 @@
+"""
+Opt-in per-request profiling.
+
+A ``RequestProfile`` is bound to the current context while a request is being
+served. Code marks its phases with ``phase("browse")``; OPC UA service calls
+made by ``MCPClient`` are counted by type; and a background sampler records
+the call stacks of every thread that ran a phase. With no active profile all
+of this is a cheap no-op.
+
+Phases can nest (``browse`` inside ``coalesced``, for instance); each is
+reported with its full duration, and ``unattributed_s`` is the wall time not
+covered by any outermost phase. With ``--production`` the catalog runs in the
+owner process, so its phases (connect, browse, read, ...), service calls and
+stacks are not part of a worker's profile: their time shows up as unattributed.
+"""
+
+import contextvars
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 48
+TOP_STACKS = 15
+RECENT_PROFILES = 50
+
+_current = contextvars.ContextVar("mcp_request_profile", default=None)
+_ids = itertools.count(1)
+_recent = deque(maxlen=RECENT_PROFILES)
+_recent_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class RequestProfile:
+    def __init__(self, name: str, sample_interval: float = SAMPLE_INTERVAL):
+        self.id = f"p{next(_ids)}"
+        self.name = name
+        self.sample_interval = sample_interval
+        self.phases = Counter()  # phase → seconds
+        self.phase_calls = Counter()
+        self.service_calls = Counter()  # service → calls
+        self.service_seconds = Counter()
+        self.service_errors = Counter()
+        self.servers = Counter()  # server_url → calls
+        self.stacks = Counter()  # collapsed stack → samples
+        self.samples = 0
+        self.wall_s = None
+        self._threads = set()
+        self._depth = Counter()  # thread → phases open in it
+        self._top_level_s = 0.0  # time in outermost phases
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._stopped = threading.Event()
+        self._sampler = None
+
+    # ---------- Recording ----------
+    def enter_phase(self, ident: int):
+        with self._lock:
+            self._threads.add(ident)
+            self._depth[ident] += 1
+
+    def exit_phase(self, ident: int, name: str, seconds: float):
+        with self._lock:
+            self.phases[name] += seconds
+            self.phase_calls[name] += 1
+            self._depth[ident] -= 1
+            if not self._depth[ident]:
+                self._top_level_s += seconds
+
+    def add_service_call(self, server_url: str, service: str, seconds: float, error):
+        with self._lock:
+            self.service_calls[service] += 1
+            self.service_seconds[service] += seconds
+            self.servers[server_url] += 1
+            if error is not None:
+                self.service_errors[service] += 1
+
+    # ---------- Stack sampling ----------
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stopped.wait(self.sample_interval):
+            with self._lock:
+                threads = set(self._threads)
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                with self._lock:
+                    self.stacks[";".join(reversed(stack))] += 1
+                    self.samples += 1
+
+    def start(self):
+        self._sampler = threading.Thread(
+            target=self._sample, name=f"profile-{self.id}", daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.wall_s = time.perf_counter() - self._started
+
+    # ---------- Reporting ----------
+    def to_dict(self) -> dict:
+        wall = (
+            self.wall_s
+            if self.wall_s is not None
+            else time.perf_counter() - self._started
+        )
+        with self._lock:
+            phases = {
+                name: {"seconds": seconds, "calls": self.phase_calls[name]}
+                for name, seconds in self.phases.items()
+            }
+            services = {
+                service: {
+                    "calls": calls,
+                    "seconds": self.service_seconds[service],
+                    "errors": self.service_errors[service],
+                }
+                for service, calls in self.service_calls.most_common()
+            }
+            stacks = [
+                {"stack": stack, "samples": count}
+                for stack, count in self.stacks.most_common(TOP_STACKS)
+            ]
+            return {
+                "id": self.id,
+                "name": self.name,
+                "wall_s": wall,
+                "phases": phases,
+                "unattributed_s": max(0.0, wall - self._top_level_s),
+                "opcua": {
+                    "total_calls": sum(self.service_calls.values()),
+                    "by_service": services,
+                    "by_server": dict(self.servers),
+                },
+                "sampling": {
+                    "interval_s": self.sample_interval,
+                    "samples": self.samples,
+                    "top_stacks": stacks,
+                },
+            }
+
+    def server_timing(self) -> str:
+        """Phases as a ``Server-Timing`` header value (durations in ms)."""
+        with self._lock:
+            parts = [
+                f"{name};dur={seconds * 1000:.1f}"
+                for name, seconds in self.phases.items()
+            ]
+        if self.wall_s is not None:
+            parts.append(f"total;dur={self.wall_s * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def active() -> RequestProfile | None:
+    return _current.get()
+
+
+@contextmanager
+def profiling(name: str):
+    """Profile everything run in this context (including threadpool calls)."""
+    profile = RequestProfile(name)
+    token = _current.set(profile)
+    # Threads are sampled once they enter a phase; registering this one here
+    # would mostly sample an idle event loop for threadpool routes.
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _current.reset(token)
+        with _recent_lock:
+            _recent.append(profile)
+
+
+@contextmanager
+def phase(name: str):
+    """Attribute the wall time of this block to ``name`` when profiling."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    ident = threading.get_ident()
+    profile.enter_phase(ident)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.exit_phase(ident, name, time.perf_counter() - started)
+
+
+def get_profile(profile_id: str) -> RequestProfile | None:
+    with _recent_lock:
+        for profile in _recent:
+            if profile.id == profile_id:
+                return profile
+    return None
+
+
+def _on_service_call(server_url: str, service: str, seconds: float, error):
+    profile = _current.get()
+    if profile is not None:
+        profile.add_service_call(server_url, service, seconds, error)
+
+
+def trace_opcua_client():
+    """Count MCPClient service calls against the active profile."""
+    from opcua_client.client import add_service_observer
+
+    add_service_observer(_on_service_call)
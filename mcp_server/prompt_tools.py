@@ -1,16 +1,112 @@
-from opcua_client import MCPClient
-from mcp_server.models import OPCUATag
+from collections import Counter
+from mcp_server.models import OPCUATag, TagType
 from typing import List
 
+_INTEGER_TYPES = {
+    "SByte",
+    "Byte",
+    "Int16",
+    "UInt16",
+    "Int32",
+    "UInt32",
+    "Int64",
+    "UInt64",
+}
+_NUMERIC_TYPES = _INTEGER_TYPES | {"Float", "Double"}
+_STATE_NAMES = ("status", "state", "mode")
+# Distinct values listed per tag name before only their count is given
+MAX_STATES = 8
 
-def generate_prompt_from_tags(tags: List[OPCUATag]) -> str:
+
+def tag_type(tag: OPCUATag) -> TagType:
+    """Classify a tag from its data type and name (``*Status`` → status, ...)."""
+    kind = tag.data_type.rsplit(".", 1)[-1]
+    named_state = tag.display_name.lower().endswith(_STATE_NAMES)
+    if kind == "Boolean":
+        return "boolean"
+    if kind in _NUMERIC_TYPES:
+        return "enum" if named_state and kind in _INTEGER_TYPES else "analog"
+    return "status" if named_state else "string"
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return "unreadable"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    if isinstance(value, str):
+        return f'"{value}"'
+    return str(value)
+
+
+def summarize_values(tags: List[OPCUATag], values: list) -> List[str]:
+    """
+    One line per tag name (e.g. every ``MotorTemp``): the range of current
+    values for analog tags, true/false counts for booleans, and the observed
+    states for status, enum and string tags.
+    """
+    groups = {}  # (display name, tag type) → values
+    for tag, value in zip(tags, values):
+        groups.setdefault((tag.display_name, tag_type(tag)), []).append(value)
+
+    lines = []
+    for (name, kind), group in groups.items():
+        head = f"- {name} ({kind}, {len(group)} tag{'' if len(group) == 1 else 's'})"
+        readable = [value for value in group if value is not None]
+        if not readable:
+            lines.append(f"{head}: no readable values")
+            continue
+        if kind == "analog":
+            numbers = [v for v in readable if isinstance(v, (int, float))]
+            if not numbers:
+                lines.append(f"{head}: no numeric values")
+                continue
+            low, high = min(numbers), max(numbers)
+            mean = sum(numbers) / len(numbers)
+            detail = (
+                f"{_format_value(low)}"
+                if low == high
+                else f"{_format_value(low)} .. {_format_value(high)}, "
+                f"mean {_format_value(float(mean))}"
+            )
+        elif kind == "boolean":
+            true = sum(1 for value in readable if value)
+            detail = f"{true} true, {len(readable) - true} false"
+        else:
+            states = Counter(_format_value(value) for value in readable)
+            if len(states) > MAX_STATES:
+                detail = f"{len(states)} distinct values"
+            else:
+                detail = "states " + ", ".join(
+                    f"{state} ({count})" for state, count in states.most_common()
+                )
+        lines.append(f"{head}: {detail}")
+    return lines
+
+
+def generate_prompt_from_tags(tags: List[OPCUATag], values: list = None) -> str:
+    """
+    Modeling prompt listing ``tags``. With ``values`` (one per tag, ``None``
+    if unreadable) every tag shows its current value and a per-name summary
+    of value ranges and states follows the list.
+    """
     lines = [
         "You are analyzing OPC UA tag data for an industrial system.",
         "The following tags are available:",
         "",
     ]
-    for tag in tags:
-        lines.append(f"- {tag.browse_path} ({tag.data_type}) [{tag.node_id}]")
+    for index, tag in enumerate(tags):
+        line = f"- {tag.browse_path} ({tag.data_type}) [{tag.node_id}]"
+        if values is not None:
+            line += f" = {_format_value(values[index])}"
+        lines.append(line)
+
+    if values is not None:
+        lines.append("")
+        lines.append("Current values by tag name (range or observed states):")
+        lines.extend(summarize_values(tags, values))
 
     lines.append("")
     lines.append(
@@ -0,0 +1,137 @@
+"""
+Ranked fuzzy search over tag catalogs.
+
+``TagIndex`` splits display names and browse paths into word tokens
+(``Line3/PumpTemperature`` → ``line 3 pump temperature``) and keeps an
+inverted index from token to tags plus a trigram index from trigram to token.
+A query token matches index tokens that share enough trigrams with it, that it
+is a prefix of, or that abbreviate it ("Temp" for "temperature"), so typos and
+partial words still find their tags. Matches
+are weighted by similarity, rarity (idf) and whether they hit the display name
+or only the path; tags matching every query term rank first.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from mcp_server.models import OPCUATag
+
+# Word tokens: "PumpTemperature" → Pump, Temperature; "Line3" → Line, 3; "pH"
+_TOKEN = re.compile(
+    r"(?<![A-Za-z])[a-z][A-Z](?![A-Za-z])|[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+"
+)
+
+NAME_WEIGHT = 2.0  # token found in the display name
+PATH_WEIGHT = 1.0  # token found only in a parent path segment
+PREFIX_SIMILARITY = 0.9  # query "temp" → "temperature"
+ABBREVIATION_SIMILARITY = 0.7  # query "temperature" → "temp" (as in MotorTemp)
+MIN_SIMILARITY = 0.4  # trigram Jaccard below this is not a match
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.lower() for token in _TOKEN.findall(text)]
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"^{token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _normalize_data_type(data_type: str) -> str:
+    """``VariantType.Double`` and ``double`` both become ``double``."""
+    return data_type.rsplit(".", 1)[-1].lower()
+
+
+class TagIndex:
+    def __init__(self, tags: list[OPCUATag]):
+        self.tags = list(tags)
+        self._postings = defaultdict(dict)  # token → {tag index: field weight}
+        for doc, tag in enumerate(self.tags):
+            for token in tokenize(tag.browse_path):
+                self._postings[token].setdefault(doc, PATH_WEIGHT)
+            for token in tokenize(tag.display_name):
+                self._postings[token][doc] = NAME_WEIGHT
+
+        self._grams = defaultdict(set)  # trigram → tokens containing it
+        for token in self._postings:
+            for gram in _trigrams(token):
+                self._grams[gram].add(token)
+        total = max(1, len(self.tags))
+        self._idf = {
+            token: math.log(1 + total / len(docs))
+            for token, docs in self._postings.items()
+        }
+        self._data_types = [_normalize_data_type(tag.data_type) for tag in self.tags]
+
+    def __len__(self):
+        return len(self.tags)
+
+    def _similar_tokens(self, query_token: str):
+        """Index tokens matching ``query_token``, with a similarity in (0, 1]."""
+        if query_token in self._postings:
+            yield query_token, 1.0
+        if query_token.isdigit():
+            return  # "3" must not match "33"
+
+        query_grams = _trigrams(query_token)
+        shared = Counter()
+        for gram in query_grams:
+            for token in self._grams.get(gram, ()):
+                shared[token] += 1
+        for token, count in shared.items():
+            if token == query_token:
+                continue
+            similarity = count / (len(query_grams) + len(_trigrams(token)) - count)
+            if token.startswith(query_token):
+                similarity = max(similarity, PREFIX_SIMILARITY)
+            elif len(token) >= 3 and query_token.startswith(token):
+                similarity = max(similarity, ABBREVIATION_SIMILARITY)
+            if similarity >= MIN_SIMILARITY:
+                yield token, similarity
+
+    def search(
+        self, query: str, k: int = 10, data_type: str | None = None
+    ) -> tuple[list[tuple[int, float, OPCUATag]], Counter]:
+        """
+        The ``k`` best ``(matched terms, score, tag)`` matches, best first, and
+        the data-type counts of all matches (before the ``data_type`` filter, so
+        agents can refine). Merge results of several indexes on
+        ``(matched terms, score)``: a score alone does not order them.
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return [], Counter()
+
+        scores = defaultdict(float)
+        matched_terms = Counter()
+        for query_token in query_tokens:
+            best = {}  # tag index → best score for this query term
+            for token, similarity in self._similar_tokens(query_token):
+                weight = similarity * self._idf[token]
+                for doc, field_weight in self._postings[token].items():
+                    score = weight * field_weight
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] += score
+                matched_terms[doc] += 1
+
+        facets = Counter(self._data_types[doc] for doc in scores)
+        wanted = _normalize_data_type(data_type) if data_type else None
+        # Ranked by how many terms matched first, so tags that match every term
+        # outrank tags that match a few terms well; ties keep catalog order
+        ranked = (
+            (
+                matched_terms[doc],
+                score * (matched_terms[doc] / len(query_tokens)) ** 2,
+                -doc,
+            )
+            for doc, score in scores.items()
+            if wanted is None or self._data_types[doc] == wanted
+        )
+        top = heapq.nlargest(k, ranked)
+        return [
+            (matched, score, self.tags[-negated]) for matched, score, negated in top
+        ], facets
@@ -1,27 +1,86 @@
 # mcp_server/server.py
 
 from fastapi import FastAPI, Query, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from contextlib import asynccontextmanager
+import asyncio
 import json
+import math
 import logging
-from mcp_server.broker import get_tags_from_server, generate_model_prompt
+import time
+from starlette.concurrency import run_in_threadpool
+from logsetup import configure_logging
+from opcua_client.breaker import CircuitOpen
+from mcp_server.admission import Overloaded
+from mcp_server.broker import (
+    get_tags_from_server,
+    generate_model_prompt,
+    read_tag_snapshot,
+    read_tag_value,
+    response_fingerprint,
+    search_tags,
+    write_tag_values,
+)
+from mcp_server.catalog import close_catalog, get_catalog, is_remote
+from mcp_server.encoding import (
+    COMPRESS_MIN_BYTES,
+    NotAcceptable,
+    choose_encoding,
+    compress,
+    encode,
+    negotiate,
+)
+from mcp_server.export import (
+    FORMATS as EXPORT_FORMATS,
+    KINDS as EXPORT_KINDS,
+    MEDIA_TYPES as EXPORT_MEDIA_TYPES,
+    ExportUnavailable,
+    stream_export,
+)
+from mcp_server.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_SECONDS,
+    REGISTRY,
+    TOOL_CALL_SECONDS,
+    instrument_opcua_client,
+    merge_expositions,
+)
+from mcp_server.profiling import get_profile, phase, profiling, trace_opcua_client
 from mcp_server.prompt_tools import generate_prompt_from_tags
 from mcp_server.tool_registry import TOOL_REGISTRY
-from opcua_client import MCPClient
+from mcp_server.warmup import WARMUP_ENABLED, Warmup
 
 # Logger
 logger = logging.getLogger("mcp_server")
 logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s - %(message)s"))
-logger.addHandler(handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Configure logging when the app starts, not when the module is imported
+    configure_logging()
+    # Connect to and crawl the known servers before the first request needs them
+    app.state.warmup = Warmup(KNOWN_SERVERS if WARMUP_ENABLED else []).start()
+    yield
+    app.state.warmup.stop()
+    # Persistent OPC UA sessions would otherwise keep the process alive
+    close_catalog()
+
 
 app = FastAPI(
     title="MCP Server",
     description="Model Control Plane API for browsing and retrieving OPC UA data",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware for MCP Inspector
@@ -33,6 +92,192 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+instrument_opcua_client()
+trace_opcua_client()
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    HTTP_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """Profile one request when it carries ``X-Profile: 1``."""
+    if request.headers.get("x-profile", "0").lower() in ("", "0", "false", "no"):
+        return await call_next(request)
+    with profiling(f"{request.method} {request.url.path}") as profile:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = profile.server_timing()
+    response.headers["X-Profile-Id"] = profile.id
+    return response
+
+
+def _encode(payload: Any) -> Any:
+    with phase("serialize"):
+        return jsonable_encoder(payload)
+
+
+def _render(payload: Any, request: Request | None = None, rows=None) -> Response:
+    """
+    Serialize ``payload`` inside the profiled ``serialize`` phase.
+
+    With ``request``, the body is encoded as its ``Accept`` header asks and
+    compressed if large enough; ``rows(content)`` selects the records for
+    Arrow, which is only offered when ``rows`` is given.
+    """
+    with phase("serialize"):
+        content = jsonable_encoder(payload)
+        if request is None:
+            return JSONResponse(content)
+        media_type = negotiate(request.headers.get("accept"), tabular=rows is not None)
+        body = encode(content, media_type, rows)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    coding = choose_encoding(request.headers.get("accept-encoding"))
+    if coding and len(body) >= COMPRESS_MIN_BYTES:
+        with phase("compress"):
+            body = compress(body, coding)
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def _records(content: Any) -> list:
+    return content
+
+
+def _record(content: Any) -> list:
+    return [content]
+
+
+def _results(content: Any) -> list:
+    return content["results"]
+
+
+# JSON-RPC error codes for requests shed by admission control and for servers
+# whose circuit breaker is open
+OVERLOADED_ERROR = -32001
+UNAVAILABLE_ERROR = -32002
+
+# Raised by the broker with their own status codes; routes let them through
+_PASSTHROUGH_ERRORS = (Overloaded, CircuitOpen, NotAcceptable)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(CircuitOpen)
+async def circuit_open_handler(request: Request, exc: CircuitOpen):
+    retry_after = max(1, math.ceil(exc.retry_after))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "retry_after": retry_after},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+@app.exception_handler(NotAcceptable)
+async def not_acceptable_handler(request: Request, exc: NotAcceptable):
+    return JSONResponse(
+        status_code=406, content={"detail": str(exc), "offered": exc.offered}
+    )
+
+
+def _overloaded_message(id: Any, exc: Overloaded) -> Dict[str, Any]:
+    """JSON-RPC error for a shed tool call, with the retry hint in ``data``."""
+    return {
+        "jsonrpc": "2.0",
+        "id": id,
+        "error": {
+            "code": OVERLOADED_ERROR,
+            "message": str(exc),
+            "data": {"server_url": exc.server_url, "retry_after": exc.retry_after},
+        },
+    }
+
+
+def _overloaded_error(id: Any, exc: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        _overloaded_message(id, exc), headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+def _unavailable_message(id: Any, exc: CircuitOpen) -> Dict[str, Any]:
+    """JSON-RPC error for a tool call against a server whose circuit is open."""
+    return {
+        "jsonrpc": "2.0",
+        "id": id,
+        "error": {
+            "code": UNAVAILABLE_ERROR,
+            "message": str(exc),
+            "data": {
+                "server_url": exc.server_url,
+                "retry_after": round(exc.retry_after, 3),
+            },
+        },
+    }
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _conditional(
+    request: Request, kind: str, servers: List[str], skip_system_tags: bool
+) -> tuple[str | None, Response | None]:
+    """
+    ETag of a tags/prompt response and, if the client already has it, the 304
+    to send instead. Both are None when a server cannot be fingerprinted; the
+    request then proceeds unconditionally and reports the error itself.
+    """
+    try:
+        with phase("fingerprint"):
+            fingerprint = response_fingerprint(kind, servers, skip_system_tags)
+    except Overloaded:
+        raise
+    except Exception:
+        return None, None
+    etag = f'W/"{fingerprint}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return etag, Response(status_code=304, headers={"ETag": etag})
+    return etag, None
+
+
+def _with_etag(response: Response, etag: str | None) -> Response:
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
 # Known OPC UA servers
 KNOWN_SERVERS = [
     "opc.tcp://localhost:4840",
@@ -46,11 +291,33 @@ class ServerList(BaseModel):
     skip_system_tags: bool = True
 
 
+class PromptRequest(ServerList):
+    enriched: bool = False
+
+
+class TagWrite(BaseModel):
+    server_url: str
+    node_id: str
+    value: Any
+
+
+class WriteBatch(BaseModel):
+    writes: List[TagWrite]
+
+
 @app.get("/")
 def health() -> Dict[str, Any]:
     return {"ok": True, "name": "MCP Server", "version": "0.1.0"}
 
 
+@app.get("/ready")
+def ready(request: Request):
+    """Readiness for load balancers: 503 until the known servers are warmed up."""
+    warmup = getattr(request.app.state, "warmup", None)
+    status = warmup.status() if warmup else {"ready": True, "servers": {}}
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
 @app.options("/")
 async def options_handler():
     """Handle CORS preflight requests"""
@@ -63,16 +330,28 @@ def list_servers() -> List[str]:
 
 
 @app.get("/tags")
-def get_tags(server_url: str = Query(...), skip_system_tags: bool = True):
+def get_tags(
+    request: Request, server_url: str = Query(...), skip_system_tags: bool = True
+):
+    etag, not_modified = _conditional(request, "tags", [server_url], skip_system_tags)
+    if not_modified:
+        return not_modified
     try:
         tags = get_tags_from_server(server_url, skip_system_tags=skip_system_tags)
-        return tags
+        return _with_etag(_render(tags, request, _records), etag)
+    except _PASSTHROUGH_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/tags/batch")
-def get_tags_batch(data: ServerList):
+def get_tags_batch(request: Request, data: ServerList):
+    etag, not_modified = _conditional(
+        request, "tags", data.servers, data.skip_system_tags
+    )
+    if not_modified:
+        return not_modified
     all_tags = []
     for url in data.servers:
         try:
@@ -80,48 +359,420 @@ def get_tags_batch(data: ServerList):
             all_tags.extend(tags)
         except Exception as e:
             all_tags.append({"server_url": url, "error": str(e)})
-    return all_tags
+    return _with_etag(_render(all_tags, request, _records), etag)
+
+
+@app.get("/tags/search")
+def search_tags_endpoint(
+    request: Request,
+    q: str = Query(..., description="Free text, e.g. 'pump temperature line 3'"),
+    k: int = Query(10, ge=1, le=200),
+    data_type: str | None = None,
+    server_url: List[str] = Query(default=[]),
+    skip_system_tags: bool = True,
+):
+    result = search_tags(
+        q,
+        servers=server_url,
+        k=k,
+        data_type=data_type,
+        skip_system_tags=skip_system_tags,
+        default_servers=KNOWN_SERVERS,
+    )
+    return _render(result, request, _results)
 
 
 @app.get("/value")
-def read_tag_value(server_url: str = Query(...), node_id: str = Query(...)):
+def get_value(
+    request: Request, server_url: str = Query(...), node_id: str = Query(...)
+):
+    try:
+        value = read_tag_value(server_url, node_id)
+        return _render({"value": value}, request, _record)
+    except _PASSTHROUGH_ERRORS:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/values/write")
+def write_values(data: WriteBatch):
+    # Values that do not fit a tag come back as that item's status; only a
+    # batch that cannot be processed at all fails the request
     try:
-        client = MCPClient([server_url])
-        client.connect_all()
-        value = client.read_node(server_url, node_id)
-        client.disconnect_all()
-        return {"value": value}
+        results = write_tag_values([write.model_dump() for write in data.writes])
+        return _render({"results": results})
+    except _PASSTHROUGH_ERRORS:
+        raise
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/prompt")
-def get_prompt(server_url: str = Query(...), skip_system_tags: bool = True):
+def get_prompt(
+    request: Request,
+    server_url: str = Query(...),
+    skip_system_tags: bool = True,
+    enriched: bool = False,
+):
+    # Enriched prompts carry live values, which the catalog ETag does not cover
+    etag, not_modified = None, None
+    if not enriched:
+        etag, not_modified = _conditional(
+            request, "prompt", [server_url], skip_system_tags
+        )
+    if not_modified:
+        return not_modified
     try:
-        prompt = generate_model_prompt(server_url, skip_system_tags=skip_system_tags)
-        return {"prompt": prompt}
+        prompt = generate_model_prompt(
+            server_url, skip_system_tags=skip_system_tags, enriched=enriched
+        )
+        return _with_etag(_render({"prompt": prompt}, request), etag)
+    except _PASSTHROUGH_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/prompt/batch")
-def get_prompt_batch(data: ServerList):
+def get_prompt_batch(request: Request, data: PromptRequest):
+    etag, not_modified = None, None
+    if not data.enriched:
+        etag, not_modified = _conditional(
+            request, "prompt", data.servers, data.skip_system_tags
+        )
+    if not_modified:
+        return not_modified
     try:
         all_tags = []
         for url in data.servers:
             tags = get_tags_from_server(url, skip_system_tags=data.skip_system_tags)
             all_tags.extend(tags)
-        prompt = generate_prompt_from_tags(all_tags)
-        return {"prompt": prompt}
+        values = read_tag_snapshot(all_tags) if data.enriched else None
+        with phase("prompt"):
+            prompt = generate_prompt_from_tags(all_tags, values)
+        return _with_etag(_render({"prompt": prompt}, request), etag)
+    except _PASSTHROUGH_ERRORS:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/export")
+def export_endpoint(
+    server_url: List[str] = Query(...),
+    kind: str = Query("tags", description=f"One of {EXPORT_KINDS}"),
+    format: str = Query("parquet", description=f"One of {EXPORT_FORMATS}"),
+    samples: int = Query(1, ge=1, le=100_000),
+    interval: float = Query(1.0, ge=0),
+    skip_system_tags: bool = True,
+):
+    """Stream a tag catalog or sampled values as Parquet/Arrow, row group by row group."""
+    if kind not in EXPORT_KINDS or format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"kind must be one of {EXPORT_KINDS}, format one of {EXPORT_FORMATS}",
+        )
+    try:
+        pieces = stream_export(
+            server_url,
+            kind=kind,
+            format=format,
+            samples=samples,
+            interval=interval,
+            skip_system_tags=skip_system_tags,
+        )
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except _PASSTHROUGH_ERRORS:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        pieces,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{extension}"'},
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    text = REGISTRY.render()
+    if is_remote():
+        # OPC UA, crawl and catalog cache metrics live in the catalog owner
+        try:
+            text = merge_expositions(text, get_catalog().metrics())
+        except Exception as e:
+            logger.warning("Could not collect catalog owner metrics: %s", e)
+    return PlainTextResponse(
+        text, media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/profiles/{profile_id}")
+def read_profile(profile_id: str):
+    """Full breakdown of a recent ``X-Profile`` request."""
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found")
+    return profile.to_dict()
+
+
 @app.get("/registry")
 def get_registry():
     return TOOL_REGISTRY
 
 
+def _initialize_result() -> Dict[str, Any]:
+    return {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {"tools": {"listChanged": True}},
+        "serverInfo": {"name": "MCP Server", "version": "0.1.0"},
+    }
+
+
+def _list_tools() -> List[Dict[str, Any]]:
+    tools = []
+    for t in TOOL_REGISTRY.get("tools", []):
+        tools.append(
+            {
+                "name": t["name"],
+                "description": t["description"],
+                "inputSchema": t["input_schema"],
+            }
+        )
+    return tools
+
+
+# ---------- MCP tool dispatch ----------
+def _fingerprint(
+    arguments: Dict[str, Any], kind: str, servers: List[str], skip_system_tags: bool
+) -> tuple[str | None, Dict[str, Any] | None]:
+    """
+    The response fingerprint and, when it equals the caller's ``if_fingerprint``,
+    the ``unchanged`` result to return instead of the full payload.
+    """
+    try:
+        fingerprint = response_fingerprint(kind, servers, skip_system_tags)
+    except Overloaded:
+        raise
+    except Exception:
+        return None, None
+    if arguments.get("if_fingerprint") == fingerprint:
+        return fingerprint, {"unchanged": True, "fingerprint": fingerprint}
+    return fingerprint, None
+
+
+def _tool_get_tags(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    server_url = arguments.get("server_url")
+    skip_system_tags = arguments.get("skip_system_tags", True)
+    fingerprint, unchanged = _fingerprint(
+        arguments, "tags", [server_url], skip_system_tags
+    )
+    if unchanged:
+        return unchanged
+    tags = get_tags_from_server(server_url, skip_system_tags=skip_system_tags)
+    return {"tags": tags, "fingerprint": fingerprint}
+
+
+def _tool_get_tags_batch(arguments: Dict[str, Any], progress=None) -> Dict[str, Any]:
+    servers = arguments.get("servers", [])
+    skip_system_tags = arguments.get("skip_system_tags", True)
+    fingerprint, unchanged = _fingerprint(arguments, "tags", servers, skip_system_tags)
+    if unchanged:
+        return unchanged
+    all_tags = []
+    for done, url in enumerate(servers, 1):
+        try:
+            tags = get_tags_from_server(url, skip_system_tags=skip_system_tags)
+            all_tags.extend(tags)
+            partial = {"server_url": url, "tags": tags}
+        except Exception as e:
+            all_tags.append({"server_url": url, "error": str(e)})
+            partial = all_tags[-1]
+        if progress:
+            progress(done, len(servers), f"Fetched tags from {url}", partial)
+    return {"tags": all_tags, "fingerprint": fingerprint}
+
+
+def _tool_generate_prompt(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    server_url = arguments.get("server_url")
+    skip_system_tags = arguments.get("skip_system_tags", True)
+    if arguments.get("enriched"):
+        prompt = generate_model_prompt(
+            server_url, skip_system_tags=skip_system_tags, enriched=True
+        )
+        return {"prompt": prompt}
+    fingerprint, unchanged = _fingerprint(
+        arguments, "prompt", [server_url], skip_system_tags
+    )
+    if unchanged:
+        return unchanged
+    prompt = generate_model_prompt(server_url, skip_system_tags=skip_system_tags)
+    return {"prompt": prompt, "fingerprint": fingerprint}
+
+
+def _tool_generate_prompt_batch(
+    arguments: Dict[str, Any], progress=None
+) -> Dict[str, Any]:
+    servers = arguments.get("servers", [])
+    skip_system_tags = arguments.get("skip_system_tags", True)
+    enriched = bool(arguments.get("enriched"))
+    fingerprint = None
+    if not enriched:
+        fingerprint, unchanged = _fingerprint(
+            arguments, "prompt", servers, skip_system_tags
+        )
+        if unchanged:
+            return unchanged
+    all_tags = []
+    all_values = [] if enriched else None
+    for done, url in enumerate(servers, 1):
+        tags = get_tags_from_server(url, skip_system_tags=skip_system_tags)
+        values = read_tag_snapshot(tags) if enriched else None
+        all_tags.extend(tags)
+        if enriched:
+            all_values.extend(values)
+        if progress:
+            # The server's own prompt, usable before the combined one is ready
+            with phase("prompt"):
+                partial = {
+                    "server_url": url,
+                    "prompt": generate_prompt_from_tags(tags, values),
+                }
+            progress(done, len(servers), f"Fetched tags from {url}", partial)
+    with phase("prompt"):
+        prompt = generate_prompt_from_tags(all_tags, all_values)
+    if enriched:
+        return {"prompt": prompt}
+    return {"prompt": prompt, "fingerprint": fingerprint}
+
+
+def _tool_search_tags(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return search_tags(
+        arguments.get("query", ""),
+        servers=arguments.get("servers"),
+        k=int(arguments.get("k", 10)),
+        data_type=arguments.get("data_type"),
+        skip_system_tags=arguments.get("skip_system_tags", True),
+        default_servers=KNOWN_SERVERS,
+    )
+
+
+def _tool_write_values(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {"results": write_tag_values(arguments.get("writes", []))}
+
+
+TOOL_HANDLERS = {
+    "get_tags": _tool_get_tags,
+    "get_tags_batch": _tool_get_tags_batch,
+    "generate_prompt": _tool_generate_prompt,
+    "generate_prompt_batch": _tool_generate_prompt_batch,
+    "search_tags": _tool_search_tags,
+    "write_values": _tool_write_values,
+}
+
+
+# Tools that accept ``progress(done, total, message, partial)`` and report
+# each server as it completes
+STREAMING_TOOLS = {"get_tags_batch", "generate_prompt_batch"}
+
+
+def _call_tool(
+    tool_name: str, arguments: Dict[str, Any], progress=None
+) -> Dict[str, Any]:
+    """Run a known tool, recording its latency under ``mcp_tool_call_duration_seconds``."""
+    started = time.perf_counter()
+    status = "error"
+    try:
+        if progress and tool_name in STREAMING_TOOLS:
+            result = TOOL_HANDLERS[tool_name](arguments, progress=progress)
+        else:
+            result = TOOL_HANDLERS[tool_name](arguments)
+        status = "ok"
+        return result
+    finally:
+        TOOL_CALL_SECONDS.observe(
+            time.perf_counter() - started, tool=tool_name, status=status
+        )
+
+
+def _sse(message: Dict[str, Any]) -> str:
+    return f"event: message\ndata: {json.dumps(jsonable_encoder(message))}\n\n"
+
+
+def _stream_tool_call(
+    id: Any, tool_name: str, arguments: Dict[str, Any], progress_token: Any
+) -> StreamingResponse:
+    """
+    Answer a ``tools/call`` as a Server-Sent Events stream: MCP progress
+    notifications, and a ``notifications/tools/partial_result`` with each
+    server's result as it completes, then the JSON-RPC response.
+    """
+    loop = asyncio.get_running_loop()
+    messages = asyncio.Queue()
+
+    def progress(done: int, total: int, message: str, partial=None):
+        # Called from the tool's worker thread
+        notifications = [
+            {
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {
+                    "progressToken": progress_token,
+                    "progress": done,
+                    "total": total,
+                    "message": message,
+                },
+            }
+        ]
+        if partial is not None:
+            notifications.append(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/tools/partial_result",
+                    "params": {"progressToken": progress_token, "partial": partial},
+                }
+            )
+        for notification in notifications:
+            loop.call_soon_threadsafe(messages.put_nowait, notification)
+
+    async def run():
+        try:
+            result = await run_in_threadpool(_call_tool, tool_name, arguments, progress)
+            response = {"jsonrpc": "2.0", "id": id, "result": result}
+        except Overloaded as e:
+            response = _overloaded_message(id, e)
+        except CircuitOpen as e:
+            response = _unavailable_message(id, e)
+        except Exception as e:
+            logger.error("Tool %s failed: %s", tool_name, e)
+            response = {
+                "jsonrpc": "2.0",
+                "id": id,
+                "error": {"code": -32603, "message": str(e)},
+            }
+        await messages.put(response)
+        await messages.put(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while (message := await messages.get()) is not None:
+                with phase("serialize"):
+                    event = _sse(message)
+                yield event
+        finally:
+            await task
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
 # MCP endpoint
 @app.post("/")
 async def mcp_entry(request: Request):
@@ -140,68 +791,48 @@ async def mcp_entry(request: Request):
         id = payload.get("id")
 
         if method == "initialize":
-            result = {
-                "protocolVersion": "2025-06-18",
-                "capabilities": {"tools": {"listChanged": True}},
-                "serverInfo": {"name": "MCP Server", "version": "0.1.0"},
-            }
-            return {"jsonrpc": "2.0", "id": id, "result": result}
+            return {"jsonrpc": "2.0", "id": id, "result": _initialize_result()}
 
         elif method == "tools/list":
-            tools = []
-            for t in TOOL_REGISTRY.get("tools", []):
-                tools.append(
-                    {
-                        "name": t["name"],
-                        "description": t["description"],
-                        "inputSchema": t["input_schema"],
-                    }
-                )
-            return {"jsonrpc": "2.0", "id": id, "result": {"tools": tools}}
+            return {"jsonrpc": "2.0", "id": id, "result": {"tools": _list_tools()}}
 
         elif method == "tools/call":
             tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-
-            if tool_name == "get_tags":
-                server_url = arguments.get("server_url")
-                skip_system_tags = arguments.get("skip_system_tags", True)
-                tags = get_tags_from_server(
-                    server_url, skip_system_tags=skip_system_tags
-                )
-                return {"jsonrpc": "2.0", "id": id, "result": {"tags": tags}}
-
-            elif tool_name == "get_tags_batch":
-                servers = arguments.get("servers", [])
-                skip_system_tags = arguments.get("skip_system_tags", True)
-                all_tags = []
-                for url in servers:
-                    try:
-                        tags = get_tags_from_server(
-                            url, skip_system_tags=skip_system_tags
+            arguments = dict(params.get("arguments") or {})
+            # Opt-in profiling: {"name": ..., "arguments": {...}, "profile": true}
+            want_profile = bool(
+                params.get("profile") or arguments.pop("profile", False)
+            )
+
+            # Streamable HTTP: a client that accepts SSE and sends a progress
+            # token gets notifications while the tool runs
+            progress_token = (params.get("_meta") or {}).get("progressToken")
+            if (
+                tool_name in STREAMING_TOOLS
+                and progress_token is not None
+                and not want_profile
+                and "text/event-stream" in request.headers.get("accept", "")
+            ):
+                return _stream_tool_call(id, tool_name, arguments, progress_token)
+
+            if tool_name in TOOL_HANDLERS:
+                # Tools block on OPC UA I/O: keep them off the event loop
+                try:
+                    if not want_profile:
+                        result = await run_in_threadpool(
+                            _call_tool, tool_name, arguments
+                        )
+                        return {"jsonrpc": "2.0", "id": id, "result": _encode(result)}
+                    with profiling(f"tools/call {tool_name}") as profile:
+                        result = _encode(
+                            await run_in_threadpool(_call_tool, tool_name, arguments)
                         )
-                        all_tags.extend(tags)
-                    except Exception as e:
-                        all_tags.append({"server_url": url, "error": str(e)})
-                return {"jsonrpc": "2.0", "id": id, "result": {"tags": all_tags}}
-
-            elif tool_name == "generate_prompt":
-                server_url = arguments.get("server_url")
-                skip_system_tags = arguments.get("skip_system_tags", True)
-                prompt = generate_model_prompt(
-                    server_url, skip_system_tags=skip_system_tags
-                )
-                return {"jsonrpc": "2.0", "id": id, "result": {"prompt": prompt}}
-
-            elif tool_name == "generate_prompt_batch":
-                servers = arguments.get("servers", [])
-                skip_system_tags = arguments.get("skip_system_tags", True)
-                all_tags = []
-                for url in servers:
-                    tags = get_tags_from_server(url, skip_system_tags=skip_system_tags)
-                    all_tags.extend(tags)
-                prompt = generate_prompt_from_tags(all_tags)
-                return {"jsonrpc": "2.0", "id": id, "result": {"prompt": prompt}}
+                except Overloaded as e:
+                    return _overloaded_error(id, e)
+                except CircuitOpen as e:
+                    return _unavailable_message(id, e)
+                result["profile"] = profile.to_dict()
+                return {"jsonrpc": "2.0", "id": id, "result": result}
 
             else:
                 return {
@@ -227,58 +858,13 @@ async def mcp_entry(request: Request):
     )
 
     if tool_name == "initialize":
-        result = {
-            "protocolVersion": "2025-06-18",
-            "capabilities": {"tools": {"listChanged": True}},
-            "serverInfo": {"name": "MCP Server", "version": "0.1.0"},
-        }
-        return result
+        return _initialize_result()
 
     elif tool_name == "tools/list":
-        tools = []
-        for t in TOOL_REGISTRY.get("tools", []):
-            tools.append(
-                {
-                    "name": t["name"],
-                    "description": t["description"],
-                    "inputSchema": t["input_schema"],
-                }
-            )
-        return {"tools": tools}
-
-    elif tool_name == "get_tags":
-        server_url = arguments.get("server_url")
-        skip_system_tags = arguments.get("skip_system_tags", True)
-        tags = get_tags_from_server(server_url, skip_system_tags=skip_system_tags)
-        return {"tags": tags}
+        return {"tools": _list_tools()}
 
-    elif tool_name == "get_tags_batch":
-        servers = arguments.get("servers", [])
-        skip_system_tags = arguments.get("skip_system_tags", True)
-        all_tags = []
-        for url in servers:
-            try:
-                tags = get_tags_from_server(url, skip_system_tags=skip_system_tags)
-                all_tags.extend(tags)
-            except Exception as e:
-                all_tags.append({"server_url": url, "error": str(e)})
-        return {"tags": all_tags}
-
-    elif tool_name == "generate_prompt":
-        server_url = arguments.get("server_url")
-        skip_system_tags = arguments.get("skip_system_tags", True)
-        prompt = generate_model_prompt(server_url, skip_system_tags=skip_system_tags)
-        return {"prompt": prompt}
-
-    elif tool_name == "generate_prompt_batch":
-        servers = arguments.get("servers", [])
-        skip_system_tags = arguments.get("skip_system_tags", True)
-        all_tags = []
-        for url in servers:
-            tags = get_tags_from_server(url, skip_system_tags=skip_system_tags)
-            all_tags.extend(tags)
-        prompt = generate_prompt_from_tags(all_tags)
-        return {"prompt": prompt}
+    elif tool_name in TOOL_HANDLERS:
+        return await run_in_threadpool(_call_tool, tool_name, arguments)
 
     else:
         raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
@@ -0,0 +1,53 @@
+"""
+Single-flight execution of identical concurrent calls.
+
+When several threads ask for the same key at once, only the first runs the
+function; the others wait for it and receive the same result (or exception).
+Nothing is cached once the call finishes, so later callers run it again.
+"""
+
+import threading
+
+from mcp_server.metrics import COALESCED_REQUESTS
+from mcp_server.profiling import phase
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, operation: str):
+        self.operation = operation  # label for mcp_coalesced_requests_total
+        self._lock = threading.Lock()
+        self._calls = {}  # key → in-flight _Call
+
+    def do(self, key, function):
+        """Return ``function()``, sharing one execution among concurrent callers of ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            COALESCED_REQUESTS.inc(operation=self.operation)
+            with phase("coalesced"):
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -1,4 +1,10 @@
-from .broker import get_tags_from_server, generate_model_prompt
+from .broker import (
+    get_tags_from_server,
+    generate_model_prompt,
+    read_tag_snapshot,
+    search_tags,
+    write_tag_values,
+)
 from .prompt_tools import generate_prompt_from_tags
 
 
@@ -29,7 +35,11 @@ async def generate_prompt_handler(args):
     if server_url and server_url.startswith("http://"):
         server_url = server_url.replace("http://", "opc.tcp://", 1)
     skip_system_tags = args.get("skip_system_tags", True)
-    prompt = generate_model_prompt(server_url, skip_system_tags=skip_system_tags)
+    prompt = generate_model_prompt(
+        server_url,
+        skip_system_tags=skip_system_tags,
+        enriched=bool(args.get("enriched")),
+    )
     return {"prompt": prompt}
 
 
@@ -42,10 +52,25 @@ async def generate_prompt_batch_handler(args):
             url = url.replace("http://", "  opc.tcp://", 1)
         tags = get_tags_from_server(url, skip_system_tags=skip_system_tags)
         all_tags.extend(tags)
-    prompt = generate_prompt_from_tags(all_tags)
+    values = read_tag_snapshot(all_tags) if args.get("enriched") else None
+    prompt = generate_prompt_from_tags(all_tags, values)
     return {"prompt": prompt}
 
 
+async def search_tags_handler(args):
+    return search_tags(
+        args.get("query", ""),
+        servers=args.get("servers"),
+        k=args.get("k", 10),
+        data_type=args.get("data_type"),
+        skip_system_tags=args.get("skip_system_tags", True),
+    )
+
+
+async def write_values_handler(args):
+    return {"results": write_tag_values(args.get("writes", []))}
+
+
 TOOL_REGISTRY = {
     "name": "MCP Data Modeling Tools",
     "version": "0.1.0",
@@ -63,6 +88,10 @@ TOOL_REGISTRY = {
                 "properties": {
                     "server_url": {"type": "string"},
                     "skip_system_tags": {"type": "boolean", "default": True},
+                    "if_fingerprint": {
+                        "type": "string",
+                        "description": "Fingerprint from a previous call; returns {unchanged: true} if it still matches.",
+                    },
                 },
                 "required": ["server_url"],
             },
@@ -79,6 +108,10 @@ TOOL_REGISTRY = {
                 "properties": {
                     "servers": {"type": "array", "items": {"type": "string"}},
                     "skip_system_tags": {"type": "boolean", "default": True},
+                    "if_fingerprint": {
+                        "type": "string",
+                        "description": "Fingerprint from a previous call; returns {unchanged: true} if it still matches.",
+                    },
                 },
                 "required": ["servers"],
             },
@@ -95,6 +128,15 @@ TOOL_REGISTRY = {
                 "properties": {
                     "server_url": {"type": "string"},
                     "skip_system_tags": {"type": "boolean", "default": True},
+                    "enriched": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Add each tag's current value and per-name value ranges and states, from one bulk read. Enriched results have no fingerprint.",
+                    },
+                    "if_fingerprint": {
+                        "type": "string",
+                        "description": "Fingerprint from a previous call; returns {unchanged: true} if it still matches.",
+                    },
                 },
                 "required": ["server_url"],
             },
@@ -111,11 +153,65 @@ TOOL_REGISTRY = {
                 "properties": {
                     "servers": {"type": "array", "items": {"type": "string"}},
                     "skip_system_tags": {"type": "boolean", "default": True},
+                    "enriched": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Add each tag's current value and per-name value ranges and states, from one bulk read per server. Enriched results have no fingerprint.",
+                    },
+                    "if_fingerprint": {
+                        "type": "string",
+                        "description": "Fingerprint from a previous call; returns {unchanged: true} if it still matches.",
+                    },
                 },
                 "required": ["servers"],
             },
             "output_schema": {"type": "string"},
             "handler": generate_prompt_batch_handler,
         },
+        {
+            "name": "search_tags",
+            "endpoint": "/tags/search",
+            "method": "GET",
+            "description": "Finds the tags best matching a free-text query (e.g. 'pump temperature line 3') across known servers, ranked, with data-type facets.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                    "servers": {"type": "array", "items": {"type": "string"}},
+                    "k": {"type": "integer", "default": 10},
+                    "data_type": {"type": "string"},
+                    "skip_system_tags": {"type": "boolean", "default": True},
+                },
+                "required": ["query"],
+            },
+            "output_schema": {"type": "object"},
+            "handler": search_tags_handler,
+        },
+        {
+            "name": "write_values",
+            "endpoint": "/values/write",
+            "method": "POST",
+            "description": "Writes setpoints or recipe values to many tags at once, one batched write per server. Values are converted to each tag's data type; returns a status per write.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "writes": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "server_url": {"type": "string"},
+                                "node_id": {"type": "string"},
+                                "value": {},
+                            },
+                            "required": ["server_url", "node_id", "value"],
+                        },
+                    },
+                },
+                "required": ["writes"],
+            },
+            "output_schema": {"type": "object"},
+            "handler": write_values_handler,
+        },
     ],
 }
@@ -0,0 +1,92 @@
+"""
+Background warm-up of OPC UA sessions and catalogs at startup.
+
+``Warmup`` connects to and crawls every known server concurrently, one thread
+per server, so the first ``/tags`` or prompt request finds a warm catalog.
+Each server moves through ``connecting`` → ``crawling`` → ``warm``, or ends up
+``failed`` and is retried every ``MCP_WARMUP_RETRY`` seconds (it stays
+``failed`` while retrying). ``GET /ready`` reports these states for load
+balancers.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from mcp_server.catalog import get_catalog
+
+logger = logging.getLogger("mcp_server.warmup")
+
+# MCP_WARMUP=0 disables warm-up (e.g. for tests)
+WARMUP_ENABLED = os.environ.get("MCP_WARMUP", "1").lower() not in ("0", "false", "no")
+# Seconds between attempts for servers that failed to warm up
+RETRY_INTERVAL = float(os.environ.get("MCP_WARMUP_RETRY", "30"))
+
+CONNECTING = "connecting"
+CRAWLING = "crawling"
+WARM = "warm"
+FAILED = "failed"
+
+
+class Warmup:
+    def __init__(self, servers: list[str], retry_interval: float = RETRY_INTERVAL):
+        self.servers = list(dict.fromkeys(servers))
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._states = {url: {"state": CONNECTING} for url in self.servers}
+        self._stopping = threading.Event()
+
+    def start(self):
+        for url in self.servers:
+            threading.Thread(
+                target=self._warm, args=(url,), name=f"warmup {url}", daemon=True
+            ).start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+
+    def _set(self, url: str, state: str, **details):
+        with self._lock:
+            self._states[url] = {"state": state, "since": time.time(), **details}
+
+    def _warm(self, url: str):
+        attempt = 0
+        while not self._stopping.is_set():
+            attempt += 1
+            started = time.perf_counter()
+            try:
+                store = get_catalog()
+                if attempt == 1:
+                    self._set(url, CONNECTING)
+                store.connect(url)
+                if attempt == 1:
+                    self._set(url, CRAWLING)
+                # Crawls in the catalog owner and returns only a short hash,
+                # where catalog() would ship the whole Catalog to this worker;
+                # it also primes the fingerprint behind /tags ETags
+                store.fingerprint(url)
+            except Exception as e:
+                logger.warning("Warm-up of %s failed (attempt %s): %s", url, attempt, e)
+                self._set(url, FAILED, error=str(e), attempts=attempt)
+                if self._stopping.wait(self.retry_interval):
+                    return
+                continue
+            seconds = round(time.perf_counter() - started, 3)
+            logger.info("Warmed up %s in %ss", url, seconds)
+            self._set(url, WARM, seconds=seconds, attempts=attempt)
+            return
+
+    def status(self) -> dict:
+        """
+        Per-server states and overall readiness: every server has settled
+        (warm or failed) and at least one is warm.
+        """
+        with self._lock:
+            servers = {url: dict(state) for url, state in self._states.items()}
+        states = [entry["state"] for entry in servers.values()]
+        ready = all(state in (WARM, FAILED) for state in states) and (
+            not states or WARM in states
+        )
+        return {"ready": ready, "servers": servers}
@@ -6,8 +6,21 @@ multiple OPC UA servers. It enables reading values, browsing nodes, and integrat
 into the MCP server architecture.
 """
 
-from .client import MCPClient
-
-__all__ = ["MCPClient"]
+__all__ = ["MCPClient", "add_service_observer", "add_connection_observer"]
 __version__ = "0.1.0"
 __author__ = "Ben Duran"
+
+
+def __getattr__(name):
+    # Load the client (and the opcua stack) only when it is first used
+    if name in __all__:
+        from . import client
+
+        value = getattr(client, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
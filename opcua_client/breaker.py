@@ -0,0 +1,127 @@
+"""
+Per-server circuit breakers for unreachable OPC UA servers.
+
+After ``MCP_BREAKER_THRESHOLD`` consecutive connection failures a server's
+breaker opens and calls fail immediately with ``CircuitOpen`` instead of
+waiting for socket and session timeouts. Once the backoff has passed, one
+caller is let through as a half-open probe: success closes the breaker, failure
+re-opens it with the backoff doubled (from ``MCP_BREAKER_BACKOFF`` up to
+``MCP_BREAKER_MAX_BACKOFF`` seconds).
+"""
+
+import os
+import threading
+import time
+
+FAILURE_THRESHOLD = int(os.environ.get("MCP_BREAKER_THRESHOLD", "2"))
+BASE_BACKOFF = float(os.environ.get("MCP_BREAKER_BACKOFF", "1"))
+MAX_BACKOFF = float(os.environ.get("MCP_BREAKER_MAX_BACKOFF", "60"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(ConnectionError):
+    def __init__(self, server_url: str, retry_after: float, last_error: str = ""):
+        # All arguments go to Exception so it survives pickling across processes
+        super().__init__(server_url, retry_after, last_error)
+        self.server_url = server_url
+        self.retry_after = retry_after
+        self.last_error = last_error
+
+    def __str__(self):
+        reason = f" after: {self.last_error}" if self.last_error else ""
+        return (
+            f"{self.server_url} is unreachable (circuit open{reason}), "
+            f"retry in {self.retry_after:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        server_url: str,
+        threshold: int = FAILURE_THRESHOLD,
+        base_backoff: float = BASE_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+    ):
+        self.server_url = server_url
+        self.threshold = max(1, threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.backoff = base_backoff
+        self._open_until = 0.0
+        self._last_error = ""
+
+    def check(self):
+        """Raise ``CircuitOpen`` if a call would be refused now; changes nothing."""
+        with self._lock:
+            if self.state == CLOSED or time.monotonic() >= self._open_until:
+                return
+            retry_after = self._retry_after(time.monotonic())
+        raise CircuitOpen(self.server_url, retry_after, self._last_error)
+
+    def allow(self):
+        """Raise ``CircuitOpen`` unless a call may go to the server now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if now >= self._open_until:
+                # This caller is the probe; if it never reports back, another
+                # probe is let through after max_backoff
+                self.state = HALF_OPEN
+                self._open_until = now + self.max_backoff
+                return
+            retry_after = self._retry_after(now)
+        raise CircuitOpen(self.server_url, retry_after, self._last_error)
+
+    def _retry_after(self, now: float) -> float:
+        remaining = max(0.0, self._open_until - now)
+        if self.state == HALF_OPEN:
+            # A probe is running; its outcome is known well before max_backoff
+            return min(remaining, self.backoff)
+        return remaining
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.backoff = self.base_backoff
+
+    def record_failure(self, error: Exception | str = ""):
+        with self._lock:
+            self.failures += 1
+            self._last_error = str(error)
+            if self.state == HALF_OPEN:
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+            elif self.failures < self.threshold:
+                return
+            self.state = OPEN
+            self._open_until = time.monotonic() + self.backoff
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "retry_after": max(0.0, self._open_until - time.monotonic())
+                if self.state == OPEN
+                else 0.0,
+            }
+
+
+_breakers = {}  # server url → CircuitBreaker
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(server_url: str) -> CircuitBreaker:
+    """The process-wide circuit breaker of ``server_url``."""
+    with _breakers_lock:
+        if server_url not in _breakers:
+            _breakers[server_url] = CircuitBreaker(server_url)
+        return _breakers[server_url]
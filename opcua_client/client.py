@@ -1,37 +1,346 @@
-from opcua import Client
+from opcua import Client, ua
+from opcua.common.node import Node
+from opcua.common.ua_utils import data_type_to_variant_type
 from opcua.ua import NodeClass
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import logging
+import math
+import os
+import threading
+import time
+
+from opcua_client.breaker import CircuitOpen, circuit_breaker
+from opcua_client.loopback import LoopbackClient, is_loopback
+from opcua_client.monitor import AdaptiveMonitor
 
 logger = logging.getLogger("OPCUAClient")
 logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s"))
-logger.addHandler(handler)
+
+# UaClient methods that each cost one request/response round trip → service name
+UA_SERVICES = {
+    "browse": "Browse",
+    "browse_next": "BrowseNext",
+    "read": "Read",
+    "get_attributes": "Read",
+    "write": "Write",
+    "set_attributes": "Write",
+    "translate_browsepaths_to_nodeids": "TranslateBrowsePaths",
+    "history_read": "HistoryRead",
+    "call": "Call",
+    "register_nodes": "RegisterNodes",
+    "create_subscription": "CreateSubscription",
+    "delete_subscriptions": "DeleteSubscriptions",
+    "create_monitored_items": "CreateMonitoredItems",
+    "modify_monitored_items": "ModifyMonitoredItems",
+    "delete_monitored_items": "DeleteMonitoredItems",
+}
+
+# Node classes whose children are browsed when crawling
+CONTAINER_CLASSES = (NodeClass.Object, NodeClass.ObjectType)
+# Nodes per Browse / Read request when crawling in batches
+BROWSE_BATCH = 500
+READ_BATCH = 1000
+# Values per Write request
+WRITE_BATCH = 500
+# References per node per Browse response; the rest come via BrowseNext
+MAX_REFERENCES_PER_NODE = 1000
+# Nodes whose metadata each server's NodeCache keeps
+NODE_CACHE_SIZE = 200_000
+# Seconds to open a socket and session, and to wait for each service response
+CONNECT_TIMEOUT = float(os.environ.get("MCP_CONNECT_TIMEOUT", "3"))
+REQUEST_TIMEOUT = float(os.environ.get("MCP_REQUEST_TIMEOUT", "10"))
+
+# Range of each integer VariantType
+_INTEGER_RANGES = {
+    ua.VariantType.SByte: (-(2**7), 2**7 - 1),
+    ua.VariantType.Byte: (0, 2**8 - 1),
+    ua.VariantType.Int16: (-(2**15), 2**15 - 1),
+    ua.VariantType.UInt16: (0, 2**16 - 1),
+    ua.VariantType.Int32: (-(2**31), 2**31 - 1),
+    ua.VariantType.UInt32: (0, 2**32 - 1),
+    ua.VariantType.Int64: (-(2**63), 2**63 - 1),
+    ua.VariantType.UInt64: (0, 2**64 - 1),
+}
+# Largest finite single-precision float
+_FLOAT_MAX = 3.4028234663852886e38
+_TRUE = {"true", "1", "on", "yes"}
+_FALSE = {"false", "0", "off", "no"}
+
+
+def coerce_value(value, variant_type: ua.VariantType):
+    """
+    Convert a JSON-ish ``value`` to what a ``variant_type`` node stores.
+
+    Raises ``ValueError`` (or ``TypeError``) for values that do not fit, e.g.
+    ``2.5`` for an Int32, ``"maybe"`` for a Boolean or anything for a type
+    other than Boolean, integer, Float, Double and String, and
+    ``OverflowError`` for numbers outside the type's range, e.g. ``300`` for
+    a Byte.
+    """
+    if variant_type == ua.VariantType.Boolean:
+        if isinstance(value, str) and value.strip().lower() in _TRUE | _FALSE:
+            return value.strip().lower() in _TRUE
+        if value in (0, 1):  # True/False included
+            return bool(value)
+        raise ValueError(f"{value!r} is not a Boolean")
+    if variant_type in _INTEGER_RANGES:
+        number = value
+        if isinstance(value, str):
+            try:
+                number = int(value)
+            except ValueError:
+                number = float(value)
+        # int() of an infinite float raises OverflowError, of NaN ValueError
+        if isinstance(number, bool) or number != int(number):
+            raise ValueError(f"{value!r} is not an integer")
+        low, high = _INTEGER_RANGES[variant_type]
+        if not low <= number <= high:
+            raise OverflowError(f"{value!r} is out of range for {variant_type.name}")
+        return int(number)
+    if variant_type in (ua.VariantType.Double, ua.VariantType.Float):
+        if isinstance(value, bool):
+            raise ValueError(f"{value!r} is not a number")
+        number = float(value)
+        if variant_type == ua.VariantType.Float and _FLOAT_MAX < abs(number) < math.inf:
+            raise OverflowError(f"{value!r} is out of range for Float")
+        return number
+    if variant_type == ua.VariantType.String:
+        return str(value)
+    # NodeIds, LocalizedTexts, ExtensionObjects... have no JSON form here; sent
+    # as is they would fail to encode and take the whole Write request down
+    raise TypeError(f"Cannot write {value!r} to a {variant_type.name} node")
+
+
+# Callbacks notified by every MCPClient, used for metrics and tracing
+_service_observers = []  # fn(server_url, service, seconds, error)
+_connection_observers = []  # fn(server_url, event) with connected/failed/disconnected
+
+
+def add_service_observer(callback):
+    """Call ``callback(server_url, service, seconds, error)`` after every service call."""
+    if callback not in _service_observers:
+        _service_observers.append(callback)
+
+
+def add_connection_observer(callback):
+    """Call ``callback(server_url, event)`` on connect, failed connect and disconnect."""
+    if callback not in _connection_observers:
+        _connection_observers.append(callback)
+
+
+def _notify(observers, *args):
+    for callback in observers:
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.warning("Observer %r failed: %s", callback, e)
+
+
+class NodeCache:
+    """
+    Per-server cache of node metadata that does not change while a server runs.
+
+    ``nodes`` is an LRU of node id → (display name, node class, DataType node
+    id) and ``variant_types`` maps each DataType node id to its resolved
+    VariantType. Every MCPClient in the process shares one cache per server
+    URL (see ``node_cache()``), so only the first crawl pays for the reads.
+    """
+
+    def __init__(self, maxsize: int = NODE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._nodes = OrderedDict()
+        self.variant_types = {}  # DataType NodeId → VariantType string
+        self._lock = threading.Lock()
+
+    def get(self, node_id: str):
+        with self._lock:
+            entry = self._nodes.get(node_id)
+            if entry is not None:
+                self._nodes.move_to_end(node_id)
+            return entry
+
+    def put(self, node_id: str, entry: tuple):
+        with self._lock:
+            self._nodes[node_id] = entry
+            self._nodes.move_to_end(node_id)
+            if len(self._nodes) > self.maxsize:
+                self._nodes.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._nodes.clear()
+            self.variant_types.clear()
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+_node_caches = {}  # server url → NodeCache
+_node_caches_lock = threading.Lock()
+
+
+def node_cache(server_url: str) -> NodeCache:
+    """The process-wide node metadata cache of ``server_url``."""
+    with _node_caches_lock:
+        if server_url not in _node_caches:
+            _node_caches[server_url] = NodeCache()
+        return _node_caches[server_url]
+
+
+class BrowseSnapshot:
+    """
+    Child references of every Object seen by a crawl, plus node metadata.
+
+    Kept between crawls so ``MCPClient.refresh_variables()`` only has to
+    re-descend into the Objects whose references changed.
+    """
+
+    def __init__(self, root_id: str):
+        self.root_id = root_id
+        self.children = {}  # Object node id → tuple of child node ids
+        self.nodes = {}  # node id → (display name, node class)
+        self.data_types = {}  # Variable node id → data type string
+
+    def variables(self) -> list[dict]:
+        """The same flat tag list, in the same order, as ``browse_variables()``."""
+        results = []
+        stack = [(self.root_id, "", iter(self.children.get(self.root_id, ())))]
+        on_path = {self.root_id}  # guards against reference cycles
+        while stack:
+            parent, path, child_ids = stack[-1]
+            node_id = next(child_ids, None)
+            if node_id is None:
+                stack.pop()
+                on_path.discard(parent)
+                continue
+            if node_id not in self.nodes:
+                continue
+
+            display_name, node_class = self.nodes[node_id]
+            full_path = f"{path}/{display_name}".strip("/")
+            if node_class == NodeClass.Variable:
+                if node_id in self.data_types:
+                    results.append(
+                        {
+                            "node_id": node_id,
+                            "browse_path": full_path,
+                            "display_name": display_name,
+                            "data_type": self.data_types[node_id],
+                        }
+                    )
+            elif node_id in self.children and node_id not in on_path:
+                on_path.add(node_id)
+                stack.append((node_id, full_path, iter(self.children[node_id])))
+        return results
+
+    def prune(self):
+        """Forget nodes that are no longer reachable from the root."""
+        reachable = {self.root_id}
+        pending = [self.root_id]
+        while pending:
+            for node_id in self.children.get(pending.pop(), ()):
+                if node_id not in reachable:
+                    reachable.add(node_id)
+                    pending.append(node_id)
+        for table in (self.children, self.nodes, self.data_types):
+            for node_id in [k for k in table if k not in reachable]:
+                del table[node_id]
 
 
 class MCPClient:
     def __init__(self, server_urls: list[str]):
         self.server_urls = server_urls
         self.clients = {}  # url → Client
+        self.service_calls = {}  # url → Counter(service name → round trips)
 
     def connect_all(self):
-        for url in self.server_urls:
-            try:
-                logger.info(f"Connecting to {url}...")
-                client = Client(url)
+        """
+        Connect to every server concurrently. Servers whose circuit breaker is
+        open are skipped at once instead of waiting for the connect timeout.
+        """
+        if len(self.server_urls) <= 1:
+            for url in self.server_urls:
+                self._connect(url)
+            return
+        with ThreadPoolExecutor(max_workers=min(16, len(self.server_urls))) as pool:
+            list(pool.map(self._connect, self.server_urls))
+
+    def _connect(self, url: str):
+        breaker = circuit_breaker(url)
+        try:
+            breaker.allow()
+        except CircuitOpen as e:
+            logger.warning("Not connecting to %s: %s", url, e)
+            _notify(_connection_observers, url, "circuit_open")
+            return
+        try:
+            logger.info("Connecting to %s...", url)
+            if is_loopback(url):
+                # loopback:// URLs reach an in-process server without sockets
+                client = LoopbackClient(url)
                 client.connect()
-                self.clients[url] = client
-                logger.info(f"Connected to {url}")
-            except Exception as e:
-                logger.error(f"Failed to connect to {url}: {e}")
+            else:
+                client = Client(url, timeout=CONNECT_TIMEOUT)
+                client.connect()
+                # python-opcua uses one timeout for connecting and for every
+                # response; relax it for requests once the session is open
+                client.uaclient._timeout = REQUEST_TIMEOUT
+                client.uaclient._uasocket.timeout = REQUEST_TIMEOUT
+            self._instrument(url, client)
+            self.clients[url] = client
+            breaker.record_success()
+            logger.info("Connected to %s", url)
+            _notify(_connection_observers, url, "connected")
+        except Exception as e:
+            breaker.record_failure(e)
+            logger.error("Failed to connect to %s: %s", url, e)
+            _notify(_connection_observers, url, "failed")
 
     def disconnect_all(self):
         for url, client in self.clients.items():
             try:
                 client.disconnect()
-                logger.info(f"Disconnected from {url}")
+                logger.info("Disconnected from %s", url)
             except Exception as e:
-                logger.warning(f"Failed to disconnect from {url}: {e}")
+                logger.warning("Failed to disconnect from %s: %s", url, e)
+            _notify(_connection_observers, url, "disconnected")
+
+    def _instrument(self, url: str, client):
+        """Count and time every OPC UA service call made through this client's session."""
+        calls = self.service_calls.setdefault(url, Counter())
+        # Request threads share one session; += on a Counter is not atomic
+        lock = threading.Lock()
+        uaclient = client.uaclient
+
+        def counted(method, service):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with lock:
+                    calls[service] += 1
+                if not _service_observers:
+                    return method(*args, **kwargs)
+                started = time.perf_counter()
+                error = None
+                try:
+                    return method(*args, **kwargs)
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    _notify(
+                        _service_observers,
+                        url,
+                        service,
+                        time.perf_counter() - started,
+                        error,
+                    )
+
+            return wrapper
+
+        for name, service in UA_SERVICES.items():
+            setattr(uaclient, name, counted(getattr(uaclient, name), service))
 
     def get_connected_servers(self):
         return list(self.clients.keys())
@@ -44,66 +353,406 @@ class MCPClient:
             - display_name
             - data_type
         """
+        return list(self.iter_variables(server_url))
+
+    def iter_variables(self, server_url: str):
+        """
+        Yield the records of ``browse_variables()`` one at a time, in the same order.
+
+        The tree is walked depth-first with an explicit stack, so deep models
+        cannot hit the recursion limit. Wide folders are browsed with
+        ``MAX_REFERENCES_PER_NODE`` references per Browse/BrowseNext, and child
+        attributes are read lazily in chunks. Each folder on the current path
+        keeps the ids of all its children, so memory grows with depth times
+        folder width (plus one chunk of attributes), not with the number of
+        variables in the tree.
+        """
         if server_url not in self.clients:
-            logger.warning(f"Client not connected: {server_url}")
-            return []
+            logger.warning("Client not connected: %s", server_url)
+            return
 
         client = self.clients[server_url]
-        root = client.get_root_node()
-        return self._browse_recursive(root, path="", filter_vars=True)
+        root_id = client.get_root_node().nodeid.to_string()
+        stack = [(root_id, "", self._iter_children(server_url, root_id))]
+        on_path = {root_id}  # guards against reference cycles
+        while stack:
+            parent, path, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(parent)
+                continue
 
-    def _browse_recursive(self, node, path="", filter_vars=False):
-        """
-        Recursively browse the node tree.
-        If filter_vars=True, only return Variable nodes.
-        """
-        results = []
+            node_id, (display_name, node_class, data_type) = child
+            full_path = f"{path}/{display_name}".strip("/")
+            if node_class == NodeClass.Variable:
+                if data_type is not None:
+                    yield {
+                        "node_id": node_id,
+                        "browse_path": full_path,
+                        "display_name": display_name,
+                        "data_type": data_type,
+                    }
+            elif node_class in CONTAINER_CLASSES and node_id not in on_path:
+                on_path.add(node_id)
+                stack.append(
+                    (node_id, full_path, self._iter_children(server_url, node_id))
+                )
 
+    def _iter_children(self, server_url: str, node_id: str):
+        """Yield ``(node_id, (display name, node class, data type))`` for each child."""
         try:
-            children = node.get_children()
+            browsed = self._browse_children(self.clients[server_url], [node_id])
         except Exception as e:
-            logger.warning(f"Failed to get children for node {node}: {e}")
-            return results
+            logger.warning("Failed to get children for node %s: %s", node_id, e)
+            return
+        child_ids = browsed.get(node_id, ())  # absent if the browse failed
 
-        for child in children:
+        chunk = READ_BATCH // 3
+        for start in range(0, len(child_ids), chunk):
+            batch = child_ids[start : start + chunk]
             try:
-                display_name = child.get_display_name().Text
-                node_class = child.get_node_class()
-                full_path = f"{path}/{display_name}".strip("/")
+                nodes = self._read_nodes(server_url, batch)
+            except Exception as e:
+                logger.warning("Error browsing children of node %s: %s", node_id, e)
+                continue
+            for child_id in batch:
+                if child_id in nodes:
+                    yield child_id, nodes[child_id]
 
-                if node_class == NodeClass.Variable:
-                    results.append(
-                        {
-                            "node_id": child.nodeid.to_string(),
-                            "browse_path": full_path,
-                            "display_name": display_name,
-                            "data_type": str(child.get_data_type_as_variant_type()),
-                        }
-                    )
-                elif not filter_vars:
-                    results.append(
-                        {
-                            "node_id": child.nodeid.to_string(),
-                            "browse_path": full_path,
-                            "display_name": display_name,
-                            "node_class": str(node_class),
-                        }
-                    )
+    # ---------- Batched crawl ----------
+    def crawl_variables(self, server_url: str) -> BrowseSnapshot:
+        """
+        Crawl the whole address space with batched Browse and Read requests.
 
-                # Recurse if Object or ObjectType
-                if node_class in [NodeClass.Object, NodeClass.ObjectType]:
-                    results.extend(
-                        self._browse_recursive(child, full_path, filter_vars)
-                    )
+        ``snapshot.variables()`` gives the same records as ``browse_variables()``;
+        pass the snapshot to ``refresh_variables()`` later to update it cheaply.
+        """
+        client = self.clients[server_url]
+        snapshot = BrowseSnapshot(client.get_root_node().nodeid.to_string())
+        self._descend(server_url, snapshot, [snapshot.root_id])
+        return snapshot
+
+    def refresh_variables(self, server_url: str, snapshot: BrowseSnapshot) -> int:
+        """
+        Bring ``snapshot`` up to date and return how many Objects changed.
 
+        Every known Object is re-browsed in batches (one request per
+        ``BROWSE_BATCH`` Objects) and its child references compared with the
+        last crawl. Only new nodes below changed Objects are read and descended
+        into, so an unchanged server costs a handful of Browse requests.
+        Objects an earlier crawl or refresh failed to browse are retried.
+        """
+        client = self.clients[server_url]
+        current = self._browse_children(client, list(snapshot.children))
+        changed = {
+            node_id: child_ids
+            for node_id, child_ids in current.items()
+            if child_ids != snapshot.children.get(node_id)
+        }
+        # Objects whose descent failed before (a browse or read error) have no
+        # children recorded, so comparing references would never find them
+        unexplored = [
+            node_id
+            for node_id, (_, node_class) in snapshot.nodes.items()
+            if node_class in CONTAINER_CLASSES and node_id not in snapshot.children
+        ]
+        if snapshot.root_id not in snapshot.children:
+            unexplored.append(snapshot.root_id)
+        new_objects = self._expand(server_url, snapshot, changed)
+        self._descend(
+            server_url, snapshot, list(dict.fromkeys(new_objects + unexplored))
+        )
+        if changed or unexplored:
+            snapshot.prune()
+        return len(changed) + len(unexplored)
+
+    def _descend(self, server_url: str, snapshot: BrowseSnapshot, node_ids: list[str]):
+        """Browse ``node_ids`` and every unknown Object below them, level by level."""
+        client = self.clients[server_url]
+        while node_ids:
+            node_ids = self._expand(
+                server_url, snapshot, self._browse_children(client, node_ids)
+            )
+
+    def _expand(
+        self, server_url: str, snapshot: BrowseSnapshot, browsed: dict
+    ) -> list[str]:
+        """Record browsed children, read new nodes; return Objects not crawled yet."""
+        new_nodes = {}
+        for child_ids in browsed.values():
+            new_nodes.update(
+                (node_id, None)
+                for node_id in child_ids
+                if node_id not in snapshot.nodes
+            )
+        nodes = self._read_nodes(server_url, list(new_nodes))
+
+        # Only touch the snapshot once the read succeeded: a parent recorded
+        # with unread children would count as unchanged on the next refresh
+        snapshot.children.update(browsed)
+        for node_id, (display_name, node_class, data_type) in nodes.items():
+            snapshot.nodes[node_id] = (display_name, node_class)
+            if data_type is not None:
+                snapshot.data_types[node_id] = data_type
+
+        # Recurse into Objects and ObjectTypes, as iter_variables() does
+        return [
+            node_id
+            for parent in browsed
+            for node_id in snapshot.children[parent]
+            if node_id in snapshot.nodes
+            and snapshot.nodes[node_id][1] in CONTAINER_CLASSES
+            and node_id not in snapshot.children
+        ]
+
+    def _read_nodes(self, server_url: str, node_ids: list[str]) -> dict:
+        """
+        ``node_id → (display name, node class, data type)`` for each readable node.
+
+        Data type is the VariantType string of a Variable, else None. Attributes
+        come from the server's ``NodeCache`` and only misses are read in batched
+        Read requests: DisplayName and NodeClass of every node, then DataType of
+        the Variables only, which other node classes do not have.
+        """
+        client = self.clients[server_url]
+        cache = node_cache(server_url)
+        entries = {}
+        misses = []
+        for node_id in node_ids:
+            entry = cache.get(node_id)
+            if entry is None:
+                misses.append(node_id)
+            else:
+                entries[node_id] = entry
+
+        # Read as attributes: reference descriptions are not reliable for every
+        # server (python-opcua reports some ObjectTypes as DataTypes).
+        found = {}  # node_id → (display name, node class)
+        for node_id, (display_name, node_class) in self._read_attributes(
+            client, misses, (ua.AttributeIds.DisplayName, ua.AttributeIds.NodeClass)
+        ):
+            try:
+                display_name.StatusCode.check()
+                node_class.StatusCode.check()
             except Exception as e:
-                logger.warning(f"Error browsing node {child}: {e}")
+                logger.warning("Error browsing node %s: %s", node_id, e)
+                continue
+            found[node_id] = (display_name.Value.Value.Text, node_class.Value.Value)
+
+        data_types = {}
+        variables = [
+            node_id
+            for node_id, (_, node_class) in found.items()
+            if node_class == NodeClass.Variable
+        ]
+        for node_id, (data_type,) in self._read_attributes(
+            client, variables, (ua.AttributeIds.DataType,)
+        ):
+            if data_type.StatusCode.is_good():
+                data_types[node_id] = data_type.Value.Value
+
+        for node_id, (display_name, node_class) in found.items():
+            entry = (display_name, node_class, data_types.get(node_id))
+            # A Variable whose DataType could not be read is read again next time
+            if node_class != NodeClass.Variable or entry[2] is not None:
+                cache.put(node_id, entry)
+            entries[node_id] = entry
+
+        nodes = {}
+        for node_id, (display_name, node_class, data_type_id) in entries.items():
+            variant_type = None
+            if node_class == NodeClass.Variable:
+                variant_type = self._variant_type(server_url, node_id, data_type_id)
+            nodes[node_id] = (display_name, node_class, variant_type)
+        return nodes
 
+    def _variant_type(self, server_url: str, node_id: str, data_type_id):
+        """Resolve a DataType NodeId to a VariantType string, once per server."""
+        if data_type_id is None:
+            logger.warning("Error browsing node %s: no readable DataType", node_id)
+            return None
+        variant_types = node_cache(server_url).variant_types
+        if data_type_id not in variant_types:
+            try:
+                variant_type = data_type_to_variant_type(
+                    Node(self.clients[server_url].uaclient, data_type_id)
+                )
+            except Exception as e:
+                logger.warning("Error browsing node %s: %s", node_id, e)
+                return None
+            variant_types[data_type_id] = str(variant_type)
+        return variant_types[data_type_id]
+
+    def _browse_children(self, client, node_ids: list[str]) -> dict:
+        """
+        Child node ids of each node, ``BROWSE_BATCH`` nodes per Browse request.
+
+        Servers return at most ``MAX_REFERENCES_PER_NODE`` references per node
+        and a continuation point for the rest, which is followed with BrowseNext
+        for all nodes of the batch at once. Nodes whose Browse or BrowseNext
+        fails are left out rather than reported without children, so callers
+        keep what they knew about them.
+        """
+        browsed = {}
+        for start in range(0, len(node_ids), BROWSE_BATCH):
+            batch = node_ids[start : start + BROWSE_BATCH]
+            params = ua.BrowseParameters()
+            params.View.Timestamp = ua.get_win_epoch()
+            params.RequestedMaxReferencesPerNode = MAX_REFERENCES_PER_NODE
+            for node_id in batch:
+                description = ua.BrowseDescription()
+                description.NodeId = ua.NodeId.from_string(node_id)
+                description.BrowseDirection = ua.BrowseDirection.Forward
+                description.ReferenceTypeId = ua.NodeId(
+                    ua.ObjectIds.HierarchicalReferences
+                )
+                description.IncludeSubtypes = True
+                description.NodeClassMask = ua.NodeClass.Unspecified
+                description.ResultMask = ua.BrowseResultMask.All
+                params.NodesToBrowse.append(description)
+
+            references = {}
+            failed = set()
+            continuation_points = {}  # node id → continuation point
+            results = client.uaclient.browse(params)
+            while True:
+                for node_id, result in zip(batch, results):
+                    if not result.StatusCode.is_good():
+                        logger.warning(
+                            "Failed to get children for node %s: %s",
+                            node_id,
+                            result.StatusCode,
+                        )
+                        failed.add(node_id)
+                        continue
+                    references.setdefault(node_id, []).extend(
+                        reference.NodeId.to_string() for reference in result.References
+                    )
+                    if result.ContinuationPoint:
+                        continuation_points[node_id] = result.ContinuationPoint
+                if not continuation_points:
+                    break
+                next_params = ua.BrowseNextParameters()
+                next_params.ContinuationPoints = list(continuation_points.values())
+                batch = list(continuation_points)
+                continuation_points = {}
+                results = client.uaclient.browse_next(next_params)
+
+            for node_id in node_ids[start : start + BROWSE_BATCH]:
+                if node_id not in failed:
+                    browsed[node_id] = tuple(references.get(node_id, ()))
+        return browsed
+
+    def _read_attributes(self, client, node_ids: list[str], attribute_ids: tuple):
+        """Yield ``(node_id, data values)``, about ``READ_BATCH`` values per Read request."""
+        per_request = max(1, READ_BATCH // len(attribute_ids))
+        for start in range(0, len(node_ids), per_request):
+            batch = node_ids[start : start + per_request]
+            params = ua.ReadParameters()
+            for node_id in batch:
+                for attribute_id in attribute_ids:
+                    read_value_id = ua.ReadValueId()
+                    read_value_id.NodeId = ua.NodeId.from_string(node_id)
+                    read_value_id.AttributeId = attribute_id
+                    params.NodesToRead.append(read_value_id)
+
+            results = client.uaclient.read(params)
+            width = len(attribute_ids)
+            for index, node_id in enumerate(batch):
+                yield node_id, results[index * width : (index + 1) * width]
+
+    def read_values(self, server_url: str, node_ids: list[str]) -> list[tuple]:
+        """
+        ``(value, source timestamp)`` of each node, read ``READ_BATCH`` nodes
+        per Read request. Nodes that cannot be read give ``(None, None)``.
+        """
+        if server_url not in self.clients:
+            raise ConnectionError(f"Client not connected: {server_url}")
+
+        client = self.clients[server_url]
+        results = []
+        for node_id, (data_value,) in self._read_attributes(
+            client, node_ids, (ua.AttributeIds.Value,)
+        ):
+            if not data_value.StatusCode.is_good():
+                logger.debug("Failed to read value from %s: %s", node_id, data_value.StatusCode)
+                results.append((None, None))
+                continue
+            timestamp = data_value.SourceTimestamp or data_value.ServerTimestamp
+            results.append((data_value.Value.Value, timestamp))
         return results
 
+    def write_values(self, server_url: str, items: list[tuple]) -> list[str]:
+        """
+        Write ``(node_id, value)`` pairs and return a status name per item.
+
+        Values are coerced to each node's data type, looked up through the
+        server's ``NodeCache``, and sent ``WRITE_BATCH`` per Write request.
+        Items that cannot be coerced are not sent and get ``BadTypeMismatch``,
+        or ``BadOutOfRange`` if the number does not fit the data type.
+        """
+        if server_url not in self.clients:
+            raise ConnectionError(f"Client not connected: {server_url}")
+
+        client = self.clients[server_url]
+        nodes = self._read_nodes(server_url, list(dict.fromkeys(n for n, _ in items)))
+        statuses = [None] * len(items)
+        pending = []  # (item index, WriteValue)
+        for index, (node_id, value) in enumerate(items):
+            node = nodes.get(node_id)
+            if node is None:
+                statuses[index] = "BadNodeIdUnknown"
+                continue
+            if node[1] != NodeClass.Variable or node[2] is None:
+                statuses[index] = "BadNotWritable"
+                continue
+            variant_type = ua.VariantType[node[2].rsplit(".", 1)[-1]]
+            try:
+                value = coerce_value(value, variant_type)
+            except OverflowError as e:
+                logger.warning("Not writing %s: %s", node_id, e)
+                statuses[index] = "BadOutOfRange"
+                continue
+            except (TypeError, ValueError) as e:
+                logger.warning("Not writing %s: %s", node_id, e)
+                statuses[index] = "BadTypeMismatch"
+                continue
+            write_value = ua.WriteValue()
+            write_value.NodeId = ua.NodeId.from_string(node_id)
+            write_value.AttributeId = ua.AttributeIds.Value
+            write_value.Value = ua.DataValue(ua.Variant(value, variant_type))
+            pending.append((index, write_value))
+
+        for start in range(0, len(pending), WRITE_BATCH):
+            batch = pending[start : start + WRITE_BATCH]
+            params = ua.WriteParameters()
+            params.NodesToWrite = [write_value for _, write_value in batch]
+            results = client.uaclient.write(params)
+            for (index, _), status in zip(batch, results):
+                statuses[index] = status.name
+        return statuses
+
+    def monitor(
+        self, server_url: str, node_ids: list[str], callback=None, **options
+    ) -> AdaptiveMonitor:
+        """
+        Subscribe to ``node_ids`` with adaptive per-tag sampling intervals and
+        return the started ``AdaptiveMonitor``; call its ``stop()`` when done.
+
+        ``callback(node_id, value, source_timestamp)`` gets every data change.
+        ``options`` (``tiers``, ``evaluate_interval``, ``initial_tier``) go to
+        ``AdaptiveMonitor``.
+        """
+        if server_url not in self.clients:
+            raise ConnectionError(f"Client not connected: {server_url}")
+        return AdaptiveMonitor(
+            self.clients[server_url], node_ids, callback, **options
+        ).start()
+
     def read_value(self, server_url: str, node_id: str):
         if server_url not in self.clients:
-            logger.warning(f"Client not connected: {server_url}")
+            logger.warning("Client not connected: %s", server_url)
             return None
 
         client = self.clients[server_url]
@@ -112,5 +761,5 @@ class MCPClient:
             value = node.get_value()
             return value
         except Exception as e:
-            logger.error(f"Failed to read value from {node_id}: {e}")
+            logger.error("Failed to read value from %s: %s", node_id, e)
             return None
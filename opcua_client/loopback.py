@@ -0,0 +1,179 @@
+"""
+In-process loopback transport for OPC UA servers.
+
+``serve_loopback(server)`` makes a python-opcua ``Server``'s address space
+reachable at a ``loopback://`` URL without the server listening on a socket.
+``MCPClient`` connects to such URLs with a ``LoopbackClient``, whose service
+calls go straight to an internal server session: no TCP, no secure channel and
+no binary encoding, so broker, prompt and API code can be tested and
+benchmarked at memory speed.
+
+``latency`` adds a fixed delay to every service call, which makes round-trip
+savings measurable deterministically. Results are the server's own objects,
+not decoded copies; treat them as read-only. Subscriptions are not supported.
+"""
+
+import itertools
+import threading
+import time
+
+from opcua import ua
+from opcua.common.node import Node
+
+SCHEME = "loopback://"
+
+_servers = {}  # url → (Server, latency)
+_servers_lock = threading.Lock()
+_names = itertools.count(1)
+
+
+def is_loopback(url: str) -> bool:
+    return url.startswith(SCHEME)
+
+
+def serve_loopback(server, name: str | None = None, latency: float = 0.0) -> str:
+    """
+    Expose ``server`` (an ``opcua.Server``) in-process and return its URL.
+
+    Starts the server's internal engine if it is not running; the server does
+    not need to be started, and does not listen, for loopback use.
+    """
+    if latency < 0:
+        raise ValueError("latency must be >= 0")
+    url = f"{SCHEME}{name or f'server{next(_names)}'}"
+    with _servers_lock:
+        if url in _servers:
+            raise ValueError(f"{url} is already served")
+        if not server.iserver.is_running():
+            server.iserver.start()
+        _servers[url] = (server, latency)
+    return url
+
+
+def stop_loopback(url: str):
+    """Stop serving ``url``; sessions already open keep working until closed."""
+    with _servers_lock:
+        _servers.pop(url, None)
+
+
+def set_latency(url: str, latency: float):
+    """Change the per-call delay of ``url`` for sessions opened from now on."""
+    with _servers_lock:
+        server, _ = _servers[url]
+        _servers[url] = (server, latency)
+
+
+def _unsupported(*args, **kwargs):
+    raise ua.UaStatusCodeError(ua.StatusCodes.BadServiceUnsupported)
+
+
+class LoopbackUaClient:
+    """The ``UaClient`` services ``MCPClient`` uses, served by an internal session."""
+
+    def __init__(self, session, latency: float = 0.0):
+        self._session = session
+        self.latency = latency
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def browse(self, parameters):
+        self._round_trip()
+        return self._session.browse(parameters)
+
+    def browse_next(self, parameters):
+        # The internal server never hands out continuation points
+        self._round_trip()
+        results = []
+        for _ in parameters.ContinuationPoints:
+            result = ua.BrowseResult()
+            result.StatusCode = ua.StatusCode(
+                ua.StatusCodes.BadContinuationPointInvalid
+            )
+            results.append(result)
+        return results
+
+    def read(self, parameters):
+        self._round_trip()
+        return self._session.read(parameters)
+
+    def get_attributes(self, nodes, attr):
+        parameters = ua.ReadParameters()
+        for node in nodes:
+            read_value_id = ua.ReadValueId()
+            read_value_id.NodeId = node
+            read_value_id.AttributeId = attr
+            parameters.NodesToRead.append(read_value_id)
+        return self.read(parameters)
+
+    def write(self, parameters):
+        self._round_trip()
+        return self._session.write(parameters)
+
+    def set_attributes(self, nodeids, datavalues, attributeid=ua.AttributeIds.Value):
+        parameters = ua.WriteParameters()
+        for nodeid, datavalue in zip(nodeids, datavalues):
+            write_value = ua.WriteValue()
+            write_value.NodeId = nodeid
+            write_value.AttributeId = attributeid
+            write_value.Value = datavalue
+            parameters.NodesToWrite.append(write_value)
+        return self.write(parameters)
+
+    def translate_browsepaths_to_nodeids(self, browsepaths):
+        self._round_trip()
+        return self._session.translate_browsepaths_to_nodeids(browsepaths)
+
+    def history_read(self, parameters):
+        self._round_trip()
+        return self._session.history_read(parameters)
+
+    def call(self, methodstocall):
+        self._round_trip()
+        return self._session.call(methodstocall)
+
+    def register_nodes(self, nodes):
+        self._round_trip()
+        return list(nodes)
+
+    create_subscription = _unsupported
+    delete_subscriptions = _unsupported
+    create_monitored_items = _unsupported
+    modify_monitored_items = _unsupported
+    delete_monitored_items = _unsupported
+
+
+class LoopbackClient:
+    """Stands in for ``opcua.Client`` on ``loopback://`` URLs."""
+
+    def __init__(self, url: str):
+        self.server_url = url
+        self.uaclient = None
+        self._session = None
+
+    def connect(self):
+        with _servers_lock:
+            entry = _servers.get(self.server_url)
+        if entry is None:
+            raise ConnectionRefusedError(f"No loopback server at {self.server_url}")
+        server, latency = entry
+        session = server.iserver.create_session(f"Loopback {self.server_url}")
+        # CreateSession + ActivateSession
+        time.sleep(2 * latency)
+        self._session = session
+        self.uaclient = LoopbackUaClient(session, latency)
+
+    def disconnect(self):
+        if self._session is not None:
+            self._session.close_session()
+            self._session = None
+
+    def get_node(self, nodeid) -> Node:
+        return Node(self.uaclient, nodeid)
+
+    def get_root_node(self) -> Node:
+        return self.get_node(ua.TwoByteNodeId(ua.ObjectIds.RootFolder))
+
+    def get_objects_node(self) -> Node:
+        return self.get_node(ua.TwoByteNodeId(ua.ObjectIds.ObjectsFolder))
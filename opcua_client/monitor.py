@@ -0,0 +1,245 @@
+"""
+Adaptive-rate monitoring of OPC UA tags.
+
+``AdaptiveMonitor`` (see ``MCPClient.monitor()``) puts every monitored tag in
+one of a few sampling-interval tiers, one subscription per tier, with queue
+size 1 so each tag reports at most one value per interval. It counts how often
+each tag's value actually changes and periodically moves tags between tiers:
+
+- a tag whose value changed in at least ``PROMOTE_RATIO`` of its samples may
+  be changing faster than it is sampled and moves one tier faster;
+- a tag that would still leave most samples of the next slower tier empty
+  (at most ``DEMOTE_RATIO`` of them carrying a change) moves one tier slower.
+
+Moves are batched: one DeleteMonitoredItems and one CreateMonitoredItems per
+pair of tiers per pass. Quiet tags drift to the slowest tier, so notification
+load follows how much the plant changes rather than how many tags it has.
+Loopback clients do not support subscriptions.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from opcua import ua
+
+logger = logging.getLogger("OPCUAClient")
+
+# Sampling intervals in seconds, fastest first
+TIERS = tuple(
+    float(interval)
+    for interval in os.environ.get("MCP_MONITOR_TIERS", "0.5,2,10,60").split(",")
+)
+# Seconds between tier adjustment passes
+EVALUATE_INTERVAL = float(os.environ.get("MCP_MONITOR_EVALUATE", "5"))
+# A tag is only re-tiered after this many samples in its current tier
+MIN_SAMPLES = 4
+PROMOTE_RATIO = 0.5
+DEMOTE_RATIO = 0.25
+
+_UNSEEN = object()
+
+
+class _Tag:
+    __slots__ = ("node_id", "node", "tier", "handle", "since", "changes", "value")
+
+    def __init__(self, node_id: str, node, tier: int):
+        self.node_id = node_id
+        self.node = node
+        self.tier = tier
+        self.handle = None  # monitored item id in the tier's subscription
+        self.since = time.monotonic()
+        self.changes = 0
+        self.value = _UNSEEN
+
+
+class AdaptiveMonitor:
+    """
+    Monitor ``node_ids`` of a connected ``client`` in adaptive tiers.
+
+    ``callback(node_id, value, source_timestamp)`` is called for every data
+    change notification, from the client's receiving thread; keep it short.
+    """
+
+    def __init__(
+        self,
+        client,
+        node_ids: list[str],
+        callback=None,
+        tiers: tuple = TIERS,
+        evaluate_interval: float = EVALUATE_INTERVAL,
+        initial_tier: int = 0,
+    ):
+        if not tiers or list(tiers) != sorted(tiers) or tiers[0] <= 0:
+            raise ValueError("tiers must be positive intervals, fastest first")
+        if not 0 <= initial_tier < len(tiers):
+            raise ValueError(f"initial_tier must be between 0 and {len(tiers) - 1}")
+        self.client = client
+        self.callback = callback
+        self.tiers = tuple(tiers)
+        self.evaluate_interval = evaluate_interval
+        self.moves = 0
+        self._lock = threading.Lock()
+        self._tags = {}  # NodeId → _Tag
+        for node_id in dict.fromkeys(node_ids):
+            node = client.get_node(node_id)
+            self._tags[node.nodeid] = _Tag(node_id, node, initial_tier)
+        self._subscriptions = {}  # tier → Subscription
+        self._notifications = [0] * len(self.tiers)
+        self._stopping = threading.Event()
+        self._thread = None
+
+    # ---------- Lifecycle ----------
+    def start(self):
+        """Subscribe every tag in its initial tier and start adjusting tiers."""
+        by_tier = {}
+        for tag in self._tags.values():
+            by_tier.setdefault(tag.tier, []).append(tag)
+        for tier, tags in by_tier.items():
+            self._subscribe(tier, tags)
+        if self.evaluate_interval > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="AdaptiveMonitor", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for subscription in self._subscriptions.values():
+            try:
+                subscription.delete()
+            except Exception as e:
+                logger.warning("Failed to delete subscription: %s", e)
+        self._subscriptions.clear()
+
+    def _run(self):
+        while not self._stopping.wait(self.evaluate_interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                logger.warning("Adjusting monitored tag tiers failed: %s", e)
+
+    # ---------- Subscriptions ----------
+    def _subscription(self, tier: int):
+        if tier not in self._subscriptions:
+            self._subscriptions[tier] = self.client.create_subscription(
+                self.tiers[tier] * 1000, _Handler(self, tier)
+            )
+        return self._subscriptions[tier]
+
+    def _subscribe(self, tier: int, tags: list[_Tag]):
+        subscription = self._subscription(tier)
+        now = time.monotonic()
+        with self._lock:
+            # Before subscribing: the server sends each current value at once
+            for tag in tags:
+                tag.tier, tag.since, tag.changes = tier, now, 0
+        handles = subscription.subscribe_data_change(
+            [tag.node for tag in tags], queuesize=1
+        )
+        with self._lock:
+            for tag, handle in zip(tags, handles):
+                if isinstance(handle, ua.StatusCode):
+                    logger.warning("Cannot monitor %s: %s", tag.node_id, handle.name)
+                    handle = None
+                tag.handle = handle
+
+    def _unsubscribe(self, tier: int, tags: list[_Tag]):
+        handles = [tag.handle for tag in tags if tag.handle is not None]
+        if handles:
+            self._subscriptions[tier].unsubscribe(handles)
+        for tag in tags:
+            tag.handle = None
+
+    def _notify(self, tier: int, node, value, data):
+        with self._lock:
+            tag = self._tags.get(node.nodeid)
+            if tag is None or tag.tier != tier:
+                return  # late notification from the tier a tag just left
+            self._notifications[tier] += 1
+            if value != tag.value:
+                if tag.value is not _UNSEEN:
+                    tag.changes += 1
+                tag.value = value
+        if self.callback is not None:
+            try:
+                self.callback(
+                    tag.node_id, value, data.monitored_item.Value.SourceTimestamp
+                )
+            except Exception as e:
+                logger.warning("Monitor callback failed for %s: %s", tag.node_id, e)
+
+    # ---------- Tiering ----------
+    def evaluate(self) -> int:
+        """Move tags whose change rate fits another tier; return how many moved."""
+        moves = {}  # (from tier, to tier) → [_Tag]
+        now = time.monotonic()
+        slowest = len(self.tiers) - 1
+        with self._lock:
+            for tag in self._tags.values():
+                if tag.handle is None:
+                    continue
+                interval = self.tiers[tag.tier]
+                elapsed = now - tag.since
+                if elapsed < max(MIN_SAMPLES * interval, self.evaluate_interval):
+                    continue
+                target = tag.tier
+                if tag.tier > 0 and tag.changes * interval / elapsed >= PROMOTE_RATIO:
+                    target = tag.tier - 1
+                elif (
+                    tag.tier < slowest
+                    and tag.changes * self.tiers[tag.tier + 1] / elapsed <= DEMOTE_RATIO
+                ):
+                    target = tag.tier + 1
+                if target == tag.tier:
+                    # Start a fresh window so the rate follows recent behaviour
+                    tag.since, tag.changes = now, 0
+                else:
+                    moves.setdefault((tag.tier, target), []).append(tag)
+
+        moved = 0
+        for (source, target), tags in moves.items():
+            self._unsubscribe(source, tags)
+            self._subscribe(target, tags)
+            moved += len(tags)
+        if moved:
+            self.moves += moved
+            logger.info("Moved %d monitored tags between sampling tiers", moved)
+        return moved
+
+    def tier_of(self, node_id: str) -> float:
+        """Current sampling interval of ``node_id`` in seconds."""
+        tag = self._tags[self.client.get_node(node_id).nodeid]
+        return self.tiers[tag.tier]
+
+    def snapshot(self) -> dict:
+        """Tags and notifications received per tier interval, and moves so far."""
+        with self._lock:
+            counts = [0] * len(self.tiers)
+            for tag in self._tags.values():
+                counts[tag.tier] += 1
+            return {
+                "tiers": [
+                    {"interval": interval, "tags": count, "notifications": received}
+                    for interval, count, received in zip(
+                        self.tiers, counts, self._notifications
+                    )
+                ],
+                "moves": self.moves,
+            }
+
+
+class _Handler:
+    """python-opcua subscription handler of one tier."""
+
+    def __init__(self, monitor: AdaptiveMonitor, tier: int):
+        self.monitor = monitor
+        self.tier = tier
+
+    def datachange_notification(self, node, value, data):
+        self.monitor._notify(self.tier, node, value, data)
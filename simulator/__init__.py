@@ -3,6 +3,7 @@ from .oil_gas_server import OilAndGasSimulator
 from .life_sciences_server import LifeSciencesServer
 import threading
 import logging
+import os
 
 __version__ = "0.3.0"
 __author__ = "Ben Duran"
@@ -10,9 +11,6 @@ __all__ = ["run", "OilAndGasSimulator", "LifeSciencesServer"]
 
 logger = logging.getLogger("SimulatorRunner")
 logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s"))
-logger.addHandler(handler)
 
 # --- Registry of all available simulators ---
 SIMULATORS = {
@@ -22,7 +20,23 @@ SIMULATORS = {
 }
 
 
-def run(mode: str = "oil"):
+def _per_simulator_path(path: str | None, name: str) -> str | None:
+    """``ticks.simrec`` → ``ticks.oil.simrec`` so "all" mode gets one file each."""
+    if not path:
+        return path
+    # splitext only looks at the basename: "runs.v2/ticks" has no extension
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{name}{ext}"
+
+
+def run(
+    mode: str = "oil",
+    seed: int | None = None,
+    record_path: str | None = None,
+    replay_path: str | None = None,
+    replay_speed: float = 1.0,
+    history_size: int = 600,
+):
     """
     Run one or more simulators.
 
@@ -31,6 +45,14 @@ def run(mode: str = "oil"):
             - "oil"
             - "life"
             - "all" → runs all registered simulators in parallel
+        seed (int): seed for deterministic values (unseeded if None)
+        record_path (str): write every tick to this binary recording
+        replay_path (str): stream values from this recording instead of simulating
+        replay_speed (float): replay speed multiplier, 0 = as fast as possible
+        history_size (int): ticks per variable kept for HistoryRead, 0 = none
+
+    In "all" mode the simulator name is inserted before the file extension of
+    ``record_path`` / ``replay_path`` (e.g. ``ticks.oil.simrec``).
     """
 
     def start_simulator(sim_instance):
@@ -38,18 +60,30 @@ def run(mode: str = "oil"):
 
     mode = mode.lower()
 
+    options = {
+        "seed": seed,
+        "replay_speed": replay_speed,
+        "history_size": history_size,
+    }
+
     if mode in SIMULATORS:
-        sim = SIMULATORS[mode]()
+        sim = SIMULATORS[mode](
+            record_path=record_path, replay_path=replay_path, **options
+        )
         sim.simulate()
 
     elif mode == "all":
         threads = []
         for name, cls in SIMULATORS.items():
-            sim = cls()
+            sim = cls(
+                record_path=_per_simulator_path(record_path, name),
+                replay_path=_per_simulator_path(replay_path, name),
+                **options,
+            )
             thread = threading.Thread(target=start_simulator, args=(sim,), daemon=True)
             thread.start()
             threads.append(thread)
-            logger.info(f"Started simulator: {name}")
+            logger.info("Started simulator: %s", name)
 
         logger.info("All simulators are running. Press Ctrl+C to stop.")
         try:
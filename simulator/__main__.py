@@ -1,4 +1,6 @@
 import argparse
+
+from logsetup import configure_logging
 from . import run
 
 
@@ -11,8 +13,48 @@ def main():
         choices=["oil", "life", "discrete", "all"],
         help="Which simulator to run: 'oil', 'life', or 'all'",
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed the value generators for reproducible runs",
+    )
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="Record every tick to a binary file",
+    )
+    replay_group.add_argument(
+        "--replay",
+        metavar="PATH",
+        default=None,
+        help="Replay a recording into the address space instead of simulating",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed multiplier (1 = real time, 0 = as fast as possible)",
+    )
+    parser.add_argument(
+        "--history",
+        type=int,
+        default=600,
+        metavar="TICKS",
+        help="Ticks of history kept per variable for HistoryRead (0 = off)",
+    )
     args = parser.parse_args()
-    run(mode=args.mode)
+    configure_logging()
+    run(
+        mode=args.mode,
+        seed=args.seed,
+        record_path=args.record,
+        replay_path=args.replay,
+        replay_speed=args.speed,
+        history_size=args.history,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,267 @@
+from opcua import Server, ua
+import logging
+import os
+import random
+import threading
+import time
+
+from logsetup import Throttle
+
+from .history import RingHistory
+from .recording import FrameReader, FrameWriter
+
+# Seconds between tick summary log lines
+SUMMARY_INTERVAL = float(os.environ.get("MCP_SIM_LOG_INTERVAL", "60"))
+
+
+class BaseSimulator:
+    """
+    Shared lifecycle for the OPC UA simulators.
+
+    Subclasses build ``asset_count`` assets in their address space and
+    implement ``_tick()`` using ``self.rng`` for every random draw, so a fixed
+    ``seed`` reproduces the same values run after run. ``record_path`` writes
+    every tick to a binary recording, and ``replay_path`` streams a recording
+    back into the address space at ``replay_speed`` times real time
+    (0 = as fast as possible). The last ``history_size`` ticks of every
+    variable are kept in memory and served over OPC UA HistoryRead (raw and
+    processed); 0 turns history off.
+
+    ``simulate()`` runs in the foreground until interrupted; ``start()`` and
+    ``stop()`` run the same loop in a background thread for in-process use.
+    ``start(listen=False)`` skips the TCP endpoint, for in-process clients
+    (see ``opcua_client.loopback``).
+    """
+
+    tick_interval = 2.0
+    # Variables per asset group; benchmarks size simulators by tag count with it
+    tags_per_asset = 0
+    logger = logging.getLogger("Simulator")
+
+    def __init__(
+        self,
+        endpoint: str,
+        namespace: str,
+        seed: int | None = None,
+        record_path: str | None = None,
+        replay_path: str | None = None,
+        replay_speed: float = 1.0,
+        asset_count: int = 10,
+        history_size: int = 600,
+    ):
+        if record_path and replay_path:
+            raise ValueError("Cannot record and replay at the same time")
+        if replay_speed < 0:
+            raise ValueError("replay_speed must be >= 0")
+        if asset_count < 1:
+            raise ValueError("asset_count must be >= 1")
+        if history_size < 0:
+            raise ValueError("history_size must be >= 0")
+
+        self.server = Server()
+        self.server.set_endpoint(endpoint)
+        self.idx = self.server.register_namespace(namespace)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.replay_speed = replay_speed
+        self.asset_count = asset_count
+        self.history_size = history_size
+        self.history = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    # ---------- Subclass hooks ----------
+    def _asset_groups(self) -> dict:
+        """Return ``{group_name: {var_name: node}}`` for all simulated variables."""
+        raise NotImplementedError
+
+    def _tick(self):
+        """Update every simulated variable once."""
+        raise NotImplementedError
+
+    # ---------- Variables ----------
+    def variable_nodes(self) -> dict:
+        """Flat ``{"Group/Var": node}`` mapping in a stable order."""
+        return {
+            f"{group}/{name}": node
+            for group, variables in self._asset_groups().items()
+            for name, node in variables.items()
+        }
+
+    def _current_values(self, node_ids: list) -> list:
+        """Values straight from the address space, without a client round trip."""
+        aspace = self.server.iserver.aspace
+        return [
+            aspace.get_attribute_value(node_id, ua.AttributeIds.Value).Value.Value
+            for node_id in node_ids
+        ]
+
+    # ---------- History ----------
+    def _enable_history(self):
+        """Mark every variable historizing and serve HistoryRead from rings."""
+        if not self.history_size or self.history is not None:
+            return
+        history = RingHistory(self.history_size)
+        aspace = self.server.iserver.aspace
+        for node in self.variable_nodes().values():
+            value = aspace.get_attribute_value(node.nodeid, ua.AttributeIds.Value)
+            history.add(node.nodeid, value.Value.VariantType)
+            node.set_attribute(
+                ua.AttributeIds.Historizing, ua.DataValue(ua.Variant(True))
+            )
+            for attribute in (
+                ua.AttributeIds.AccessLevel,
+                ua.AttributeIds.UserAccessLevel,
+            ):
+                node.set_attr_bit(attribute, ua.AccessLevel.HistoryRead)
+        self.server.iserver.history_manager = history
+        self.history = history
+        self.logger.info("Keeping %d ticks of history per variable", self.history_size)
+
+    def _record_history(self):
+        if self.history is not None:
+            values = self._current_values(self.history.node_ids)
+            self.history.record(time.time(), values)
+
+    @property
+    def endpoint_url(self) -> str:
+        """Client URL of the server, with the real port when bound to port 0."""
+        endpoint = self.server.endpoint
+        host = endpoint.hostname
+        if host in (None, "", "0.0.0.0"):
+            host = "localhost"
+        port = endpoint.port
+        if self.server.bserver is not None:
+            port = self.server.bserver.port
+        return f"opc.tcp://{host}:{port}{endpoint.path}"
+
+    # ---------- Run loop ----------
+    def simulate(self):
+        self._enable_history()
+        self.server.start()
+        self.logger.info("OPC UA Server started.")
+        try:
+            self._loop()
+        except KeyboardInterrupt:
+            self.logger.info("Simulation manually stopped.")
+        finally:
+            self.server.stop()
+            self.logger.info("Server shutdown complete.")
+
+    def start(self, listen: bool = True):
+        """Start the server and tick in a background thread."""
+        self._stopping.clear()
+        self._enable_history()
+        if listen:
+            self.server.start()
+        else:
+            self.server.iserver.start()
+        self._thread = threading.Thread(
+            target=self._loop, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+        if listen:
+            self.logger.info("OPC UA Server started at %s", self.endpoint_url)
+        else:
+            self.logger.info("OPC UA Server started without a network endpoint")
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.server.bserver is not None:
+            self.server.stop()
+        else:
+            self.server.iserver.stop()
+        self.logger.info("Server shutdown complete.")
+
+    def _loop(self):
+        if self.replay_path:
+            self._replay()
+        else:
+            self._run_live()
+
+    def _run_live(self):
+        writer = None
+        nodes = self.variable_nodes()
+        node_ids = [node.nodeid for node in nodes.values()]
+        if self.record_path:
+            writer = FrameWriter(self.record_path, list(nodes))
+            self.logger.info("Recording ticks to %s", self.record_path)
+
+        started = time.monotonic()
+        summary = Throttle(SUMMARY_INTERVAL)
+        ticks, busy = 0, 0.0
+        try:
+            while not self._stopping.is_set():
+                tick_started = time.perf_counter()
+                self._tick()
+                if writer:
+                    writer.write(
+                        time.monotonic() - started, self._current_values(node_ids)
+                    )
+                self._record_history()
+                busy += time.perf_counter() - tick_started
+                ticks += 1
+                if summary.ready():
+                    self._log_summary(ticks, len(node_ids), busy)
+                    ticks, busy = 0, 0.0
+                self._stopping.wait(self.tick_interval)
+        finally:
+            if writer:
+                writer.close()
+                self.logger.info(
+                    "Recorded %d frames to %s", writer.frames, self.record_path
+                )
+
+    def _log_summary(self, ticks: int, variables: int, busy: float):
+        """One line per ``SUMMARY_INTERVAL`` instead of one per asset and tick."""
+        tick_ms = busy / ticks * 1000
+        self.logger.info(
+            "%d ticks updating %d variables in the last %.0fs, %.1f ms per tick",
+            ticks,
+            variables,
+            SUMMARY_INTERVAL,
+            tick_ms,
+            extra={
+                "simulator": type(self).__name__,
+                "ticks": ticks,
+                "variables": variables,
+                "tick_ms": round(tick_ms, 3),
+            },
+        )
+
+    def _replay(self):
+        reader = FrameReader(self.replay_path)
+        nodes = self.variable_nodes()
+        unknown = [name for name in reader.names if name not in nodes]
+        if unknown:
+            raise ValueError(
+                f"Recording {self.replay_path} has variables this simulator does not: {unknown[:5]}"
+            )
+        targets = [nodes[name] for name in reader.names]
+        self.logger.info(
+            "Replaying %s at %sx speed", self.replay_path, self.replay_speed or "max"
+        )
+
+        # Loop the recording so replay can drive long-running benchmarks
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            frames = 0
+            for offset, values in reader:
+                if self.replay_speed:
+                    delay = started + offset / self.replay_speed - time.monotonic()
+                    if delay > 0 and self._stopping.wait(delay):
+                        return
+                elif self._stopping.is_set():
+                    return
+                for node, value in zip(targets, values):
+                    node.set_value(value)
+                self._record_history()
+                frames += 1
+            if not frames:
+                raise ValueError(f"Recording {self.replay_path} has no frames")
+            self.logger.info("Replay of %d frames finished, restarting.", frames)
@@ -0,0 +1,320 @@
+"""
+In-memory history of simulator variables, served over OPC UA HistoryRead.
+
+Every tick appends one sample per variable to fixed-size ring buffers: one
+shared array of tick timestamps plus one ``array`` per numeric variable (a
+list for strings), so recording allocates nothing per sample and old samples
+are overwritten in place. ``RingHistory`` stands in for the server's history
+manager and answers raw reads (``ReadRawModifiedDetails``, with continuation
+points) and processed reads (``ReadProcessedDetails``) with the Average,
+Minimum, Maximum, Count, Start and End aggregates.
+
+A value that does not fit its variable's ring (e.g. a string an external
+client wrote to a Double) is converted if that is lossless, else recorded as
+a ``BadTypeMismatch`` sample that aggregates skip.
+"""
+
+import bisect
+import logging
+import math
+import struct
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from opcua import ua
+
+logger = logging.getLogger("Simulator")
+
+EPOCH = datetime(1970, 1, 1)
+# Processed reads with more intervals than this are refused
+MAX_INTERVALS = 10000
+
+_CONTINUATION = struct.Struct("<Q")
+
+_TYPECODES = {
+    ua.VariantType.Boolean: "b",
+    ua.VariantType.SByte: "q",
+    ua.VariantType.Byte: "q",
+    ua.VariantType.Int16: "q",
+    ua.VariantType.UInt16: "q",
+    ua.VariantType.Int32: "q",
+    ua.VariantType.UInt32: "q",
+    ua.VariantType.Int64: "q",
+    ua.VariantType.Float: "d",
+    ua.VariantType.Double: "d",
+}
+
+
+def _average(values):
+    return sum(values) / len(values)
+
+
+# aggregate → (needs numeric values, function, result type; None = variable's)
+_AGGREGATES = {
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Average): (
+        True,
+        _average,
+        ua.VariantType.Double,
+    ),
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Minimum): (True, min, None),
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Maximum): (True, max, None),
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Count): (
+        False,
+        len,
+        ua.VariantType.UInt32,
+    ),
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Start): (False, lambda v: v[0], None),
+    ua.NodeId(ua.ObjectIds.AggregateFunction_End): (False, lambda v: v[-1], None),
+}
+
+
+def _to_seconds(value: datetime | None) -> float | None:
+    """UA DateTime → Unix seconds; ``None`` for unspecified (MinDateTime)."""
+    if value is None or value <= ua.get_win_epoch():
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH).total_seconds()
+
+
+def _to_datetime(seconds: float) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class _Series:
+    """Ring buffer of one variable's values, indexed by tick sequence number."""
+
+    def __init__(self, variant_type: ua.VariantType, size: int):
+        self.variant_type = variant_type
+        typecode = _TYPECODES.get(variant_type)
+        self.numeric = typecode is not None
+        if typecode:
+            self.values = array(typecode, bytes(array(typecode).itemsize * size))
+        else:
+            self.values = [None] * size
+        self._decode = bool if variant_type == ua.VariantType.Boolean else None
+        self.invalid = set()  # slots holding no usable value
+        self._warned = False
+
+    def decode(self, value):
+        return self._decode(value) if self._decode else value
+
+    def store_mismatched(self, node_id, slot: int, value):
+        """Store a value the ring rejected, converted if that loses nothing."""
+        try:
+            number = float(value)
+            if self.values.typecode != "d":
+                if number != int(number):
+                    raise ValueError(f"{value!r} is not an integer")
+                number = int(number)
+            self.values[slot] = number
+        except (TypeError, ValueError, OverflowError) as e:
+            self.invalid.add(slot)
+            if not self._warned:
+                self._warned = True
+                logger.warning(
+                    "Not recording history of %s: %r does not fit %s (%s)",
+                    node_id,
+                    value,
+                    self.variant_type.name,
+                    e,
+                )
+        else:
+            self.invalid.discard(slot)
+
+
+class RingHistory:
+    """History storage and HistoryRead service for a simulator's variables."""
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("history size must be >= 1")
+        self.size = size
+        self._lock = threading.Lock()
+        self._times = array("d", bytes(8 * size))
+        self._series = {}  # NodeId → _Series, in recording order
+        self._count = 0  # ticks recorded so far
+
+    def add(self, node_id: ua.NodeId, variant_type: ua.VariantType):
+        if self._count:
+            raise RuntimeError("Variables must be added before recording starts")
+        self._series[node_id] = _Series(variant_type, self.size)
+
+    @property
+    def node_ids(self) -> list:
+        return list(self._series)
+
+    def record(self, timestamp: float, values: list):
+        """Append one tick: ``values`` in the order the variables were added."""
+        with self._lock:
+            slot = self._count % self.size
+            self._times[slot] = timestamp
+            for (node_id, series), value in zip(self._series.items(), values):
+                try:
+                    series.values[slot] = value
+                except (TypeError, ValueError, OverflowError):
+                    series.store_mismatched(node_id, slot, value)
+                else:
+                    if series.invalid:
+                        series.invalid.discard(slot)
+            self._count += 1
+
+    # ---------- HistoryManager interface ----------
+    def read_history(self, params: ua.HistoryReadParameters) -> list:
+        details = params.HistoryReadDetails
+        if isinstance(details, ua.ReadRawModifiedDetails):
+            read = self._read_raw
+        elif isinstance(details, ua.ReadProcessedDetails):
+            read = self._read_processed
+            if len(details.AggregateType) != len(params.NodesToRead):
+                return [
+                    self._error(ua.StatusCodes.BadAggregateListMismatch)
+                    for _ in params.NodesToRead
+                ]
+        else:
+            read = None
+
+        results = []
+        for index, rv in enumerate(params.NodesToRead):
+            if read is None or rv.NodeId not in self._series:
+                code = ua.StatusCodes.BadHistoryOperationUnsupported
+                results.append(self._error(code))
+            else:
+                results.append(read(details, rv, index))
+        return results
+
+    def stop(self):
+        pass
+
+    # ---------- Reads ----------
+    @staticmethod
+    def _error(code) -> ua.HistoryReadResult:
+        result = ua.HistoryReadResult()
+        result.StatusCode = ua.StatusCode(code)
+        return result
+
+    def _window(
+        self, start: float | None, end: float | None, closed: bool = True
+    ) -> tuple[int, int, int]:
+        """
+        Oldest retained sequence and the ``[lo, hi)`` sequence range of ticks
+        between ``start`` and ``end`` (excluding ``end`` unless ``closed``).
+        """
+        first = max(0, self._count - self.size)
+        ticks = range(first, self._count)
+
+        def tick_time(seq):
+            return self._times[seq % self.size]
+
+        lo = first
+        hi = self._count
+        if start is not None:
+            lo = first + bisect.bisect_left(ticks, start, key=tick_time)
+        if end is not None:
+            edge = bisect.bisect_right if closed else bisect.bisect_left
+            hi = first + edge(ticks, end, key=tick_time)
+        return first, lo, hi
+
+    def _data_value(self, series: _Series, seq: int) -> ua.DataValue:
+        slot = seq % self.size
+        if slot in series.invalid:
+            value = ua.DataValue()
+            value.StatusCode = ua.StatusCode(ua.StatusCodes.BadTypeMismatch)
+        else:
+            value = ua.DataValue(
+                ua.Variant(series.decode(series.values[slot]), series.variant_type)
+            )
+        value.SourceTimestamp = value.ServerTimestamp = _to_datetime(self._times[slot])
+        return value
+
+    def _read_raw(self, details, rv, index) -> ua.HistoryReadResult:
+        if details.IsReadModified:
+            # Simulated history is never modified
+            return self._error(ua.StatusCodes.BadHistoryOperationUnsupported)
+        start = _to_seconds(details.StartTime)
+        end = _to_seconds(details.EndTime)
+        # Newest first when StartTime is unspecified or the range runs backwards,
+        # so Node.read_raw_history() without arguments returns everything kept
+        reverse = start is None or (end is not None and start > end)
+        if start is not None and end is not None and start > end:
+            start, end = end, start
+
+        series = self._series[rv.NodeId]
+        limit = details.NumValuesPerNode
+        with self._lock:
+            first, lo, hi = self._window(start, end)
+            if rv.ContinuationPoint:
+                (resume,) = _CONTINUATION.unpack(rv.ContinuationPoint)
+                if resume < first:
+                    return self._error(ua.StatusCodes.BadContinuationPointInvalid)
+                if reverse:
+                    hi = min(hi, resume + 1)
+                else:
+                    lo = max(lo, resume)
+            ticks = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+            continuation = None
+            if limit and len(ticks) > limit:
+                continuation = _CONTINUATION.pack(ticks[limit])
+                ticks = ticks[:limit]
+            values = [self._data_value(series, seq) for seq in ticks]
+
+        result = ua.HistoryReadResult()
+        result.HistoryData = ua.HistoryData()
+        result.HistoryData.DataValues = values
+        result.ContinuationPoint = continuation
+        return result
+
+    def _read_processed(self, details, rv, index) -> ua.HistoryReadResult:
+        start = _to_seconds(details.StartTime)
+        end = _to_seconds(details.EndTime)
+        if start is None or end is None or start == end:
+            return self._error(ua.StatusCodes.BadHistoryOperationInvalid)
+        aggregate = _AGGREGATES.get(details.AggregateType[index])
+        if aggregate is None:
+            return self._error(ua.StatusCodes.BadAggregateNotSupported)
+        numeric, function, result_type = aggregate
+        series = self._series[rv.NodeId]
+        if numeric and not series.numeric:
+            return self._error(ua.StatusCodes.BadAggregateInvalidInputs)
+
+        low, high = min(start, end), max(start, end)
+        interval = details.ProcessingInterval / 1000 or high - low
+        count = math.ceil((high - low) / interval)
+        if count > MAX_INTERVALS:
+            return self._error(ua.StatusCodes.BadTooManyOperations)
+
+        step = interval if start < end else -interval
+        values = []
+        with self._lock:
+            for n in range(count):
+                # Intervals run from StartTime towards EndTime, either way
+                edge = start + n * step
+                other = start + (n + 1) * step
+                other = min(other, end) if step > 0 else max(other, end)
+                _, lo, hi = self._window(
+                    min(edge, other), max(edge, other), closed=False
+                )
+                samples = [
+                    series.values[seq % self.size]
+                    for seq in range(lo, hi)
+                    if seq % self.size not in series.invalid
+                ]
+                if samples or function is len:
+                    value = function(samples)
+                    if result_type is None:
+                        value = series.decode(value)
+                    data_value = ua.DataValue(
+                        ua.Variant(value, result_type or series.variant_type)
+                    )
+                else:
+                    data_value = ua.DataValue()
+                    data_value.StatusCode = ua.StatusCode(ua.StatusCodes.BadNoData)
+                data_value.SourceTimestamp = _to_datetime(edge)
+                data_value.ServerTimestamp = data_value.SourceTimestamp
+                values.append(data_value)
+
+        result = ua.HistoryReadResult()
+        result.HistoryData = ua.HistoryData()
+        result.HistoryData.DataValues = values
+        return result
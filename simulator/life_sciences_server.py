@@ -1,23 +1,20 @@
-from opcua import Server
-import random
-import time
 import logging
 
+from .base import BaseSimulator
+
 # ---------- Logging ----------
 logger = logging.getLogger("LifeSciencesSimulator")
 logger.setLevel(logging.INFO)
 
-stream_handler = logging.StreamHandler()
-stream_formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-stream_handler.setFormatter(stream_formatter)
-logger.addHandler(stream_handler)
 
+class LifeSciencesServer(BaseSimulator):
+    logger = logger
+    tags_per_asset = 13
 
-class LifeSciencesServer:
-    def __init__(self, endpoint="opc.tcp://0.0.0.0:4841/lifesciences/server/"):
-        self.server = Server()
-        self.server.set_endpoint(endpoint)
-        self.idx = self.server.register_namespace("http://lifesciences.simulator")
+    def __init__(
+        self, endpoint="opc.tcp://0.0.0.0:4841/lifesciences/server/", **options
+    ):
+        super().__init__(endpoint, "http://lifesciences.simulator", **options)
         self.rooms = {}
 
         self._setup_rooms()
@@ -28,7 +25,7 @@ class LifeSciencesServer:
             self.idx, "LifeSciencesFacility"
         )
 
-        for i in range(1, 11):
+        for i in range(1, self.asset_count + 1):
             room_name = f"ProcessRoom{i}"
             room = facility.add_object(self.idx, room_name)
 
@@ -72,56 +69,39 @@ class LifeSciencesServer:
             for var in self.rooms[room_name].values():
                 var.set_writable()
 
-        logger.info("Configured 5 Process Rooms with simulated assets.")
-
-    def simulate(self):
-        self.server.start()
-        logger.info("Life Sciences OPC UA Server started.")
-        try:
-            while True:
-                for room_name, vars in self.rooms.items():
-                    # Bioreactor Simulation
-                    vars["pH"].set_value(round(random.uniform(6.5, 7.5), 2))
-                    vars["DissolvedO2"].set_value(round(random.uniform(80, 100), 2))
-                    vars["Temperature"].set_value(round(random.uniform(36, 38), 2))
-                    vars["AgitationSpeed"].set_value(round(random.uniform(80, 150), 2))
-
-                    # Centrifuge Simulation
-                    status = random.choice(["Idle", "Spinning", "Completed"])
-                    rpm = (
-                        round(random.uniform(0, 5000), 0) if status == "Spinning" else 0
-                    )
-                    load = round(random.uniform(10, 90), 2) if status != "Idle" else 0.0
-
-                    vars["RPM"].set_value(rpm)
-                    vars["Status"].set_value(status)
-                    vars["LoadPercent"].set_value(load)
-
-                    # Environmental Conditions
-                    vars["RoomTemp"].set_value(round(random.uniform(19.5, 21.0), 2))
-                    vars["Humidity"].set_value(round(random.uniform(45, 55), 2))
-                    vars["ParticleCount"].set_value(random.randint(80, 150))
-
-                    # Batch Controller Simulation
-                    vars["Step"].set_value(
-                        random.choice(
-                            ["Initialization", "Mixing", "Filling", "Completed"]
-                        )
-                    )
-                    vars["BatchStatus"].set_value(
-                        random.choice(["Running", "Paused", "Error", "Completed"])
-                    )
-
-                    logger.info(
-                        f"{room_name} | Bioreactor pH: {vars['pH'].get_value()} | "
-                        f"Centrifuge: {status} @ {rpm} RPM | "
-                        f"Env: Temp {vars['RoomTemp'].get_value()}°C, "
-                        f"Humidity {vars['Humidity'].get_value()}%, Particles {vars['ParticleCount'].get_value()}"
-                    )
-
-                time.sleep(2)
-        except KeyboardInterrupt:
-            logger.info("Simulation manually stopped.")
-        finally:
-            self.server.stop()
-            logger.info("Life Sciences Server shutdown complete.")
+        logger.info(
+            "Configured %d Process Rooms with simulated assets.", len(self.rooms)
+        )
+
+    def _asset_groups(self):
+        return self.rooms
+
+    def _tick(self):
+        for room_name, vars in self.rooms.items():
+            # Bioreactor Simulation
+            vars["pH"].set_value(round(self.rng.uniform(6.5, 7.5), 2))
+            vars["DissolvedO2"].set_value(round(self.rng.uniform(80, 100), 2))
+            vars["Temperature"].set_value(round(self.rng.uniform(36, 38), 2))
+            vars["AgitationSpeed"].set_value(round(self.rng.uniform(80, 150), 2))
+
+            # Centrifuge Simulation
+            status = self.rng.choice(["Idle", "Spinning", "Completed"])
+            rpm = round(self.rng.uniform(0, 5000), 0) if status == "Spinning" else 0
+            load = round(self.rng.uniform(10, 90), 2) if status != "Idle" else 0.0
+
+            vars["RPM"].set_value(rpm)
+            vars["Status"].set_value(status)
+            vars["LoadPercent"].set_value(load)
+
+            # Environmental Conditions
+            vars["RoomTemp"].set_value(round(self.rng.uniform(19.5, 21.0), 2))
+            vars["Humidity"].set_value(round(self.rng.uniform(45, 55), 2))
+            vars["ParticleCount"].set_value(self.rng.randint(80, 150))
+
+            # Batch Controller Simulation
+            vars["Step"].set_value(
+                self.rng.choice(["Initialization", "Mixing", "Filling", "Completed"])
+            )
+            vars["BatchStatus"].set_value(
+                self.rng.choice(["Running", "Paused", "Error", "Completed"])
+            )
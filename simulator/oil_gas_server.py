@@ -1,27 +1,20 @@
-from opcua import Server
 from datetime import datetime
-import random
-import time
 import logging
 
+from .base import BaseSimulator
 
 # ---------- Logging Setup ----------
 logger = logging.getLogger("OilAndGasSimulator")
 logger.setLevel(logging.INFO)
 
-stream_handler = logging.StreamHandler()
-stream_formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-stream_handler.setFormatter(stream_formatter)
-
-logger.addHandler(stream_handler)
-
 
 # ---------- Simulator Class ----------
-class OilAndGasSimulator:
-    def __init__(self, endpoint="opc.tcp://0.0.0.0:4840/oilgas/server/"):
-        self.server = Server()
-        self.server.set_endpoint(endpoint)
-        self.idx = self.server.register_namespace("http://oilgas.simulator")
+class OilAndGasSimulator(BaseSimulator):
+    logger = logger
+    tags_per_asset = 10
+
+    def __init__(self, endpoint="opc.tcp://0.0.0.0:4840/oilgas/server/", **options):
+        super().__init__(endpoint, "http://oilgas.simulator", **options)
         self.lines = {}
 
         self._setup_lines()
@@ -30,7 +23,7 @@ class OilAndGasSimulator:
     def _setup_lines(self):
         plant = self.server.nodes.objects.add_object(self.idx, "OilAndGasPlant")
 
-        for i in range(1, 11):  # 10 lines for ~100 tags
+        for i in range(1, self.asset_count + 1):  # 10 lines for ~100 tags
             line_name = f"Line{i}"
             line = plant.add_object(self.idx, line_name)
 
@@ -83,52 +76,36 @@ class OilAndGasSimulator:
             "Configured %d simulation lines with nested assets.", len(self.lines)
         )
 
-    def simulate(self):
-        self.server.start()
-        logger.info("OPC UA Server started.")
-        try:
-            while True:
-                for line_name, vars in self.lines.items():
-                    # Simulate Pump
-                    motor_temp = round(random.uniform(60, 120), 2)
-                    rpm = round(random.uniform(1500, 3000), 2)
-                    pump_status = random.choice(["Running", "Stopped", "Fault"])
-
-                    vars["MotorTemp"].set_value(motor_temp)
-                    vars["RPM"].set_value(rpm)
-                    vars["PumpStatus"].set_value(pump_status)
-
-                    # Simulate Compressor
-                    pressure = round(random.uniform(80, 130), 2)
-                    vibration = round(random.uniform(0.1, 1.5), 2)
-                    compressor_status = random.choice(["Idle", "Compressing", "Fault"])
-
-                    vars["Pressure"].set_value(pressure)
-                    vars["Vibration"].set_value(vibration)
-                    vars["CompressorStatus"].set_value(compressor_status)
-
-                    # Simulate Valves
-                    vars["InletValve"].set_value(random.choice([True, False]))
-                    vars["OutletValve"].set_value(random.choice([True, False]))
-
-                    # Simulate Flow
-                    flow_rate = round(random.uniform(100, 500), 2)
-                    totalized = vars["TotalizedFlow"].get_value() + flow_rate
-
-                    vars["FlowRate"].set_value(flow_rate)
-                    vars["TotalizedFlow"].set_value(totalized)
-
-                    # Log
-                    logger.info(
-                        f"{line_name} | FlowRate: {flow_rate:.2f} L/min | Total: {totalized:.2f} | "
-                        f"Pump: {pump_status} @ {rpm} RPM / {motor_temp}°C | "
-                        f"Compressor: {compressor_status} | Pressure: {pressure} psi | Vibration: {vibration}"
-                    )
-
-                time.sleep(2)
-
-        except KeyboardInterrupt:
-            logger.info("Simulation manually stopped.")
-        finally:
-            self.server.stop()
-            logger.info("Server shutdown complete.")
+    def _asset_groups(self):
+        return self.lines
+
+    def _tick(self):
+        for line_name, vars in self.lines.items():
+            # Simulate Pump
+            motor_temp = round(self.rng.uniform(60, 120), 2)
+            rpm = round(self.rng.uniform(1500, 3000), 2)
+            pump_status = self.rng.choice(["Running", "Stopped", "Fault"])
+
+            vars["MotorTemp"].set_value(motor_temp)
+            vars["RPM"].set_value(rpm)
+            vars["PumpStatus"].set_value(pump_status)
+
+            # Simulate Compressor
+            pressure = round(self.rng.uniform(80, 130), 2)
+            vibration = round(self.rng.uniform(0.1, 1.5), 2)
+            compressor_status = self.rng.choice(["Idle", "Compressing", "Fault"])
+
+            vars["Pressure"].set_value(pressure)
+            vars["Vibration"].set_value(vibration)
+            vars["CompressorStatus"].set_value(compressor_status)
+
+            # Simulate Valves
+            vars["InletValve"].set_value(self.rng.choice([True, False]))
+            vars["OutletValve"].set_value(self.rng.choice([True, False]))
+
+            # Simulate Flow
+            flow_rate = round(self.rng.uniform(100, 500), 2)
+            totalized = vars["TotalizedFlow"].get_value() + flow_rate
+
+            vars["FlowRate"].set_value(flow_rate)
+            vars["TotalizedFlow"].set_value(totalized)
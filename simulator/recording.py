@@ -0,0 +1,118 @@
+"""
+Compact binary recordings of simulator ticks.
+
+A recording starts with a header naming every variable (``Line1/MotorTemp``,
+...) followed by one frame per tick. Each frame stores the tick offset in
+seconds and one tagged value per variable, in header order.
+"""
+
+import struct
+
+MAGIC = b"MCPSIMR1"
+
+_HEADER_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+_TIMESTAMP = struct.Struct("<d")
+_FLOAT = struct.Struct("<d")
+_INT = struct.Struct("<q")
+
+
+def _encode_value(value) -> bytes:
+    # bool must be checked before int, it is a subclass
+    if isinstance(value, bool):
+        return b"?" + (b"\x01" if value else b"\x00")
+    if isinstance(value, int):
+        return b"q" + _INT.pack(value)
+    if isinstance(value, float):
+        return b"d" + _FLOAT.pack(value)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return b"s" + _LENGTH.pack(len(data)) + data
+    raise TypeError(f"Cannot record value of type {type(value).__name__}")
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError("Truncated recording")
+    return data
+
+
+def _decode_value(stream):
+    tag = _read_exact(stream, 1)
+    if tag == b"?":
+        return _read_exact(stream, 1) != b"\x00"
+    if tag == b"q":
+        return _INT.unpack(_read_exact(stream, _INT.size))[0]
+    if tag == b"d":
+        return _FLOAT.unpack(_read_exact(stream, _FLOAT.size))[0]
+    if tag == b"s":
+        (length,) = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))
+        return _read_exact(stream, length).decode("utf-8")
+    raise ValueError(f"Unknown value tag {tag!r} in recording")
+
+
+class FrameWriter:
+    """Appends per-tick value frames to a recording file."""
+
+    def __init__(self, path: str, names: list[str]):
+        self.path = path
+        self.names = list(names)
+        self.frames = 0
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._file.write(_HEADER_COUNT.pack(len(self.names)))
+        for name in self.names:
+            data = name.encode("utf-8")
+            self._file.write(_LENGTH.pack(len(data)) + data)
+
+    def write(self, offset: float, values: list):
+        if len(values) != len(self.names):
+            raise ValueError(
+                f"Frame has {len(values)} values, recording expects {len(self.names)}"
+            )
+        frame = [_TIMESTAMP.pack(offset)]
+        frame.extend(_encode_value(value) for value in values)
+        self._file.write(b"".join(frame))
+        # Flush per tick so an interrupted run still leaves complete frames
+        self._file.flush()
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+
+
+class FrameReader:
+    """Iterates ``(offset, values)`` frames from a recording file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.names = self._read_header(f)
+
+    @staticmethod
+    def _read_header(stream) -> list[str]:
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a simulator recording")
+        (count,) = _HEADER_COUNT.unpack(_read_exact(stream, _HEADER_COUNT.size))
+        names = []
+        for _ in range(count):
+            (length,) = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))
+            names.append(_read_exact(stream, length).decode("utf-8"))
+        return names
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            self._read_header(f)
+            count = len(self.names)
+            while True:
+                raw = f.read(_TIMESTAMP.size)
+                if len(raw) != _TIMESTAMP.size:
+                    return
+                (offset,) = _TIMESTAMP.unpack(raw)
+                try:
+                    values = [_decode_value(f) for _ in range(count)]
+                except EOFError:
+                    # Partial last frame from an interrupted recording
+                    return
+                yield offset, values
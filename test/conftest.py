@@ -0,0 +1,32 @@
+import itertools
+
+import pytest
+from opcua import Server
+
+from opcua_client import MCPClient
+from opcua_client.loopback import serve_loopback, stop_loopback
+
+# Scripts that talk to simulators on localhost:4840 when imported
+collect_ignore = ["test_client.py", "test_prompt.py", "diagnose_import.py"]
+
+_names = itertools.count(1)
+
+
+@pytest.fixture
+def plant():
+    """
+    ``(client, url, objects node, namespace)`` of a small in-process server
+    with ``Objects/Line1/Speed``, connected over ``loopback://``.
+    """
+    server = Server()
+    ns = server.register_namespace("urn:test:plant")
+    objects = server.get_objects_node()
+    line = objects.add_object(ns, "Line1")
+    line.add_variable(ns, "Speed", 1.0)
+    url = serve_loopback(server, f"plant-{next(_names)}")
+    client = MCPClient([url])
+    client.connect_all()
+    yield client, url, objects, ns
+    client.disconnect_all()
+    stop_loopback(url)
+    server.iserver.stop()
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_server import admission
+from mcp_server.admission import Bulkhead, Overloaded
+from mcp_server.server import OVERLOADED_ERROR, app
+
+URL = "opc.tcp://saturated.test:4840"
+
+
+def test_sheds_past_capacity():
+    bulkhead = Bulkhead(URL, limit=2, queue_size=0)
+    bulkhead.acquire()
+    bulkhead.acquire()
+    with pytest.raises(Overloaded) as raised:
+        bulkhead.acquire()
+    assert raised.value.reason == "queue_full"
+    assert raised.value.retry_after >= 1
+    assert bulkhead.active == 2
+
+
+def test_queued_request_times_out():
+    bulkhead = Bulkhead(URL, limit=1, queue_size=1, queue_timeout=0.05)
+    bulkhead.acquire()
+    with pytest.raises(Overloaded) as raised:
+        bulkhead.acquire()
+    assert raised.value.reason == "queue_timeout"
+    assert bulkhead.waiting == 0
+
+
+def test_queued_request_gets_released_slot():
+    bulkhead = Bulkhead(URL, limit=1, queue_size=1, queue_timeout=5)
+    bulkhead.acquire()
+    acquired = threading.Event()
+
+    def wait_in_line():
+        bulkhead.acquire()
+        acquired.set()
+
+    waiter = threading.Thread(target=wait_in_line)
+    waiter.start()
+    assert not acquired.wait(0.05)
+    bulkhead.release(0.01)
+    waiter.join(5)
+    assert acquired.is_set()
+    assert (bulkhead.active, bulkhead.waiting) == (1, 0)
+
+
+def test_slot_is_released_when_the_handler_raises():
+    bulkhead = Bulkhead(URL, limit=1, queue_size=0)
+    with pytest.raises(RuntimeError):
+        with bulkhead.slot():
+            assert bulkhead.active == 1
+            raise RuntimeError("handler failed")
+    assert bulkhead.active == 0
+    with bulkhead.slot():
+        pass
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """A server whose only slot is taken and that queues nothing."""
+    bulkhead = Bulkhead(URL, limit=1, queue_size=0)
+    bulkhead.acquire()
+    monkeypatch.setitem(admission._bulkheads, URL, bulkhead)
+    # No lifespan: warm-up would try to reach the default servers
+    return TestClient(app)
+
+
+def test_rest_request_is_shed_with_429(saturated):
+    response = saturated.get("/value", params={"server_url": URL, "node_id": "i=1"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["retry_after"] >= 1
+
+
+def test_tool_call_is_shed_with_jsonrpc_error(saturated):
+    response = saturated.post(
+        "/",
+        json={
+            "jsonrpc": "2.0",
+            "id": 7,
+            "method": "tools/call",
+            "params": {"name": "get_tags", "arguments": {"server_url": URL}},
+        },
+    )
+    body = response.json()
+    assert body["id"] == 7
+    assert body["error"]["code"] == OVERLOADED_ERROR == -32001
+    assert body["error"]["data"]["server_url"] == URL
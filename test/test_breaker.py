@@ -0,0 +1,108 @@
+import pickle
+
+import pytest
+
+from opcua_client import breaker
+from opcua_client.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+)
+
+URL = "opc.tcp://plant:4840"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make(**options):
+    options = {"threshold": 2, "base_backoff": 1, "max_backoff": 8, **options}
+    return CircuitBreaker(URL, **options)
+
+
+def test_opens_after_threshold_consecutive_failures(clock):
+    circuit = make()
+    circuit.record_failure("refused")
+    assert circuit.state == CLOSED
+    circuit.allow()
+    circuit.record_failure("refused")
+    assert circuit.state == OPEN
+    with pytest.raises(CircuitOpen) as raised:
+        circuit.allow()
+    assert raised.value.retry_after == 1
+    assert raised.value.last_error == "refused"
+
+
+def test_success_resets_failure_count(clock):
+    circuit = make()
+    circuit.record_failure()
+    circuit.record_success()
+    circuit.record_failure()
+    assert circuit.state == CLOSED
+    assert circuit.failures == 1
+
+
+def test_check_does_not_start_a_probe(clock):
+    circuit = make(threshold=1)
+    circuit.record_failure()
+    with pytest.raises(CircuitOpen):
+        circuit.check()
+    clock[0] += 1
+    circuit.check()
+    assert circuit.state == OPEN
+
+
+def test_one_probe_after_backoff_and_success_closes(clock):
+    circuit = make(threshold=1)
+    circuit.record_failure()
+    clock[0] += 1
+    circuit.allow()
+    assert circuit.state == HALF_OPEN
+    with pytest.raises(CircuitOpen) as raised:
+        circuit.allow()  # a second caller waits for the probe
+    assert raised.value.retry_after == 1
+    circuit.record_success()
+    assert circuit.state == CLOSED
+    circuit.allow()
+
+
+def test_failed_probe_doubles_backoff_up_to_max(clock):
+    circuit = make(threshold=1)
+    circuit.record_failure()
+    for backoff in (2, 4, 8, 8):
+        clock[0] += circuit.backoff
+        circuit.allow()
+        circuit.record_failure()
+        assert circuit.state == OPEN
+        assert circuit.backoff == backoff
+        assert circuit.snapshot()["retry_after"] == backoff
+    clock[0] += 8
+    circuit.allow()
+    circuit.record_success()
+    assert circuit.backoff == 1
+
+
+def test_abandoned_probe_is_replaced_after_max_backoff(clock):
+    circuit = make(threshold=1)
+    circuit.record_failure()
+    clock[0] += 1
+    circuit.allow()
+    clock[0] += 8
+    circuit.allow()
+    assert circuit.state == HALF_OPEN
+
+
+def test_circuit_open_survives_pickling():
+    error = pickle.loads(pickle.dumps(CircuitOpen(URL, 2.5, "refused")))
+    assert isinstance(error, ConnectionError)
+    assert (error.server_url, error.retry_after, error.last_error) == (
+        URL,
+        2.5,
+        "refused",
+    )
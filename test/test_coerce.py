@@ -0,0 +1,88 @@
+import math
+
+import pytest
+from opcua import ua
+
+from opcua_client.client import coerce_value
+
+VT = ua.VariantType
+
+
+@pytest.mark.parametrize(
+    "value, variant_type, expected",
+    [
+        ("true", VT.Boolean, True),
+        (" Off ", VT.Boolean, False),
+        (1, VT.Boolean, True),
+        ("42", VT.Int32, 42),
+        ("42.0", VT.Int16, 42),
+        (7.0, VT.Byte, 7),
+        (-128, VT.SByte, -128),
+        (255, VT.Byte, 255),
+        (2**64 - 1, VT.UInt64, 2**64 - 1),
+        ("18446744073709551615", VT.UInt64, 2**64 - 1),
+        ("42.5", VT.Double, 42.5),
+        (3, VT.Float, 3.0),
+        (math.inf, VT.Double, math.inf),
+        (85, VT.String, "85"),
+    ],
+)
+def test_coerces(value, variant_type, expected):
+    assert coerce_value(value, variant_type) == expected
+
+
+@pytest.mark.parametrize(
+    "value, variant_type",
+    [
+        ("maybe", VT.Boolean),
+        (2, VT.Boolean),
+        (2.5, VT.Int32),
+        (True, VT.Int32),
+        ("x", VT.Int16),
+        (math.nan, VT.Int32),
+        (True, VT.Double),
+        ("x", VT.Double),
+    ],
+)
+def test_rejects_mismatched_values(value, variant_type):
+    with pytest.raises(ValueError):
+        coerce_value(value, variant_type)
+
+
+@pytest.mark.parametrize(
+    "value, variant_type",
+    [
+        (math.inf, VT.Int32),
+        (-math.inf, VT.Int64),
+        ("1e400", VT.Int16),
+        (128, VT.SByte),
+        (-129, VT.SByte),
+        (256, VT.Byte),
+        (-1, VT.Byte),
+        (2**15, VT.Int16),
+        (2**16, VT.UInt16),
+        (2**31, VT.Int32),
+        ("-1", VT.UInt32),
+        (2**63, VT.Int64),
+        (2**64, VT.UInt64),
+        (1e39, VT.Float),
+        (10**400, VT.Double),
+    ],
+)
+def test_rejects_out_of_range_numbers(value, variant_type):
+    with pytest.raises(OverflowError):
+        coerce_value(value, variant_type)
+
+
+@pytest.mark.parametrize(
+    "variant_type", [VT.NodeId, VT.LocalizedText, VT.ExtensionObject, VT.DateTime]
+)
+def test_rejects_types_without_conversion(variant_type):
+    with pytest.raises(TypeError):
+        coerce_value(5, variant_type)
+
+
+@pytest.mark.parametrize("value", [None, [1], {"a": 1}])
+def test_rejects_non_scalars_for_integers(value):
+    with pytest.raises(TypeError):
+        coerce_value(value, VT.Int32)
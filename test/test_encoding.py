@@ -0,0 +1,120 @@
+import gzip
+import json
+
+import pytest
+
+from mcp_server import encoding
+from mcp_server.encoding import (
+    ARROW,
+    JSON,
+    MSGPACK,
+    NotAcceptable,
+    choose_encoding,
+    compress,
+    encode,
+    negotiate,
+)
+
+INSTALLED = object()  # stands in for an importable optional module
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    """Pretend exactly the given optional packages are importable."""
+
+    def install(*names):
+        for name in ("msgpack", "pyarrow", "zstandard"):
+            monkeypatch.setitem(
+                encoding._modules, name, INSTALLED if name in names else None
+            )
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON),
+        ("", JSON),
+        ("application/json", JSON),
+        ("*/*", JSON),
+        ("application/*", JSON),
+        ("text/html", JSON),
+        ("text/html, application/xhtml+xml;q=0.9", JSON),
+        ("text/csv, */*;q=0.1", JSON),
+        ("application/msgpack", JSON),
+        (ARROW, JSON),
+        ("application/json;q=0", NotAcceptable),
+        ("application/json;q=0, text/csv", NotAcceptable),
+        ("application/json;q=0, */*", NotAcceptable),
+        ("*/*;q=0", NotAcceptable),
+        ("application/*;q=0", NotAcceptable),
+        ("*/*;q=0, application/json;q=0.5", JSON),
+        ("application/*;q=0, */*", NotAcceptable),
+        ("application/json;q=bogus", NotAcceptable),
+    ],
+)
+def test_without_optional_formats(installed, accept, expected):
+    installed()
+    if expected is NotAcceptable:
+        with pytest.raises(NotAcceptable) as raised:
+            negotiate(accept, tabular=True)
+        assert raised.value.offered == [JSON]
+    else:
+        assert negotiate(accept, tabular=True) == expected
+
+
+@pytest.mark.parametrize(
+    "accept, tabular, expected",
+    [
+        ("application/msgpack", False, MSGPACK),
+        ("application/x-msgpack", False, MSGPACK),
+        ("application/vnd.msgpack", False, MSGPACK),
+        (ARROW, True, ARROW),
+        ("application/vnd.apache.arrow.file", True, ARROW),
+        # Arrow is only offered for tabular responses
+        (ARROW, False, JSON),
+        (f"{ARROW}, application/msgpack;q=0.5", False, MSGPACK),
+        ("application/json;q=0.5, application/msgpack", False, MSGPACK),
+        ("application/msgpack;q=0.5, application/json", False, JSON),
+        # Ties keep header order
+        ("application/json, application/msgpack", False, JSON),
+        ("application/msgpack;q=0, */*", False, JSON),
+        # A wildcard still covers the other formats when JSON is excluded
+        ("application/json;q=0, */*", False, MSGPACK),
+        ("application/json;q=0, text/html", False, NotAcceptable),
+    ],
+)
+def test_with_optional_formats(installed, accept, tabular, expected):
+    installed("msgpack", "pyarrow")
+    if expected is NotAcceptable:
+        with pytest.raises(NotAcceptable):
+            negotiate(accept, tabular=tabular)
+    else:
+        assert negotiate(accept, tabular=tabular) == expected
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, modules, expected",
+    [
+        (None, (), None),
+        ("gzip", (), "gzip"),
+        ("zstd", (), None),
+        ("zstd, gzip", (), "gzip"),
+        ("zstd, gzip", ("zstandard",), "zstd"),
+        ("gzip;q=0", (), None),
+        ("*", (), "gzip"),
+        ("*, gzip;q=0", (), None),
+        ("identity", (), None),
+    ],
+)
+def test_choose_encoding(installed, accept_encoding, modules, expected):
+    installed(*modules)
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_json_body_round_trips_and_gzips():
+    content = {"tags": [{"name": "Temperatur °C", "value": 21.5}]}
+    body = encode(content, JSON)
+    assert json.loads(body) == content
+    assert gzip.decompress(compress(body, "gzip")) == body
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+
+import pytest
+from opcua import ua
+
+from simulator.history import EPOCH, RingHistory
+
+TEMPERATURE = ua.NodeId(1, 2)
+RUNNING = ua.NodeId(2, 2)
+STATUS = ua.NodeId(3, 2)
+START = 1_700_000_000  # Unix seconds of the first tick
+
+
+def at(seconds: float) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def history():
+    """Ten ticks, one second apart: 20.0, 21.0, ... 29.0."""
+    history = RingHistory(size=16)
+    history.add(TEMPERATURE, ua.VariantType.Double)
+    history.add(RUNNING, ua.VariantType.Boolean)
+    history.add(STATUS, ua.VariantType.String)
+    for tick in range(10):
+        history.record(START + tick, [20.0 + tick, tick % 2 == 0, f"step {tick}"])
+    return history
+
+
+def read(history, details, node_id=TEMPERATURE, continuation=None):
+    params = ua.HistoryReadParameters()
+    params.HistoryReadDetails = details
+    rv = ua.HistoryReadValueId()
+    rv.NodeId = node_id
+    rv.ContinuationPoint = continuation
+    params.NodesToRead = [rv]
+    (result,) = history.read_history(params)
+    return result
+
+
+def raw(start=None, end=None, limit=0):
+    details = ua.ReadRawModifiedDetails()
+    details.IsReadModified = False  # python-opcua defaults to True
+    details.StartTime = at(start) if start is not None else ua.get_win_epoch()
+    details.EndTime = at(end) if end is not None else ua.get_win_epoch()
+    details.NumValuesPerNode = limit
+    return details
+
+
+def read_all_pages(history, details, node_id=TEMPERATURE):
+    pages = []
+    continuation = None
+    while True:
+        result = read(history, details, node_id, continuation)
+        assert result.StatusCode.is_good()
+        pages.append(result.HistoryData.DataValues)
+        continuation = result.ContinuationPoint
+        if not continuation:
+            return pages
+
+
+def values(data_values):
+    return [data_value.Value.Value for data_value in data_values]
+
+
+def test_raw_read_pages_with_continuation_points(history):
+    pages = read_all_pages(history, raw(START, START + 60, limit=4))
+    assert [len(page) for page in pages] == [4, 4, 2]
+    samples = [value for page in pages for value in page]
+    assert values(samples) == [20.0 + tick for tick in range(10)]
+    assert [value.SourceTimestamp for value in samples] == [
+        at(START + tick) for tick in range(10)
+    ]
+
+
+def test_raw_read_backwards_is_newest_first(history):
+    pages = read_all_pages(history, raw(START + 7, START + 2, limit=3))
+    assert [values(page) for page in pages] == [
+        [27.0, 26.0, 25.0],
+        [24.0, 23.0, 22.0],
+    ]
+
+
+def test_raw_read_without_times_returns_everything_newest_first(history):
+    (page,) = read_all_pages(history, raw())
+    assert values(page) == [29.0 - tick for tick in range(10)]
+
+
+def test_raw_read_decodes_booleans_and_strings(history):
+    (running,) = read_all_pages(history, raw(START, START + 2), RUNNING)
+    (status,) = read_all_pages(history, raw(START, START + 2), STATUS)
+    assert values(running) == [True, False, True]
+    assert values(status) == ["step 0", "step 1", "step 2"]
+
+
+def test_overwritten_continuation_point_is_invalid(history):
+    first = read(history, raw(START, START + 60, limit=2))
+    for tick in range(10, 30):
+        history.record(START + tick, [20.0 + tick, True, "late"])
+    result = read(history, raw(START, START + 60, limit=2))
+    assert values(result.HistoryData.DataValues) == [34.0, 35.0]  # oldest kept
+    stale = read(
+        history, raw(START, START + 60, limit=2), TEMPERATURE, first.ContinuationPoint
+    )
+    assert stale.StatusCode.value == ua.StatusCodes.BadContinuationPointInvalid
+
+
+def processed(aggregate, start, end, interval_s):
+    details = ua.ReadProcessedDetails()
+    details.StartTime = at(start)
+    details.EndTime = at(end)
+    details.ProcessingInterval = interval_s * 1000
+    details.AggregateType = [ua.NodeId(aggregate)]
+    return details
+
+
+@pytest.mark.parametrize(
+    "aggregate, expected",
+    [
+        (ua.ObjectIds.AggregateFunction_Average, [21.5, 25.5]),
+        (ua.ObjectIds.AggregateFunction_Minimum, [20.0, 24.0]),
+        (ua.ObjectIds.AggregateFunction_Maximum, [23.0, 27.0]),
+        (ua.ObjectIds.AggregateFunction_Count, [4, 4]),
+        (ua.ObjectIds.AggregateFunction_Start, [20.0, 24.0]),
+        (ua.ObjectIds.AggregateFunction_End, [23.0, 27.0]),
+    ],
+)
+def test_processed_aggregates(history, aggregate, expected):
+    result = read(history, processed(aggregate, START, START + 8, 4))
+    samples = result.HistoryData.DataValues
+    assert values(samples) == expected
+    assert [value.SourceTimestamp for value in samples] == [at(START), at(START + 4)]
+
+
+def test_processed_interval_without_samples(history):
+    average = read(
+        history,
+        processed(ua.ObjectIds.AggregateFunction_Average, START + 100, START + 104, 2),
+    )
+    count = read(
+        history,
+        processed(ua.ObjectIds.AggregateFunction_Count, START + 100, START + 104, 2),
+    )
+    assert [value.StatusCode.value for value in average.HistoryData.DataValues] == [
+        ua.StatusCodes.BadNoData
+    ] * 2
+    assert values(count.HistoryData.DataValues) == [0, 0]
+
+
+def test_processed_numeric_aggregate_of_strings_is_refused(history):
+    result = read(
+        history,
+        processed(ua.ObjectIds.AggregateFunction_Average, START, START + 8, 4),
+        STATUS,
+    )
+    assert result.StatusCode.value == ua.StatusCodes.BadAggregateInvalidInputs
+
+
+def test_mismatched_values_do_not_stop_recording(history):
+    history.record(START + 10, ["overheated", True, "step 10"])
+    history.record(START + 11, ["31.5", "yes", "step 11"])
+    history.record(START + 12, [32.0, True, "step 12"])
+
+    (page,) = read_all_pages(history, raw(START + 10, START + 12))
+    assert page[0].StatusCode.value == ua.StatusCodes.BadTypeMismatch
+    assert values(page[1:]) == [31.5, 32.0]
+    average = read(
+        history,
+        processed(ua.ObjectIds.AggregateFunction_Average, START + 10, START + 13, 3),
+    )
+    assert values(average.HistoryData.DataValues) == [31.75]
+    (running,) = read_all_pages(history, raw(START + 11, START + 11), RUNNING)
+    assert running[0].StatusCode.value == ua.StatusCodes.BadTypeMismatch
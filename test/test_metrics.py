@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_server import metrics
+from mcp_server.metrics import REGISTRY, Registry, merge_expositions
+from opcua_client import client as client_module
+
+
+def test_render_exposition_text():
+    registry = Registry()
+    jobs = registry.counter("jobs_total", "Jobs run.", ("queue",))
+    temperature = registry.gauge("temperature", "Last reading.")
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", ("op",), buckets=(1.0, 0.1)
+    )
+    jobs.inc(queue="fast")
+    jobs.inc(queue="fast")
+    jobs.inc(2.5, queue='a "b"\\c\nd')
+    temperature.set(21.5)
+    for seconds in (0.0625, 0.5, 1.0, 4):
+        latency.observe(seconds, op="read")
+
+    assert registry.render() == (
+        "# HELP jobs_total Jobs run.\n"
+        "# TYPE jobs_total counter\n"
+        'jobs_total{queue="a \\"b\\"\\\\c\\nd"} 2.5\n'
+        'jobs_total{queue="fast"} 2\n'
+        "# HELP temperature Last reading.\n"
+        "# TYPE temperature gauge\n"
+        "temperature 21.5\n"
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{op="read",le="0.1"} 1\n'
+        'latency_seconds_bucket{op="read",le="1.0"} 3\n'
+        'latency_seconds_bucket{op="read",le="+Inf"} 4\n'
+        'latency_seconds_sum{op="read"} 5.5625\n'
+        'latency_seconds_count{op="read"} 4\n'
+    )
+
+
+def test_labels_must_match_and_names_are_unique():
+    registry = Registry()
+    jobs = registry.counter("jobs_total", "Jobs run.", ("queue",))
+    with pytest.raises(ValueError, match="expects labels"):
+        jobs.inc(worker="1")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("jobs_total", "Again.")
+
+
+def test_merge_expositions_keeps_one_header_per_family():
+    first = Registry()
+    first.counter("jobs_total", "Jobs run.", ("worker",)).inc(worker="1")
+    second = Registry()
+    second.counter("jobs_total", "Jobs run.", ("worker",)).inc(worker="2")
+    second.gauge("workers", "Workers alive.").set(2)
+
+    assert merge_expositions(first.render(), second.render()) == (
+        "# HELP jobs_total Jobs run.\n"
+        "# TYPE jobs_total counter\n"
+        'jobs_total{worker="1"} 1\n'
+        'jobs_total{worker="2"} 1\n'
+        "# HELP workers Workers alive.\n"
+        "# TYPE workers gauge\n"
+        "workers 2\n"
+    )
+
+
+def test_concurrent_service_calls_are_all_counted(plant, monkeypatch):
+    client, url, objects, ns = plant
+    monkeypatch.setattr(client_module, "_service_observers", [metrics._on_service_call])
+    node_id = objects.get_child(f"{ns}:Line1").get_child(f"{ns}:Speed").nodeid
+    node_id = node_id.to_string()
+    before = client.service_calls[url]["Read"]
+
+    threads, reads = 8, 50
+    with ThreadPoolExecutor(threads) as pool:
+        list(
+            pool.map(
+                lambda _: client.read_values(url, [node_id]), range(threads * reads)
+            )
+        )
+
+    assert client.service_calls[url]["Read"] - before == threads * reads
+    assert (
+        f'opcua_request_duration_seconds_count{{server="{url}",service="Read",'
+        f'status="ok"}} {threads * reads}'
+    ) in REGISTRY.render().splitlines()
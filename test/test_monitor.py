@@ -0,0 +1,168 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from opcua_client import monitor
+from opcua_client.monitor import AdaptiveMonitor
+
+TIERS = (1.0, 4.0, 16.0)
+FAST, QUIET = "ns=2;s=Line1.Speed", "ns=2;s=Line1.Serial"
+
+
+class FakeSubscription:
+    def __init__(self, period_ms, handler):
+        self.period_ms = period_ms
+        self.handler = handler
+        self.handles = {}  # handle → node
+        self._next = itertools.count(1)
+
+    def subscribe_data_change(self, nodes, queuesize=0):
+        assert queuesize == 1
+        handles = [next(self._next) for _ in nodes]
+        self.handles.update(zip(handles, nodes))
+        return handles
+
+    def unsubscribe(self, handles):
+        for handle in handles:
+            del self.handles[handle]
+
+    def delete(self):
+        self.handles.clear()
+
+
+class FakeClient:
+    """Just enough of ``opcua.Client`` for subscriptions; nothing is sent."""
+
+    def get_node(self, node_id):
+        return SimpleNamespace(nodeid=node_id)
+
+    def create_subscription(self, period_ms, handler):
+        return FakeSubscription(period_ms, handler)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(monitor.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make(initial_tier=0, callback=None, node_ids=(FAST, QUIET)):
+    # evaluate_interval=0: no background thread, the tests call evaluate()
+    return AdaptiveMonitor(
+        FakeClient(),
+        list(node_ids),
+        callback,
+        tiers=TIERS,
+        evaluate_interval=0,
+        initial_tier=initial_tier,
+    ).start()
+
+
+def notify(adaptive, node_id, value, tier=None, timestamp=None):
+    """Deliver a data change through the subscription of ``node_id``'s tier."""
+    if tier is None:
+        tier = TIERS.index(adaptive.tier_of(node_id))
+    data = SimpleNamespace(
+        monitored_item=SimpleNamespace(Value=SimpleNamespace(SourceTimestamp=timestamp))
+    )
+    adaptive._subscriptions[tier].handler.datachange_notification(
+        SimpleNamespace(nodeid=node_id), value, data
+    )
+
+
+def subscribed(adaptive, tier):
+    return sorted(
+        node.nodeid for node in adaptive._subscriptions[tier].handles.values()
+    )
+
+
+def test_changing_tag_is_promoted_one_tier_at_a_time(clock):
+    adaptive = make(initial_tier=2)
+    for value in range(4):  # the first value is not a change
+        notify(adaptive, FAST, value)
+    clock[0] += 4 * 16  # MIN_SAMPLES of the 16 s tier: 3 changes in 4 samples
+
+    assert adaptive.evaluate() == 1
+    assert adaptive.tier_of(FAST) == 4.0
+    assert adaptive.tier_of(QUIET) == 16.0
+    assert subscribed(adaptive, 1) == [FAST]
+    assert subscribed(adaptive, 2) == [QUIET]
+    assert adaptive._subscriptions[1].period_ms == 4000
+
+    # Changes counted in the old tier do not carry over
+    assert adaptive.evaluate() == 0
+    for value in range(4, 6):
+        notify(adaptive, FAST, value)
+    clock[0] += 4 * 4
+    assert adaptive.evaluate() == 1
+    assert adaptive.tier_of(FAST) == 1.0
+    assert adaptive.moves == 2
+
+
+def test_quiet_tag_drifts_to_the_slowest_tier(clock):
+    adaptive = make()
+    notify(adaptive, QUIET, 7)
+    notify(adaptive, FAST, 0)
+    clock[0] += 3  # fewer than MIN_SAMPLES samples: not evaluated yet
+    assert adaptive.evaluate() == 0
+
+    clock[0] += 1
+    notify(adaptive, FAST, 1)
+    notify(adaptive, FAST, 2)
+    assert adaptive.evaluate() == 1
+    assert adaptive.tier_of(QUIET) == 4.0
+    assert adaptive.tier_of(FAST) == 1.0
+
+    for value in range(3, 5):
+        notify(adaptive, FAST, value)
+    clock[0] += 4 * 4
+    assert adaptive.evaluate() == 1
+    assert adaptive.tier_of(QUIET) == 16.0
+    assert adaptive.tier_of(FAST) == 1.0
+
+    clock[0] += 4 * 16
+    adaptive.evaluate()
+    assert adaptive.tier_of(QUIET) == 16.0
+    assert subscribed(adaptive, 2) == [QUIET]
+    assert adaptive.tier_of(FAST) == 4.0  # FAST went quiet as well
+
+
+def test_moderate_rate_keeps_tier_and_starts_a_fresh_window(clock):
+    adaptive = make(initial_tier=1)
+    notify(adaptive, QUIET, 0)
+    notify(adaptive, QUIET, 1)  # one change in four 4 s samples
+    clock[0] += 4 * 4
+    adaptive.evaluate()
+    assert adaptive.tier_of(QUIET) == 4.0
+
+    # The change above belongs to the old window and no longer counts
+    clock[0] += 4 * 4
+    adaptive.evaluate()
+    assert adaptive.tier_of(QUIET) == 16.0
+
+
+def test_late_notification_from_previous_tier_is_ignored(clock):
+    seen = []
+    adaptive = make(callback=lambda *args: seen.append(args), node_ids=[QUIET])
+    notify(adaptive, QUIET, 1.5, timestamp="t0")
+    clock[0] += 4
+    adaptive.evaluate()
+    assert adaptive.tier_of(QUIET) == 4.0
+
+    notify(adaptive, QUIET, 2.5, tier=0, timestamp="t1")
+    assert seen == [(QUIET, 1.5, "t0")]
+    notify(adaptive, QUIET, 2.5, timestamp="t2")
+    assert seen[-1] == (QUIET, 2.5, "t2")
+    snapshot = adaptive.snapshot()
+    assert [tier["tags"] for tier in snapshot["tiers"]] == [0, 1, 0]
+    assert [tier["notifications"] for tier in snapshot["tiers"]] == [1, 1, 0]
+    assert snapshot["moves"] == 1
+
+
+def test_rejects_unordered_tiers():
+    with pytest.raises(ValueError, match="fastest first"):
+        AdaptiveMonitor(FakeClient(), [FAST], tiers=(4.0, 1.0))
+    with pytest.raises(ValueError, match="initial_tier"):
+        AdaptiveMonitor(FakeClient(), [FAST], tiers=TIERS, initial_tier=3)
@@ -0,0 +1,60 @@
+from opcua import ua
+
+from opcua_client.client import node_cache
+
+
+def speed(client, url):
+    return [
+        v for v in client.browse_variables(url) if v["browse_path"].endswith("Speed")
+    ]
+
+
+def test_failed_data_type_read_is_retried(plant, monkeypatch):
+    client, url, objects, ns = plant
+    speed_id = objects.get_child([f"{ns}:Line1", f"{ns}:Speed"]).nodeid
+    uaclient = client.clients[url].uaclient
+    read = uaclient.read
+    failures = []
+
+    def failing_data_type(params):
+        results = list(read(params))
+        for index, rv in enumerate(params.NodesToRead):
+            if (
+                rv.NodeId == speed_id
+                and rv.AttributeId == ua.AttributeIds.DataType
+                and not failures
+            ):
+                failures.append(rv.NodeId)
+                results[index] = ua.DataValue()
+                results[index].StatusCode = ua.StatusCode(
+                    ua.StatusCodes.BadTooManyOperations
+                )
+        return results
+
+    monkeypatch.setattr(uaclient, "read", failing_data_type)
+    assert speed(client, url) == []
+    assert failures
+    (tag,) = speed(client, url)
+    assert tag["data_type"] == "VariantType.Double"
+    assert node_cache(url).get(tag["node_id"])[2] is not None
+
+
+def test_data_type_is_only_read_for_variables(plant, monkeypatch):
+    client, url, objects, ns = plant
+    uaclient = client.clients[url].uaclient
+    read = uaclient.read
+    data_type_reads = []
+
+    def recording(params):
+        data_type_reads.extend(
+            rv.NodeId
+            for rv in params.NodesToRead
+            if rv.AttributeId == ua.AttributeIds.DataType
+        )
+        return read(params)
+
+    monkeypatch.setattr(uaclient, "read", recording)
+    client.crawl_variables(url)
+    line = objects.get_child(f"{ns}:Line1")
+    assert line.get_child(f"{ns}:Speed").nodeid in data_type_reads
+    assert line.nodeid not in data_type_reads
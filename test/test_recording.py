@@ -0,0 +1,81 @@
+import math
+
+import pytest
+
+from simulator.recording import MAGIC, FrameReader, FrameWriter
+
+NAMES = ["Line1/MotorTemp", "Line1/Running", "Line1/Count", "Line1/Status", "Zone°C"]
+FRAMES = [
+    (0.0, [21.5, True, 0, "Idle", -0.25]),
+    (2.0, [22.75, False, -7, "Running — ok", 1e300]),
+    (4.000001, [math.inf, True, 2**63 - 1, "", -math.inf]),
+]
+
+
+def record(path, frames=FRAMES, names=NAMES):
+    writer = FrameWriter(str(path), names)
+    for offset, values in frames:
+        writer.write(offset, values)
+    writer.close()
+    return writer
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "ticks.simrec"
+    assert record(path).frames == len(FRAMES)
+
+    reader = FrameReader(str(path))
+    assert reader.names == NAMES
+    frames = list(reader)
+    assert frames == FRAMES
+    for (_, values), (_, expected) in zip(frames, FRAMES):
+        assert [type(v) for v in values] == [type(v) for v in expected]
+    # Each iteration reads the file from the start again
+    assert list(reader) == FRAMES
+
+
+def test_nan_survives(tmp_path):
+    path = tmp_path / "nan.simrec"
+    record(path, [(0.0, [math.nan])], ["Flow"])
+    ((offset, (value,)),) = list(FrameReader(str(path)))
+    assert offset == 0.0 and math.isnan(value)
+
+
+def test_empty_recording_has_no_frames(tmp_path):
+    path = tmp_path / "empty.simrec"
+    record(path, [])
+    reader = FrameReader(str(path))
+    assert reader.names == NAMES
+    assert list(reader) == []
+
+
+@pytest.mark.parametrize("cut", [1, 5, 9, 12])
+def test_truncated_last_frame_is_dropped(tmp_path, cut):
+    path = tmp_path / "cut.simrec"
+    record(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-cut])
+    assert list(FrameReader(str(path))) == FRAMES[:-1]
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"PK\x03\x04" + bytes(20))
+    with pytest.raises(ValueError, match="Not a simulator recording"):
+        FrameReader(str(path))
+
+
+def test_truncated_header(tmp_path):
+    path = tmp_path / "header.simrec"
+    path.write_bytes(MAGIC + b"\x02\x00")
+    with pytest.raises(EOFError):
+        FrameReader(str(path))
+
+
+def test_writer_rejects_bad_frames(tmp_path):
+    writer = FrameWriter(str(tmp_path / "bad.simrec"), ["A", "B"])
+    with pytest.raises(ValueError, match="expects 2"):
+        writer.write(0.0, [1.0])
+    with pytest.raises(TypeError, match="NoneType"):
+        writer.write(0.0, [1.0, None])
+    writer.close()
@@ -0,0 +1,64 @@
+import pytest
+from opcua import ua
+
+
+def paths(snapshot):
+    return {
+        v["browse_path"] for v in snapshot.variables() if "Line" in v["browse_path"]
+    }
+
+
+def test_refresh_finds_new_objects(plant):
+    client, url, objects, ns = plant
+    snapshot = client.crawl_variables(url)
+    assert paths(snapshot) == {"Objects/Line1/Speed"}
+    objects.add_object(ns, "Line2").add_variable(ns, "Speed", 2.0)
+    assert client.refresh_variables(url, snapshot) == 1
+    assert paths(snapshot) == {"Objects/Line1/Speed", "Objects/Line2/Speed"}
+    assert client.refresh_variables(url, snapshot) == 0
+
+
+def test_failed_descent_is_retried(plant, monkeypatch):
+    client, url, objects, ns = plant
+    snapshot = client.crawl_variables(url)
+    line2 = objects.add_object(ns, "Line2")
+    line2.add_variable(ns, "Speed", 2.0)
+
+    browse_children = client._browse_children
+    failures = []
+
+    def flaky(uaclient, node_ids):
+        if line2.nodeid.to_string() in node_ids and not failures:
+            failures.append(node_ids)
+            raise TimeoutError("browse timed out")
+        return browse_children(uaclient, node_ids)
+
+    monkeypatch.setattr(client, "_browse_children", flaky)
+    with pytest.raises(TimeoutError):
+        client.refresh_variables(url, snapshot)
+    assert failures
+    client.refresh_variables(url, snapshot)
+    assert paths(snapshot) == {"Objects/Line1/Speed", "Objects/Line2/Speed"}
+    assert paths(snapshot) == paths(client.crawl_variables(url))
+
+
+def test_bad_browse_status_keeps_children(plant, monkeypatch):
+    client, url, objects, ns = plant
+    snapshot = client.crawl_variables(url)
+    line1 = objects.get_child(f"{ns}:Line1").nodeid
+    uaclient = client.clients[url].uaclient
+    browse = uaclient.browse
+
+    def failing(params):
+        results = list(browse(params))
+        for index, description in enumerate(params.NodesToBrowse):
+            if description.NodeId == line1:
+                results[index] = ua.BrowseResult()
+                results[index].StatusCode = ua.StatusCode(
+                    ua.StatusCodes.BadTooManyOperations
+                )
+        return results
+
+    monkeypatch.setattr(uaclient, "browse", failing)
+    assert client.refresh_variables(url, snapshot) == 0
+    assert paths(snapshot) == {"Objects/Line1/Speed"}
@@ -0,0 +1,58 @@
+from mcp_server.catalog import CatalogStore
+from mcp_server.models import OPCUATag
+from mcp_server.search import TagIndex
+
+
+def tag(server_url, browse_path, data_type="VariantType.Double"):
+    return OPCUATag(
+        server_url=server_url,
+        node_id=f"ns=2;s={browse_path}",
+        browse_path=browse_path,
+        display_name=browse_path.rsplit("/", 1)[-1],
+        data_type=data_type,
+    )
+
+
+def test_tags_matching_every_term_rank_first():
+    tags = [tag("a", f"Objects/Area{i}/Temperature") for i in range(50)]
+    tags += [tag("a", "Objects/Line1/PumpPressure"), tag("a", "Objects/Pump/Temp")]
+    found, _ = TagIndex(tags).search("pump temperature", k=3)
+    matched = [terms for terms, _, _ in found]
+    assert found[0][2].browse_path == "Objects/Pump/Temp"
+    assert matched[0] == 2
+    assert matched == sorted(matched, reverse=True)
+
+
+def test_typos_and_prefixes_match():
+    index = TagIndex([tag("a", "Objects/Line3/MotorTemperature")])
+    for query in ("motor temprature", "temp", "line 3"):
+        found, _ = index.search(query)
+        assert found, query
+
+
+def test_facets_count_matches_before_the_data_type_filter():
+    index = TagIndex(
+        [
+            tag("a", "Objects/Valve1/Open", "VariantType.Boolean"),
+            tag("a", "Objects/Valve1/Position"),
+        ]
+    )
+    found, facets = index.search("valve", data_type="Boolean")
+    assert [t.browse_path for _, _, t in found] == ["Objects/Valve1/Open"]
+    assert facets == {"boolean": 1, "double": 1}
+
+
+def test_merge_across_servers_keeps_full_matches_first(monkeypatch):
+    # One server where "temperature" is rare (high idf, high score for a
+    # single-term hit) and one where both terms are common
+    rare = [tag("a", "Objects/X/Temperature")] + [
+        tag("a", f"Objects/X/Flow{i}") for i in range(200)
+    ]
+    common = [tag("b", f"Objects/Pump{i}/Temperature") for i in range(20)]
+    indexes = {"a": TagIndex(rare), "b": TagIndex(common)}
+    store = CatalogStore()
+    monkeypatch.setattr(store, "_index", lambda url, skip: indexes[url])
+
+    results = store.search("pump temperature", ["a", "b"], k=5)["results"]
+    assert len(results) == 5
+    assert all(r["server_url"] == "b" for r in results)
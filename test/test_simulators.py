@@ -0,0 +1,11 @@
+import pytest
+
+from simulator import SIMULATORS
+
+
+@pytest.mark.parametrize("name", sorted(SIMULATORS))
+def test_tags_per_asset_matches_the_address_space(name):
+    sim = SIMULATORS[name](asset_count=2)
+    groups = sim._asset_groups()
+    assert len(groups) == 2
+    assert {len(variables) for variables in groups.values()} == {sim.tags_per_asset}
@@ -0,0 +1,77 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_server.metrics import COALESCED_REQUESTS
+from mcp_server.singleflight import SingleFlight
+
+CALLERS = 8
+_operations = itertools.count(1)
+
+
+@pytest.fixture
+def flight():
+    return SingleFlight(f"test-{next(_operations)}")
+
+
+def wait_for_followers(flight, count, timeout=5.0):
+    """Block until ``count`` callers are waiting on the leader."""
+    deadline = time.monotonic() + timeout
+    while COALESCED_REQUESTS._series.get((flight.operation,), 0) < count:
+        assert time.monotonic() < deadline, "followers did not join"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight, key, function):
+    """Call ``key`` from ``CALLERS`` threads at once; the first one leads."""
+    pool = ThreadPoolExecutor(CALLERS)
+    return pool, [pool.submit(flight.do, key, function) for _ in range(CALLERS)]
+
+
+def test_concurrent_callers_share_one_run(flight):
+    release = threading.Event()
+    runs = []
+
+    def load():
+        runs.append(1)
+        release.wait(5)
+        return {"tags": 42}
+
+    pool, futures = run_concurrently(flight, "plant", load)
+    wait_for_followers(flight, CALLERS - 1)
+    release.set()
+    results = [future.result(5) for future in futures]
+    pool.shutdown()
+
+    assert len(runs) == 1
+    assert all(result is results[0] for result in results)
+    assert flight._calls == {}
+
+
+def test_error_reaches_every_waiter_and_clears_key(flight):
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise TimeoutError("browse timed out")
+
+    pool, futures = run_concurrently(flight, "plant", fail)
+    wait_for_followers(flight, CALLERS - 1)
+    release.set()
+    for future in futures:
+        with pytest.raises(TimeoutError, match="browse timed out"):
+            future.result(5)
+    pool.shutdown()
+
+    assert flight._calls == {}
+    # Nothing is cached: the next caller runs the function again
+    assert flight.do("plant", lambda: "recovered") == "recovered"
+
+
+def test_different_keys_run_independently(flight):
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.do("a", lambda: 3) == 3